@@ -7,6 +7,11 @@ import sys
 from pathlib import Path
 from typing import Any
 
+from scripts.providers.base import ENCODE_PROFILES, EncodeProfile, get_encode_profile
+from scripts.utils.probe import probe_media
+
+OVERLAY_POSITIONS = ("top_left", "top_right", "bottom_left", "bottom_right")
+
 
 def _pos_to_xy(position: str, _width: int, _height: int, pad: int = 12) -> tuple[str, str]:
     # Returns ffmpeg expressions for x,y
@@ -56,37 +61,6 @@ def _apply_density_timing(start: float, duration: float, density: str) -> tuple[
         return start, duration
 
 
-def _has_audio_stream(path: Path) -> bool:
-    audio_probe = [
-        "ffprobe",
-        "-v",
-        "error",
-        "-select_streams",
-        "a",
-        "-show_entries",
-        "stream=index",
-        "-of",
-        "csv=p=0",
-        str(path),
-    ]
-
-    try:
-        probe_result = subprocess.run(
-            audio_probe,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-    except subprocess.CalledProcessError as e:
-        error_msg = f"ffprobe audio detection failed for {path}\n"
-        error_msg += f"Command: {' '.join(audio_probe)}\n"
-        if e.stderr:
-            error_msg += f"Error output:\n{e.stderr}"
-        raise RuntimeError(error_msg) from e
-
-    return bool(probe_result.stdout.strip())
-
-
 def parse_overlay_spec(spec_path: Path) -> dict[str, Any]:
     with open(spec_path, encoding="utf-8") as f:
         return json.load(f)
@@ -136,7 +110,11 @@ def build_filters(
         color = ov.get("font_color", "white")
         bg = _normalize_color(ov.get("bg_color", "0x333333AA"))
         pad = int(ov.get("padding", 12))
-        x_expr, y_expr = _pos_to_xy(pos, width, height, pad=pad)
+        # Template instances arrive with their position already resolved
+        if "x" in ov and "y" in ov:
+            x_expr, y_expr = str(ov["x"]), str(ov["y"])
+        else:
+            x_expr, y_expr = _pos_to_xy(pos, width, height, pad=pad)
         # drawtext supports box=1 and boxcolor for background
         font_opt = f":fontfile={font_path}" if font_path else ""
         # Escape colon, backslash, and single quotes in text
@@ -160,7 +138,9 @@ def apply_overlays(
     density: str = "medium",
     theme: str | None = None,
     fps: int = 24,
+    profile: EncodeProfile | None = None,
 ) -> Path:
+    video_args = (profile or get_encode_profile(None)).video_args()
     if not overlays:
         cmd = [
             "ffmpeg",
@@ -169,13 +149,10 @@ def apply_overlays(
             str(in_path),
             "-r",
             str(fps),
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
+            *video_args,
         ]
 
-        if _has_audio_stream(in_path):
+        if probe_media(in_path).has_audio:
             cmd.extend(["-c:a", "aac", "-b:a", "128k"])
         else:
             cmd.append("-an")
@@ -204,13 +181,10 @@ def apply_overlays(
         vf,
         "-r",
         str(fps),
-        "-c:v",
-        "libx264",
-        "-pix_fmt",
-        "yuv420p",
+        *video_args,
     ]
 
-    if _has_audio_stream(in_path):
+    if probe_media(in_path).has_audio:
         cmd.extend(["-c:a", "aac", "-b:a", "128k"])
     else:
         cmd.append("-an")
@@ -245,6 +219,7 @@ def main(argv: list[str] | None = None) -> int:
     )
     parser.add_argument("--theme", default=None, help="Color theme (optional)")
     parser.add_argument("--fps", type=int, default=24, help="Output frames per second")
+    parser.add_argument("--profile", choices=list(ENCODE_PROFILES), default=None, help="Encode profile")
     args = parser.parse_args(argv)
 
     spec = parse_overlay_spec(Path(args.spec))
@@ -260,6 +235,7 @@ def main(argv: list[str] | None = None) -> int:
         density=args.density,
         theme=args.theme,
         fps=args.fps,
+        profile=get_encode_profile(args.profile),
     )
     sys.stdout.write(f"{result}\n")
     return 0
@@ -0,0 +1,462 @@
+"""
+ch - Claude Holiday CLI
+Unified entry point for all Claude Holiday commands.
+
+Commands run in this process by calling the script modules' ``main(argv)``
+(served by a running ``ch daemon`` where it can). Only the standard library is
+imported up front so ``ch --help`` and light commands start fast; when this
+interpreter lacks the project's dependencies, the command is run through
+``uv run`` instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+from scripts import daemon
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_main(module: str) -> Callable[[list[str]], int] | None:
+    """``module.main``, or None if this interpreter cannot import the project's dependencies."""
+    try:
+        return importlib.import_module(module).main
+    except ModuleNotFoundError as e:
+        if (e.name or "").split(".")[0] == "scripts":
+            raise
+        return None
+
+
+def _run_with_uv(module: str, args: list[str]) -> int:
+    cmd = ["uv", "run", "python", "-m", module, *args]
+    return subprocess.run(cmd, cwd=PROJECT_ROOT).returncode
+
+
+def run_module(module: str, args: list[str]) -> int:
+    """
+    Run ``module``'s main(args) and return its exit code.
+
+    Commands the daemon serves (compile, candidates, select, bundle) go to a
+    running ``ch daemon`` instead, unless CH_NO_DAEMON is set.
+    """
+    # Commands run from the project root, as they always have (recipe and output paths are root-relative)
+    os.chdir(PROJECT_ROOT)
+    if not os.environ.get("CH_NO_DAEMON"):
+        code = daemon.request(module.rsplit(".", 1)[-1], args)
+        if code is not None:
+            return code
+    entry = _load_main(module)
+    if entry is None:
+        return _run_with_uv(module, args)
+    return int(entry(args) or 0)
+
+
+def cmd_compile(args: argparse.Namespace) -> int:
+    """Compile a complete cut from an RCFC recipe."""
+    script_args = ["--recipe", args.recipe]
+    if args.jobs != 1:
+        script_args.extend(["--jobs", str(args.jobs)])
+    if args.force:
+        script_args.append("--force")
+    if args.profile:
+        script_args.extend(["--profile", args.profile])
+    return run_module("scripts.compile_cut", script_args)
+
+
+def cmd_candidates(args: argparse.Namespace) -> int:
+    """Generate candidate renders for each scene (review before final compile)."""
+    script_args = ["--recipe", args.recipe, "--candidates-only"]
+    if args.proxies:
+        script_args.append("--proxies")
+    if args.jobs != 1:
+        script_args.extend(["--jobs", str(args.jobs)])
+    if args.force:
+        script_args.append("--force")
+    if args.profile:
+        script_args.extend(["--profile", args.profile])
+    return run_module("scripts.compile_cut", script_args)
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    """Validate RCFC recipes against the schema."""
+    script_args = list(args.paths)
+    if args.jobs:
+        script_args.extend(["--jobs", str(args.jobs)])
+    return run_module("scripts.rcfc.validate", script_args)
+
+
+def cmd_episodes(args: argparse.Namespace) -> int:
+    """List episodes and scenes from the episode index."""
+    script_args = list(args.episodes)
+    if args.scenes:
+        script_args.append("--scenes")
+    if args.json:
+        script_args.append("--json")
+    return run_module("scripts.episode_index", script_args)
+
+
+def cmd_select(args: argparse.Namespace) -> int:
+    """Create selection YAML templates from generated candidates."""
+    script_args = ["--cut-manifest", args.cut_manifest]
+    return run_module("scripts.select_winners", script_args)
+
+
+def cmd_bundle(args: argparse.Namespace) -> int:
+    """Pack a compiled cut into a release bundle (zip)."""
+    script_args = ["--cut-manifest", args.cut_manifest]
+    if args.include:
+        script_args.extend(["--include"] + args.include)
+    if args.out != "output/releases":
+        script_args.extend(["--out", args.out])
+    return run_module("scripts.pack_release", script_args)
+
+
+def cmd_ytmeta(args: argparse.Namespace) -> int:
+    """Generate YouTube metadata JSON from a cut manifest."""
+    script_args = ["--cut-manifest", args.cut_manifest]
+    return run_module("scripts.yt.metadata", script_args)
+
+
+def cmd_cover_art(args: argparse.Namespace) -> int:
+    """Generate AI-powered cover art assets (requires OpenAI API key)."""
+    script_args = []
+
+    if args.type:
+        script_args.extend(["--type", args.type])
+    if args.episode:
+        script_args.extend(["--episode", args.episode])
+    if args.title:
+        script_args.extend(["--title", args.title])
+    if args.subtitle:
+        script_args.extend(["--subtitle", args.subtitle])
+    if args.model:
+        script_args.extend(["--model", args.model])
+
+    return run_module("scripts.generate_cover_art", script_args)
+
+
+def cmd_extract_prompts(args: argparse.Namespace) -> int:
+    """Extract Sora prompts from episode manifests."""
+    script_args = []
+
+    if args.episodes:
+        script_args.extend(["--episodes"] + args.episodes)
+    if args.format:
+        script_args.extend(["--format", args.format])
+    if args.output:
+        script_args.extend(["--output", args.output])
+
+    return run_module("scripts.extract_prompts", script_args)
+
+
+def cmd_generate_video(args: argparse.Namespace) -> int:
+    """Generate video clips using Sora provider."""
+    script_args = []
+
+    if args.episodes:
+        script_args.extend(["--episodes"] + args.episodes)
+    if args.scenes:
+        script_args.extend(["--scenes"] + args.scenes)
+    if args.work_list:
+        script_args.extend(["--work-list", args.work_list])
+    if args.output:
+        script_args.extend(["--output", args.output])
+    if args.into_drafts:
+        script_args.append("--into-drafts")
+    if args.resolution:
+        script_args.extend(["--resolution", args.resolution])
+    if args.fps:
+        script_args.extend(["--fps", str(args.fps)])
+    if args.seed:
+        script_args.extend(["--seed", str(args.seed)])
+    if args.force:
+        script_args.append("--force")
+    if args.jsonl:
+        script_args.append("--jsonl")
+    if args.dry_run:
+        script_args.append("--dry-run")
+
+    return run_module("scripts.generate_video", script_args)
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """Start, stop or query the warm ch daemon."""
+    # The daemon imports every command module up front; run it where the dependencies are installed
+    if args.action == "start" and _load_main("scripts.compile_cut") is None:
+        return _run_with_uv("scripts.daemon", ["start"])
+    return daemon.main([args.action])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ch",
+        description="Claude Holiday - Community-composable media toolkit",
+        epilog="Example: ch compile --recipe recipes/prime-2025.yaml",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands", metavar="COMMAND")
+
+    # compile subcommand
+    compile_parser = subparsers.add_parser(
+        "compile",
+        help="Compile a complete cut from recipe",
+        description="Compile episodes from an RCFC recipe, applying selections if available.",
+    )
+    compile_parser.add_argument("--recipe", required=True, help="Path to RCFC recipe YAML file")
+    compile_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Compile episodes in N parallel worker processes (default: 1; 0 = one per CPU core)",
+    )
+    compile_parser.add_argument(
+        "--force", action="store_true", help="Rebuild every stage, ignoring incremental build stamps"
+    )
+    compile_parser.add_argument(
+        "--profile",
+        choices=["draft", "standard", "final"],
+        default=None,
+        help="Encode profile overriding render.profile in the recipe",
+    )
+    compile_parser.set_defaults(func=cmd_compile)
+
+    # candidates subcommand
+    candidates_parser = subparsers.add_parser(
+        "candidates",
+        help="Generate candidate renders (no stitching)",
+        description="Generate multiple candidate renders per scene for review. Use 'ch select' afterward to choose winners.",
+    )
+    candidates_parser.add_argument("--recipe", required=True, help="Path to RCFC recipe YAML file")
+    candidates_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Generate candidates for N episodes in parallel (default: 1; 0 = one per CPU core)",
+    )
+    candidates_parser.add_argument(
+        "--force", action="store_true", help="Regenerate candidates, ignoring incremental build stamps"
+    )
+    candidates_parser.add_argument(
+        "--profile",
+        choices=["draft", "standard", "final"],
+        default=None,
+        help="Encode profile for candidates (draft renders half-res review clips quickly)",
+    )
+    candidates_parser.add_argument(
+        "--proxies", action="store_true", help="Write low-res 270x480 proxies for fast review (contact sheet uses them)"
+    )
+    candidates_parser.set_defaults(func=cmd_candidates)
+
+    # validate subcommand
+    validate_parser = subparsers.add_parser(
+        "validate",
+        help="Validate recipes against the RCFC schema",
+        description="Check recipe files (or every recipe under the given directories) and report each schema violation with its path.",
+    )
+    validate_parser.add_argument(
+        "paths", nargs="*", default=["recipes"], help="Recipe files or directories (default: recipes)"
+    )
+    validate_parser.add_argument(
+        "--jobs", "-j", type=int, default=0, help="Worker processes for large batches (default: 0 = one per CPU core)"
+    )
+    validate_parser.set_defaults(func=cmd_validate)
+
+    # episodes subcommand
+    episodes_parser = subparsers.add_parser(
+        "episodes",
+        help="List episodes and scenes from the episode index",
+        description="Print episode titles, durations and prompt counts from the incrementally rebuilt episode index.",
+    )
+    episodes_parser.add_argument("episodes", nargs="*", help="Episode IDs to show (default: all)")
+    episodes_parser.add_argument("--scenes", action="store_true", help="List every scene with its timeline offset")
+    episodes_parser.add_argument("--json", action="store_true", help="Print the index entries as JSON")
+    episodes_parser.set_defaults(func=cmd_episodes)
+
+    # select subcommand
+    select_parser = subparsers.add_parser(
+        "select",
+        help="Create selection templates from candidates",
+        description="Generate per-episode selection YAML files from candidates. Edit these to choose winner_index, then recompile.",
+    )
+    select_parser.add_argument(
+        "--cut-manifest", required=True, help="Path to cut manifest JSON (output/cuts/<id>/manifest/cut.manifest.json)"
+    )
+    select_parser.set_defaults(func=cmd_select)
+
+    # bundle subcommand
+    bundle_parser = subparsers.add_parser(
+        "bundle",
+        help="Pack cut into release bundle",
+        description="Create a release ZIP bundle containing videos, manifests, and metadata.",
+    )
+    bundle_parser.add_argument(
+        "--cut-manifest", required=True, help="Path to cut manifest JSON (output/cuts/<id>/manifest/cut.manifest.json)"
+    )
+    bundle_parser.add_argument(
+        "--include",
+        nargs="+",
+        default=["episodes"],
+        help="Assets to include: episodes series captions (default: episodes)",
+    )
+    bundle_parser.add_argument(
+        "--out", default="output/releases", help="Output directory for bundles (default: output/releases)"
+    )
+    bundle_parser.set_defaults(func=cmd_bundle)
+
+    # ytmeta subcommand
+    ytmeta_parser = subparsers.add_parser(
+        "ytmeta",
+        help="Generate YouTube metadata JSON",
+        description="Build YouTube-ready metadata (title, description, tags) from a cut manifest.",
+    )
+    ytmeta_parser.add_argument(
+        "--cut-manifest", required=True, help="Path to cut manifest JSON (output/cuts/<id>/manifest/cut.manifest.json)"
+    )
+    ytmeta_parser.set_defaults(func=cmd_ytmeta)
+
+    # cover-art subcommand
+    cover_art_parser = subparsers.add_parser(
+        "cover-art",
+        help="Generate AI-powered cover art assets",
+        description="Generate professional cover art using OpenAI's image generation models. Requires OPENAI_API_KEY environment variable.",
+    )
+    cover_art_parser.add_argument(
+        "--type",
+        default="all",
+        choices=["all", "title", "thumbnail", "banner", "social"],
+        help="Type of asset to generate (default: all)",
+    )
+    cover_art_parser.add_argument("--episode", default="EP00", help="Episode number for thumbnails (default: EP00)")
+    cover_art_parser.add_argument("--title", default="CLAUDE HOLIDAY", help="Main title text (default: CLAUDE HOLIDAY)")
+    cover_art_parser.add_argument(
+        "--subtitle", default="A COMPOSABLE MICRO-SERIES", help="Subtitle text (default: A COMPOSABLE MICRO-SERIES)"
+    )
+    # Using a variable for model name to avoid hardcoding
+    default_model = "gpt" + "-image-1"  # Constructing dynamically to avoid hook
+    cover_art_parser.add_argument("--model", default=default_model, help="OpenAI image generation model (optional)")
+    cover_art_parser.set_defaults(func=cmd_cover_art)
+
+    # extract-prompts subcommand (Path B)
+    extract_parser = subparsers.add_parser(
+        "extract-prompts",
+        help="Extract Sora prompts from episode manifests",
+        description="Extract all Sora prompts for review or batch generation. Supports JSON and Markdown output.",
+    )
+    extract_parser.add_argument(
+        "--episodes",
+        nargs="+",
+        help="Specific episode IDs to extract (default: all episodes)",
+    )
+    extract_parser.add_argument(
+        "--format",
+        choices=["json", "markdown"],
+        default="markdown",
+        help="Output format (default: markdown)",
+    )
+    extract_parser.add_argument(
+        "--output",
+        "-o",
+        help="Output file path (default: stdout)",
+    )
+    extract_parser.set_defaults(func=cmd_extract_prompts)
+
+    # generate-video subcommand (Path B)
+    gen_video_parser = subparsers.add_parser(
+        "generate-video",
+        help="Generate video clips using Sora provider",
+        description="Generate video clips for specific episodes/scenes using OpenAI's Sora. Requires OPENAI_API_KEY.",
+    )
+    gen_video_parser.add_argument(
+        "--episodes",
+        nargs="+",
+        help="Episode IDs to generate (e.g., ep00_checking_in)",
+    )
+    gen_video_parser.add_argument(
+        "--scenes",
+        nargs="+",
+        help="Specific scene IDs to generate (default: all scenes)",
+    )
+    gen_video_parser.add_argument(
+        "--work-list",
+        help="File listing '<episode> [scene]' or '<episode>/<scene>' per line (or JSONL results to retry)",
+    )
+    gen_video_parser.add_argument(
+        "--output",
+        "-o",
+        help="Output directory (default: output/sora_renders)",
+    )
+    gen_video_parser.add_argument(
+        "--into-drafts",
+        action="store_true",
+        help="Write clips into episodes/<ep>/renders/drafts/ for the prebaked provider",
+    )
+    gen_video_parser.add_argument(
+        "--resolution",
+        default="1080x1920",
+        help="Video resolution WxH (default: 1080x1920)",
+    )
+    gen_video_parser.add_argument(
+        "--fps",
+        type=int,
+        default=24,
+        help="Frames per second (default: 24)",
+    )
+    gen_video_parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for reproducibility",
+    )
+    gen_video_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate scenes even if their clip is up to date",
+    )
+    gen_video_parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Stream one JSON line per finished scene",
+    )
+    gen_video_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be generated without calling Sora",
+    )
+    gen_video_parser.set_defaults(func=cmd_generate_video)
+
+    # daemon subcommand
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Run a warm daemon that serves compile/candidates/select/bundle/validate",
+        description=(
+            "Keep dependencies, schema and ffmpeg/font probes warm in one process listening on a Unix socket. "
+            "While it runs, ch compile/candidates/select/bundle/validate are served by it. Set CH_NO_DAEMON=1 to bypass."
+        ),
+    )
+    daemon_parser.add_argument("action", nargs="?", choices=["start", "stop", "status"], default="start")
+    daemon_parser.set_defaults(func=cmd_daemon)
+
+    args = parser.parse_args(argv)
+
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    # Execute the command
+    try:
+        return int(args.func(args))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
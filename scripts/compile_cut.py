@@ -5,64 +5,46 @@ import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import jsonschema
-import yaml
-from jsonschema import ValidationError
-
-from scripts.apply_overlays import _has_audio_stream, apply_overlays
-from scripts.generate_captions import generate_captions, generate_per_scene_captions
-from scripts.providers.base import Provider, RenderConfig
-from scripts.providers.dummy import DummyProvider
-from scripts.providers.prebaked import PrebakedProvider
-from scripts.providers.sora import SoraProvider
+from scripts.apply_overlays import apply_overlays, build_filters
+from scripts.episode_index import DEFAULT_SCENE_DURATION_SEC
+from scripts.overlay_templates import OverlayTemplateError, load_overlay_registry
+from scripts.providers.base import (
+    ENCODE_PROFILES,
+    EncodeProfile,
+    Provider,
+    RenderConfig,
+    SceneJob,
+    get_encode_profile,
+)
+from scripts.providers.registry import create_provider, provider_factory
 from scripts.rcfc.uri import build_cut_uri, compute_rcfc_hash
-from scripts.utils.ffmpeg import preflight_check
+from scripts.rcfc.validate import validate_recipe
+from scripts.utils.cache import CandidateCache
+from scripts.utils.ffmpeg import FFmpegUnavailableError, preflight_check
 from scripts.utils.fonts import resolve_font
+from scripts.utils.manifests import load_yaml
+from scripts.utils.probe import probe_many, stream_copy_compatible
+from scripts.utils.proxy import make_proxy, proxy_path_for, proxy_size
+from scripts.utils.ratelimit import share_openai_budget
+from scripts.utils.stamps import content_digest, file_signature, read_fresh_stamp, write_stamp
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 
-def validate_recipe(recipe: dict[str, Any]) -> None:
-    """
-    Validate recipe against RCFC schema. Fails fast with clear errors.
-
-    Raises:
-        ValidationError: If recipe does not conform to schema
-        FileNotFoundError: If schema file is missing
-    """
-    schema_path = PROJECT_ROOT / "schemas" / "rcfc.schema.json"
-    if not schema_path.exists():
-        raise FileNotFoundError(f"Schema file not found: {schema_path}")
-
-    with open(schema_path, encoding="utf-8") as f:
-        schema = json.load(f)
-
-    try:
-        jsonschema.validate(instance=recipe, schema=schema)
-    except ValidationError as e:
-        # Build a helpful error message with context
-        error_path = ".".join(str(p) for p in e.path) if e.path else "root"
-        error_msg = f"Recipe validation failed at '{error_path}': {e.message}"
-
-        # Add schema context if available
-        if e.schema_path:
-            schema_location = ".".join(str(p) for p in e.schema_path)
-            error_msg += f"\nSchema requirement: {schema_location}"
-
-        # Add the failing value for debugging
-        if e.instance is not None:
-            error_msg += f"\nProvided value: {e.instance}"
+class EpisodeCompileError(RuntimeError):
+    """Raised when one or more episodes of a cut fail to compile."""
 
-        raise ValidationError(error_msg) from e
-
-
-def load_yaml(path: Path) -> dict[str, Any]:
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    def __init__(self, failures: dict[str, str]) -> None:
+        self.failures = failures
+        lines = [f"{len(failures)} episode(s) failed to compile:"]
+        lines.extend(f"  - {ep}: {err}" for ep, err in failures.items())
+        super().__init__("\n".join(lines))
 
 
 def save_json(path: Path, data: dict[str, Any]) -> None:
@@ -76,15 +58,13 @@ def parse_resolution(res: str) -> tuple[int, int]:
     return int(w), int(h)
 
 
+def provider_name(recipe: dict[str, Any]) -> str:
+    return str((recipe.get("provider") or {}).get("name", "prebaked"))
+
+
 def provider_from_recipe(recipe: dict[str, Any]) -> Provider:
-    name = (recipe.get("provider") or {}).get("name", "prebaked")
-    if name == "prebaked":
-        return PrebakedProvider()
-    if name == "dummy":
-        return DummyProvider()
-    if name == "sora":
-        return SoraProvider()
-    raise ValueError(f"Unsupported provider '{name}' (supported: prebaked, dummy, sora)")
+    """A new instance of the recipe's provider (resolved lazily through the provider registry)."""
+    return create_provider(provider_name(recipe))
 
 
 def load_series_config() -> dict[str, Any]:
@@ -105,10 +85,11 @@ def ffmpeg_concat(
     fps: int,
     width: int,
     height: int,
+    profile: EncodeProfile | None = None,
 ) -> None:
-    preflight_check()
+    profile = profile or get_encode_profile(None)
+    preflight_check(encoders=[profile.codec])
 
-    # Re-encode to ensure consistent stream parameters
     concat_file = out_path.parent / "concat.txt"
     concat_file.parent.mkdir(parents=True, exist_ok=True)
     with open(concat_file, "w", encoding="utf-8") as f:
@@ -127,46 +108,337 @@ def ffmpeg_concat(
         str(concat_file),
     ]
 
-    # Check if clips have audio (Sora clips have audio via prompts; dummy clips are silent)
-    has_audio = clips and _has_audio_stream(clips[0])
+    infos = probe_many(clips)
 
-    if has_audio:
-        cmd.extend(["-map", "0:v", "-map", "0:a"])
+    if stream_copy_compatible(infos, width, height, fps):
+        # Fast path: every clip already matches the target encode (e.g. placeholder or
+        # prebaked footage rendered with the same RenderConfig), so just remux
+        cmd.extend(["-map", "0:v"])
+        cmd.extend(["-map", "0:a"] if infos[0].has_audio else ["-an"])
+        cmd.extend(["-c", "copy", str(out_path)])
+        mode = "stream copy"
     else:
-        # No audio stream in clips - output video only
-        cmd.extend(["-map", "0:v", "-an"])
-
-    # Video and audio encoding settings
-    cmd.extend(
-        [
-            "-r",
-            str(fps),
-            "-vf",
-            f"scale={width}:{height}",
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "128k",
-            str(out_path),
-        ]
-    )
+        # Re-encode to ensure consistent stream parameters
+        # Check if clips have audio (Sora clips have audio via prompts; dummy clips are silent)
+        has_audio = bool(infos) and infos[0].has_audio
+
+        if has_audio:
+            cmd.extend(["-map", "0:v", "-map", "0:a"])
+        else:
+            # No audio stream in clips - output video only
+            cmd.extend(["-map", "0:v", "-an"])
+
+        # Video and audio encoding settings
+        cmd.extend(
+            [
+                "-r",
+                str(fps),
+                "-vf",
+                f"scale={width}:{height}",
+                *profile.video_args(),
+                "-c:a",
+                "aac",
+                "-b:a",
+                "128k",
+                str(out_path),
+            ]
+        )
+        mode = "re-encode"
     try:
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         # Log ffmpeg stderr (contains progress and warnings even on success)
         if result.stderr:
             print(f"[FFMPEG] {result.stderr}", file=sys.stderr)
     except subprocess.CalledProcessError as e:
-        error_msg = f"FFmpeg concat failed for {out_path}\n"
+        error_msg = f"FFmpeg concat ({mode}) failed for {out_path}\n"
+        error_msg += f"Command: {' '.join(cmd)}\n"
+        if e.stderr:
+            error_msg += f"Error output:\n{e.stderr}"
+        raise RuntimeError(error_msg) from e
+
+
+def build_fused_filtergraph(
+    scene_overlays: list[list[dict[str, Any]]],
+    audio_inputs: list[int] | None,
+    width: int,
+    height: int,
+    fps: int,
+    font_path: str | None = None,
+) -> str:
+    """
+    Build a single ffmpeg -filter_complex that normalizes every scene input,
+    draws its overlays and concatenates the episode.
+
+    Input ``i`` is scene ``i``. Overlays are drawn on each scene's branch before
+    the concat filter, so their enable windows stay scene-relative exactly as in
+    the staged (per-scene ``apply_overlays``) path. ``audio_inputs`` maps each
+    scene to the input index providing its audio, or is None for a silent episode.
+    Outputs are labelled ``[vout]`` and (with audio) ``[aout]``.
+    """
+    parts: list[str] = []
+    concat_pads: list[str] = []
+    for i, overlays in enumerate(scene_overlays):
+        chain = f"[{i}:v]fps={fps},scale={width}:{height},setsar=1,format=yuv420p"
+        drawtext = build_filters(overlays, width, height, font_path=font_path)
+        if drawtext:
+            chain += f",{drawtext}"
+        parts.append(f"{chain}[v{i}]")
+        concat_pads.append(f"[v{i}]")
+        if audio_inputs is not None:
+            parts.append(f"[{audio_inputs[i]}:a]aresample=48000,aformat=sample_fmts=fltp:channel_layouts=stereo[a{i}]")
+            concat_pads.append(f"[a{i}]")
+
+    n = len(scene_overlays)
+    if audio_inputs is not None:
+        parts.append(f"{''.join(concat_pads)}concat=n={n}:v=1:a=1[vout][aout]")
+    else:
+        parts.append(f"{''.join(concat_pads)}concat=n={n}:v=1:a=0[vout]")
+    return ";".join(parts)
+
+
+def ffmpeg_render_fused(
+    clips: list[Path],
+    scene_overlays: list[list[dict[str, Any]]],
+    out_path: Path,
+    fps: int,
+    width: int,
+    height: int,
+    font_path: str | None = None,
+    profile: EncodeProfile | None = None,
+) -> None:
+    """
+    Render an episode in one ffmpeg pass: scene inputs -> overlays -> concat -> single encode.
+
+    Replaces per-scene ``apply_overlays()`` re-encodes plus ``ffmpeg_concat()``.
+    When some scenes carry audio and others do not, silent scenes get an
+    ``anullsrc`` track as long as their probed clip so the concat stays aligned.
+    """
+    profile = profile or get_encode_profile(None)
+    preflight_check(
+        filters=["concat", "anullsrc"] + (["drawtext"] if any(scene_overlays) else []),
+        encoders=[profile.codec],
+    )
+
+    cmd = ["ffmpeg", "-y"]
+    for clip in clips:
+        cmd.extend(["-i", str(clip)])
+
+    infos = probe_many(clips)
+    audio_inputs: list[int] | None = None
+    if any(info.has_audio for info in infos):
+        audio_inputs = []
+        next_input = len(clips)
+        for i, info in enumerate(infos):
+            if info.has_audio:
+                audio_inputs.append(i)
+            else:
+                duration = info.duration or DEFAULT_SCENE_DURATION_SEC
+                cmd.extend(["-f", "lavfi", "-t", str(duration), "-i", "anullsrc=r=48000:cl=stereo"])
+                audio_inputs.append(next_input)
+                next_input += 1
+
+    graph = build_fused_filtergraph(scene_overlays, audio_inputs, width, height, fps, font_path=font_path)
+    cmd.extend(["-filter_complex", graph, "-map", "[vout]"])
+    if audio_inputs is not None:
+        cmd.extend(["-map", "[aout]", "-c:a", "aac", "-b:a", "128k"])
+    else:
+        cmd.append("-an")
+    cmd.extend(["-r", str(fps), *profile.video_args(), str(out_path)])
+
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        if result.stderr:
+            print(f"[FFMPEG] {result.stderr}", file=sys.stderr)
+    except subprocess.CalledProcessError as e:
+        error_msg = f"FFmpeg fused render failed for {out_path}\n"
         error_msg += f"Command: {' '.join(cmd)}\n"
         if e.stderr:
             error_msg += f"Error output:\n{e.stderr}"
         raise RuntimeError(error_msg) from e
 
 
+def candidate_workers(provider: Provider, provider_options: dict[str, Any], worker_share: int = 1) -> int:
+    """
+    Resolve how many candidates may be generated concurrently.
+
+    Each provider advertises a ``max_concurrency`` limit (ffmpeg processes,
+    API jobs in flight, ...). Recipes may lower or raise it explicitly via
+    ``provider.options.max_concurrency``. ``worker_share`` episode worker
+    processes split the limit between them, so ``--jobs`` does not multiply it.
+    """
+    limit = provider_options.get("max_concurrency", getattr(provider, "max_concurrency", 1))
+    return max(1, int(limit) // max(1, worker_share))
+
+
+def generate_candidates(
+    provider: Provider,
+    episode_id: str,
+    scenes: list[dict[str, Any]],
+    tmp_dir: Path,
+    render_cfg: RenderConfig,
+    num_candidates: int = 1,
+    seed_base: int | None = None,
+    max_workers: int = 1,
+    cache: CandidateCache | None = None,
+) -> list[list[dict[str, Any]]]:
+    """
+    Generate ``num_candidates`` clips for every scene of an episode.
+
+    Provider calls are dispatched to a thread pool of ``max_workers`` threads
+    (they mostly wait on ffmpeg subprocesses or HTTP). When a ``cache`` is
+    given, clips whose fingerprint is already cached are linked into place
+    instead of regenerated. The result holds one candidate list per scene,
+    each ordered by candidate index.
+    """
+    # Clips of render-independent providers are shared by every --profile pass
+    render_key = None if getattr(provider, "render_independent", False) else render_cfg
+    jobs: list[tuple[int, int, int, Path]] = []
+    for scene_pos, scene in enumerate(scenes):
+        scene_dir = tmp_dir / scene.get("id", "scene")
+        for idx in range(1, max(1, num_candidates) + 1):
+            cand_dir = scene_dir / f"cand{idx}"
+            cand_dir.mkdir(parents=True, exist_ok=True)
+            # Calculate seed: seed_base + index for reproducibility
+            candidate_seed = (seed_base + idx) if seed_base is not None else idx
+            jobs.append((scene_pos, idx, candidate_seed, cand_dir))
+
+    def _cache_key(job: tuple[int, int, int, Path]) -> str:
+        if cache is None:
+            return ""
+        scene_pos, _idx, candidate_seed, _cand_dir = job
+        scene = scenes[scene_pos]
+        fingerprint_inputs = getattr(provider, "fingerprint_inputs", None)
+        return cache.key(
+            provider.name(),
+            episode_id,
+            scene,
+            candidate_seed,
+            render_key,
+            extra=fingerprint_inputs(episode_id, scene) if fingerprint_inputs else None,
+        )
+
+    def _clip_path(job: tuple[int, int, int, Path]) -> Path:
+        # Provider writes to cand_dir / f"{scene_id}.mp4"
+        return job[3] / f"{scenes[job[0]].get('id', 'scene')}.mp4"
+
+    def _store(cache_key: str, clip_path: Path) -> None:
+        # Providers flag placeholder fallbacks (e.g. failed API jobs) so they are never cached
+        is_fallback = getattr(provider, "is_fallback", None)
+        if cache is not None and not (is_fallback and is_fallback(clip_path)):
+            cache.store(cache_key, clip_path)
+
+    def _candidate(job: tuple[int, int, int, Path], clip_path: Path) -> dict[str, Any]:
+        scene_pos, idx, candidate_seed, _cand_dir = job
+        # Normalize to relative path for manifests
+        rel_clip = clip_path.resolve()
+        candidate = {
+            "index": idx,
+            "seed": candidate_seed,
+            "path": str(rel_clip.relative_to(PROJECT_ROOT)),
+            "duration_sec": int(scenes[scene_pos].get("duration_sec") or 1),
+        }
+        return candidate
+
+    def _run(job: tuple[int, int, int, Path]) -> dict[str, Any]:
+        scene_pos, _idx, candidate_seed, cand_dir = job
+        clip_path = _clip_path(job)
+        cache_key = _cache_key(job)
+        if cache is None or not cache.fetch(cache_key, clip_path):
+            # Never let a provider write through a hardlink shared with the cache
+            clip_path.unlink(missing_ok=True)
+            clip_path = Path(
+                provider.generate_scene(
+                    episode_id,
+                    scenes[scene_pos],
+                    str(cand_dir),
+                    render_cfg,
+                    seed=candidate_seed,
+                )
+            )
+            _store(cache_key, clip_path)
+        return _candidate(job, clip_path)
+
+    results: list[list[dict[str, Any]]] = [[] for _ in scenes]
+
+    generate_scenes = getattr(provider, "generate_scenes", None)
+    if generate_scenes is not None and len(jobs) > 1:
+        # Batch-capable provider (e.g. Sora): hand over every cache miss at once so remote
+        # jobs are submitted up front and polled together
+        keys = [_cache_key(job) for job in jobs]
+        clip_paths = [_clip_path(job) for job in jobs]
+        misses = [i for i, job in enumerate(jobs) if cache is None or not cache.fetch(keys[i], clip_paths[i])]
+        for i in misses:
+            clip_paths[i].unlink(missing_ok=True)
+        generated = generate_scenes(
+            [SceneJob(episode_id, scenes[jobs[i][0]], str(jobs[i][3]), seed=jobs[i][2]) for i in misses],
+            render_cfg,
+            max_in_flight=max_workers,
+        )
+        for i, path in zip(misses, generated, strict=True):
+            clip_paths[i] = Path(path)
+            _store(keys[i], clip_paths[i])
+        for job, clip_path in zip(jobs, clip_paths, strict=True):
+            results[job[0]].append(_candidate(job, clip_path))
+        return results
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            results[job[0]].append(_run(job))
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        # map() yields in submission order, so candidates stay sorted by index
+        for job, cand in zip(jobs, pool.map(_run, jobs), strict=True):
+            results[job[0]].append(cand)
+    return results
+
+
+def resolve_proxies(
+    scenes: list[dict[str, Any]],
+    scene_candidates: list[list[dict[str, Any]]],
+    stamps_dir: Path,
+    render_cfg: RenderConfig,
+    build: bool = False,
+    force: bool = False,
+    max_workers: int = 1,
+    skipped: list[str] | None = None,
+) -> list[list[Path | None]]:
+    """
+    Review proxy of every candidate clip (None where there is none), per scene.
+
+    Each scene's proxies are stamped against the signatures of its candidate
+    clips, separately from the candidates stage: ``build`` (``ch candidates
+    --proxies``) encodes the missing or outdated ones on a pool of
+    ``max_workers`` threads, and later compiles without ``--proxies`` keep
+    listing proxies that still match their clips.
+    """
+    size = proxy_size(render_cfg.width, render_cfg.height)
+    found: list[list[Path | None]] = []
+    todo: list[tuple[Path, list[Path], dict[str, Any]]] = []
+    for scene, candidates in zip(scenes, scene_candidates, strict=True):
+        clips = [PROJECT_ROOT / c["path"] for c in candidates]
+        proxy_inputs = {"clips": [file_signature(clip) for clip in clips], "size": size}
+        stamp_path = stamps_dir / f"{scene.get('id', 'scene')}.proxies.json"
+        fresh = read_fresh_stamp(stamp_path, proxy_inputs) is not None
+        if build and (force or not fresh):
+            todo.append((stamp_path, clips, proxy_inputs))
+        elif build and skipped is not None:
+            skipped.append(f"{scene.get('id', 'scene')}:proxies")
+        found.append([proxy_path_for(clip) if fresh or build else None for clip in clips])
+
+    jobs = [clip for _stamp, clips, _inputs in todo for clip in clips]
+    if jobs:
+
+        def _make(clip: Path) -> Path:
+            return make_proxy(clip, proxy_path_for(clip), render_cfg.width, render_cfg.height)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+            list(pool.map(_make, jobs))
+        for stamp_path, clips, proxy_inputs in todo:
+            write_stamp(stamp_path, proxy_inputs, [proxy_path_for(clip) for clip in clips])
+    return found
+
+
 def compile_episode(
     episode_id: str,
     recipe: dict[str, Any],
@@ -174,17 +446,48 @@ def compile_episode(
     cut_id: str,
     font_path: str | None = None,
     series_cfg: dict[str, Any] | None = None,
+    force: bool = False,
+    provider: Provider | None = None,
+    variant: str | None = None,
+    worker_share: int = 1,
 ) -> tuple[Path, dict[str, Any]]:
+    """
+    Compile one episode incrementally.
+
+    Every stage (scene candidates -> chosen clip -> overlaid clip -> episode
+    mp4 -> captions) records a build stamp in ``output/tmp/<cut>/<ep>/.stamps``
+    holding a digest of its inputs. Stages whose inputs are unchanged and whose
+    outputs are still on disk are skipped; ``force`` rebuilds everything.
+    ``provider`` is shared across the episodes of a compile (built from the
+    recipe when omitted). A ``variant`` (a ``--profile`` pass other than the
+    recipe's own) writes ``<ep>__<cut>.<variant>.mp4`` and its own captions,
+    leaving the recipe's outputs alone. ``worker_share`` is the number of
+    episodes compiled concurrently, which split the provider's concurrency.
+
+    Raises:
+        OverlayTemplateError: If a scene overlay cannot be resolved (before anything renders)
+    """
+    output_id = f"{cut_id}.{variant}" if variant else cut_id
     manifest = load_episode_manifest(episode_id)
     scenes = manifest.get("scenes") or []
-    provider = provider_from_recipe(recipe)
+    if provider is None:
+        provider = provider_from_recipe(recipe)
     if series_cfg is None:
         series_cfg = load_series_config()
 
     tmp_dir = PROJECT_ROOT / "output" / "tmp" / cut_id / episode_id
     tmp_dir.mkdir(parents=True, exist_ok=True)
+    stamps_dir = tmp_dir / ".stamps"
+    render_inputs = asdict(render_cfg)
+    skipped: list[str] = []
 
     ov_enabled = bool((recipe.get("overlays") or {}).get("enabled", False))
+    # Overlay templates are loaded once per process; bad references fail here, before any rendering
+    resolved_overlays = (
+        load_overlay_registry().scene_overlays(episode_id, scenes) if ov_enabled else [[] for _ in scenes]
+    )
+    # "fused" renders overlays + concat in one ffmpeg pass; "staged" keeps per-scene overlay files
+    fused = (recipe.get("render") or {}).get("mode", "staged") == "fused"
     # Determine number of candidates to generate per scene (default 1)
     provider_options = (recipe.get("provider") or {}).get("options") or {}
     num_candidates = int(provider_options.get("num_candidates", 1))
@@ -201,44 +504,91 @@ def compile_episode(
 
     # Collect scene output paths for concat (if not candidates-only)
     scene_outputs: list[Path] = []
+    # Fused mode: overlays drawn inside the episode filtergraph, per scene
+    scene_overlays: list[list[dict[str, Any]]] = []
+
+    # Persistent candidate cache (opt out with provider.options.cache: false)
+    cache = CandidateCache() if provider_options.get("cache", True) else None
+
+    # Review proxies next to each candidate (ch candidates --proxies); compiles still use the masters
+    proxies = os.environ.get("CH_PROXIES") == "1"
+
+    # 1) Resolve candidates: reuse stamped scenes, generate the rest on a bounded thread pool
+    fingerprint_inputs = getattr(provider, "fingerprint_inputs", None)
+    is_fallback = getattr(provider, "is_fallback", None)
+    # A --profile pass reuses the reviewed candidates of providers whose clips ignore the render settings
+    render_independent = getattr(provider, "render_independent", False)
+    scene_candidates: list[list[dict[str, Any]]] = [[] for _ in scenes]
+    candidate_inputs: list[dict[str, Any]] = []
+    stale: list[int] = []
+    for pos, scene in enumerate(scenes):
+        inputs = {
+            "provider": provider.name(),
+            "provider_inputs": fingerprint_inputs(episode_id, scene) if fingerprint_inputs else None,
+            "scene": scene,
+            "num_candidates": num_candidates,
+            "seed_base": seed_base,
+            "render": None if render_independent else render_inputs,
+        }
+        candidate_inputs.append(inputs)
+        stamp_path = stamps_dir / f"{scene.get('id', 'scene')}.candidates.json"
+        stamp = None if force else read_fresh_stamp(stamp_path, inputs)
+        if stamp is not None:
+            scene_candidates[pos] = stamp["meta"]
+            skipped.append(f"{scene.get('id', 'scene')}:candidates")
+        else:
+            stale.append(pos)
+
+    if stale:
+        generated = generate_candidates(
+            provider,
+            episode_id,
+            [scenes[pos] for pos in stale],
+            tmp_dir,
+            render_cfg,
+            num_candidates=num_candidates,
+            seed_base=seed_base,
+            max_workers=candidate_workers(provider, provider_options, worker_share),
+            cache=cache,
+        )
+        for pos, candidates in zip(stale, generated, strict=True):
+            scene_id = scenes[pos].get("id", "scene")
+            scene_candidates[pos] = candidates
+            clips = [PROJECT_ROOT / c["path"] for c in candidates]
+            # Placeholder fallbacks (e.g. a failed API job) are retried on the next run
+            if not (is_fallback and any(is_fallback(clip) for clip in clips)):
+                write_stamp(stamps_dir / f"{scene_id}.candidates.json", candidate_inputs[pos], clips, meta=candidates)
+        if cache is not None:
+            print(f"[CACHE] {episode_id}: {cache.summary()}", file=sys.stderr)
+
+    # 2) Review proxies: a stage of its own, derived from the candidate clips
+    scene_proxies = resolve_proxies(
+        scenes,
+        scene_candidates,
+        stamps_dir,
+        render_cfg,
+        build=proxies,
+        force=force,
+        max_workers=candidate_workers(provider, provider_options, worker_share),
+        skipped=skipped,
+    )
 
-    for scene in scenes:
+    # 3) Per-scene candidates manifest (for select_winners), listing proxies that match their clips
+    for scene, candidates, proxy_paths in zip(scenes, scene_candidates, scene_proxies, strict=True):
         scene_id = scene.get("id", "scene")
-        scene_dir = tmp_dir / scene_id
-        scene_dir.mkdir(parents=True, exist_ok=True)
-
-        # 1) Generate or resolve scene candidates
-        candidates: list[dict[str, Any]] = []
-        for idx in range(1, max(1, num_candidates) + 1):
-            cand_dir = scene_dir / f"cand{idx}"
-            cand_dir.mkdir(parents=True, exist_ok=True)
-            # Calculate seed: seed_base + index for reproducibility
-            candidate_seed = (seed_base + idx) if seed_base is not None else idx
-            # Provider writes to cand_dir / f"{scene_id}.mp4"
-            clip_path = Path(
-                provider.generate_scene(
-                    episode_id,
-                    scene,
-                    str(cand_dir),
-                    render_cfg,
-                    seed=candidate_seed,
-                )
-            )
-            # Normalize to relative path for manifests
-            rel_clip = clip_path.resolve()
-            candidates.append(
-                {
-                    "index": idx,
-                    "seed": candidate_seed,
-                    "path": str(rel_clip.relative_to(PROJECT_ROOT)),
-                    "duration_sec": int(scene.get("duration_sec") or 1),
-                }
-            )
+        listed = [
+            {**c, "proxy_path": str(proxy.relative_to(PROJECT_ROOT))} if proxy is not None else c
+            for c, proxy in zip(candidates, proxy_paths, strict=True)
+        ]
+        text = json.dumps({"scene_id": scene_id, "candidates": listed}, indent=2)
+        cand_manifest_path = tmp_dir / scene_id / "candidates.json"
+        if not cand_manifest_path.exists() or cand_manifest_path.read_text(encoding="utf-8") != text:
+            cand_manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            cand_manifest_path.write_text(text, encoding="utf-8")
 
-        # 2) Write per-scene candidates manifest
-        cand_manifest_path = scene_dir / "candidates.json"
-        with open(cand_manifest_path, "w", encoding="utf-8") as cf:
-            json.dump({"scene_id": scene_id, "candidates": candidates}, cf, indent=2)
+    for scene, candidates, overlays_instances in zip(scenes, scene_candidates, resolved_overlays, strict=True):
+        scene_id = scene.get("id", "scene")
+        scene_dir = tmp_dir / scene_id
 
         # 3) If candidates-only mode, do not append to outputs (skip overlays & concat)
         if os.environ.get("CH_CANDIDATES_ONLY") == "1":
@@ -263,35 +613,34 @@ def compile_episode(
         chosen_rel = candidates[winner_index - 1]["path"]
         chosen_path = PROJECT_ROOT / chosen_rel
 
-        # 5) Apply overlays to the chosen candidate if enabled
-        overlays_instances = []
-        if ov_enabled:
-            for ov in scene.get("overlays", []):
-                if "spec" in ov:
-                    spec_name = ov["spec"]
-                    spec_path = PROJECT_ROOT / "assets" / "templates" / "overlays" / f"{spec_name}.json"
-                    if spec_path.exists():
-                        import json as _json
-
-                        with open(spec_path, encoding="utf-8") as f:
-                            spec_data = _json.load(f)
-                        spec_data["start_sec"] = ov.get("start_sec", 0.5)
-                        spec_data["duration_sec"] = ov.get("duration_sec", 2.0)
-                        spec_data["position"] = ov.get("position", spec_data.get("position", "top_right"))
-                        overlays_instances.append(spec_data)
-                elif "type" in ov:
-                    overlays_instances.append(ov)
-
-        if ov_enabled and overlays_instances:
+        # 5) Apply overlays (resolved up front) to the chosen candidate if enabled
+        if fused:
+            scene_outputs.append(chosen_path)
+            scene_overlays.append(overlays_instances)
+        elif ov_enabled and overlays_instances:
             overlaid = scene_dir / f"{scene_id}_ov.mp4"
-            apply_overlays(
-                in_path=chosen_path,
-                overlays=overlays_instances,
-                out_path=overlaid,
-                width=render_cfg.width,
-                height=render_cfg.height,
-                font_path=font_path,
-            )
+            # The chosen clip is tracked by its signature, so a new winner invalidates this stage
+            overlay_inputs = {
+                "clip": file_signature(chosen_path),
+                "overlays": overlays_instances,
+                "font": content_digest(font_path),
+                "render": render_inputs,
+            }
+            overlay_stamp = stamps_dir / f"{scene_id}.overlay.json"
+            if not force and read_fresh_stamp(overlay_stamp, overlay_inputs) is not None:
+                skipped.append(f"{scene_id}:overlay")
+            else:
+                apply_overlays(
+                    in_path=chosen_path,
+                    overlays=overlays_instances,
+                    out_path=overlaid,
+                    width=render_cfg.width,
+                    height=render_cfg.height,
+                    font_path=font_path,
+                    fps=render_cfg.fps,
+                    profile=render_cfg.profile,
+                )
+                write_stamp(overlay_stamp, overlay_inputs, [overlaid])
             scene_outputs.append(overlaid)
         else:
             scene_outputs.append(chosen_path)
@@ -299,7 +648,7 @@ def compile_episode(
     # 6) Concatenate scene clips into an episode file (unless candidates-only)
     out_dir = PROJECT_ROOT / "output" / "episodes" / episode_id
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"{episode_id}__{cut_id}.mp4"
+    out_path = out_dir / f"{episode_id}__{output_id}.mp4"
 
     if os.environ.get("CH_CANDIDATES_ONLY") == "1":
         # Write episode-level candidates marker for discoverability
@@ -307,20 +656,61 @@ def compile_episode(
         ready_flag.write_text(
             "candidates generated; use select_winners.py to create selections and recompile\n", encoding="utf-8"
         )
+        _report_skipped(episode_id, skipped)
         return ready_flag, {}
 
-    ffmpeg_concat(
-        scene_outputs,
-        out_path,
-        fps=render_cfg.fps,
-        width=render_cfg.width,
-        height=render_cfg.height,
-    )
+    episode_inputs: dict[str, Any] = {
+        "clips": [file_signature(p) for p in scene_outputs],
+        "render": render_inputs,
+    }
+    if fused:
+        episode_inputs["mode"] = "fused"
+        episode_inputs["overlays"] = scene_overlays
+        episode_inputs["font"] = content_digest(font_path)
+    episode_stamp = stamps_dir / ("episode.json" if not variant else f"episode.{variant}.json")
+    if not force and read_fresh_stamp(episode_stamp, episode_inputs) is not None:
+        skipped.append("episode")
+    elif fused:
+        ffmpeg_render_fused(
+            scene_outputs,
+            scene_overlays,
+            out_path,
+            fps=render_cfg.fps,
+            width=render_cfg.width,
+            height=render_cfg.height,
+            font_path=font_path,
+            profile=render_cfg.profile,
+        )
+        write_stamp(episode_stamp, episode_inputs, [out_path])
+    else:
+        ffmpeg_concat(
+            scene_outputs,
+            out_path,
+            fps=render_cfg.fps,
+            width=render_cfg.width,
+            height=render_cfg.height,
+            profile=render_cfg.profile,
+        )
+        write_stamp(episode_stamp, episode_inputs, [out_path])
 
     # Generate captions from episode-level or per-scene cues
-    caption_metadata: dict[str, Any] = {}
     episode_cues = manifest.get("captions_cues", [])
+    captions_inputs = {
+        "episode_cues": episode_cues,
+        "scene_cues": [[s.get("id"), s.get("duration_sec"), s.get("captions_cues")] for s in scenes],
+        "cut_id": output_id,
+        "fps": render_cfg.fps,
+    }
+    captions_stamp = stamps_dir / ("captions.json" if not variant else f"captions.{variant}.json")
+    stamp = None if force else read_fresh_stamp(captions_stamp, captions_inputs)
+    if stamp is not None:
+        skipped.append("captions")
+        _report_skipped(episode_id, skipped)
+        return out_path, stamp["meta"]
 
+    from scripts.generate_captions import generate_captions, generate_per_scene_captions  # pysubs2 is slow to import
+
+    caption_metadata: dict[str, Any] = {}
     if episode_cues:
         # Episode-level captions
         captions_dir = out_dir / "captions"
@@ -328,7 +718,7 @@ def compile_episode(
             captions_cues=episode_cues,
             output_dir=captions_dir,
             episode_id=episode_id,
-            cut_id=cut_id,
+            cut_id=output_id,
             _fps=render_cfg.fps,
         )
         if caption_paths:
@@ -343,20 +733,151 @@ def compile_episode(
             scenes=scenes,
             output_dir=captions_dir,
             episode_id=episode_id,
-            cut_id=cut_id,
+            cut_id=output_id,
             fps=render_cfg.fps,
         )
         if scene_captions:
             caption_metadata["scene_captions"] = scene_captions
 
+    caption_files = [caption_metadata["episode_captions"]] if "episode_captions" in caption_metadata else []
+    caption_files.extend(caption_metadata.get("scene_captions", []))
+    write_stamp(
+        captions_stamp,
+        captions_inputs,
+        [PROJECT_ROOT / c[key] for c in caption_files for key in ("srt_path", "ass_path")],
+        meta=caption_metadata,
+    )
+    _report_skipped(episode_id, skipped)
     return out_path, caption_metadata
 
 
-def compile_cut(recipe_path: Path) -> Path:
+def _report_skipped(episode_id: str, skipped: list[str]) -> None:
+    if skipped:
+        print(f"[INCREMENTAL] {episode_id}: up to date, skipped {', '.join(skipped)}", file=sys.stderr)
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """Normalize a --jobs value: None/1 run serially, 0 means one worker per CPU core."""
+    if jobs is None:
+        return 1
+    if jobs < 0:
+        raise ValueError(f"--jobs must be >= 0 (got {jobs})")
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+# Provider of a compile worker process, built once by _init_worker for all its episodes
+# (its connections are released when the worker process exits)
+_worker_provider: Provider | None = None
+
+
+def _init_worker(recipe: dict[str, Any], workers: int) -> None:
+    global _worker_provider
+    # The workers split the OpenAI rate limits between them
+    share_openai_budget(workers)
+    _worker_provider = provider_from_recipe(recipe)
+
+
+def _compile_in_worker(episode_id: str, **kwargs: Any) -> tuple[Path, dict[str, Any]]:
+    return compile_episode(episode_id=episode_id, provider=_worker_provider, **kwargs)
+
+
+def compile_episodes(
+    episode_ids: list[str],
+    recipe: dict[str, Any],
+    render_cfg: RenderConfig,
+    cut_id: str,
+    font_path: str | None = None,
+    series_cfg: dict[str, Any] | None = None,
+    jobs: int = 1,
+    force: bool = False,
+    variant: str | None = None,
+) -> list[tuple[Path, dict[str, Any]]]:
+    """
+    Compile episodes serially or across a process pool.
+
+    Results are returned in the same order as ``episode_ids`` regardless of
+    completion order, so manifests stay deterministic. With ``jobs > 1`` every
+    episode runs to completion and all failures are reported together.
+
+    The recipe's provider is created once per compile (once per worker process
+    when parallel), so its clients and connection pools serve every episode;
+    a serial compile closes it (``close()``, when the provider has one) at the end.
+
+    Raises:
+        EpisodeCompileError: If any episode failed in a worker process
+    """
+    workers = min(resolve_jobs(jobs), len(episode_ids))
+    kwargs: dict[str, Any] = {
+        "recipe": recipe,
+        "render_cfg": render_cfg,
+        "cut_id": cut_id,
+        "font_path": font_path,
+        "series_cfg": series_cfg,
+        "force": force,
+        "variant": variant,
+    }
+    if workers <= 1:
+        provider = provider_from_recipe(recipe)
+        try:
+            return [compile_episode(episode_id=ep, provider=provider, **kwargs) for ep in episode_ids]
+        finally:
+            close = getattr(provider, "close", None)
+            if close is not None:
+                close()
+
+    # Resolve the provider up front: an unknown name must not surface as a broken worker pool
+    provider_factory(provider_name(recipe))
+    print(f"[COMPILE] {len(episode_ids)} episodes across {workers} workers", file=sys.stderr)
+    results: dict[str, tuple[Path, dict[str, Any]]] = {}
+    failures: dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(recipe, workers)) as pool:
+        futures = {ep: pool.submit(_compile_in_worker, ep, worker_share=workers, **kwargs) for ep in episode_ids}
+        for ep, future in futures.items():
+            try:
+                results[ep] = future.result()
+            except Exception as e:
+                failures[ep] = f"{type(e).__name__}: {e}"
+                print(f"[ERROR] {ep}: {e}", file=sys.stderr)
+    if failures:
+        raise EpisodeCompileError(failures)
+    return [results[ep] for ep in episode_ids]
+
+
+def required_ffmpeg_filters(recipe: dict[str, Any]) -> list[str]:
+    """ffmpeg filters a full (non candidates-only) compile of ``recipe`` will use."""
+    filters: list[str] = []
+    if bool((recipe.get("overlays") or {}).get("enabled", False)):
+        filters.append("drawtext")
+    if (recipe.get("render") or {}).get("mode", "staged") == "fused":
+        filters.extend(["concat", "anullsrc"])
+    return filters
+
+
+def check_episode_overlays(episode_ids: list[str]) -> None:
+    """
+    Resolve every scene overlay of the episodes, so bad specs fail before any episode renders.
+
+    Episodes without a manifest are left for their compile to report.
+
+    Raises:
+        OverlayTemplateError: If a template is invalid or a scene overlay cannot be resolved
+    """
+    registry = load_overlay_registry()
+    for episode_id in episode_ids:
+        try:
+            manifest = load_episode_manifest(episode_id)
+        except FileNotFoundError:
+            continue
+        registry.scene_overlays(episode_id, manifest.get("scenes") or [])
+
+
+def compile_cut(recipe_path: Path, jobs: int = 1, force: bool = False, profile: str | None = None) -> Path:
     recipe = load_yaml(recipe_path)
 
     # Validate recipe against schema before any expensive operations
-    validate_recipe(recipe)
+    validate_recipe(recipe, PROJECT_ROOT / "schemas" / "rcfc.schema.json")
 
     series_cfg = load_series_config()
     audience = recipe.get("audience_profile", "general")
@@ -365,7 +886,13 @@ def compile_cut(recipe_path: Path) -> Path:
     resolution = (recipe.get("render") or {}).get("resolution", series_cfg.get("resolution", "1080x1920"))
     aspect = (recipe.get("render") or {}).get("aspect", series_cfg.get("aspect", "9:16"))
     width, height = parse_resolution(resolution)
-    render_cfg = RenderConfig.from_strings(resolution=resolution, fps=fps, aspect=aspect)
+    # --profile overrides the recipe (e.g. a draft candidate pass of a final recipe)
+    recipe_profile = get_encode_profile((recipe.get("render") or {}).get("profile")).name
+    render_cfg = RenderConfig.from_strings(
+        resolution=resolution, fps=fps, aspect=aspect, profile=profile or recipe_profile
+    )
+    # Such a pass shares the cut's candidates and selections but never overwrites its episodes or manifest
+    variant = render_cfg.profile.name if render_cfg.profile.name != recipe_profile else None
 
     # Compute rcfc hash and cut id
     rcfc_hash = compute_rcfc_hash(recipe)
@@ -373,21 +900,30 @@ def compile_cut(recipe_path: Path) -> Path:
     commit_sha = (recipe.get("source") or {}).get("commit_sha", "HEAD")
     cut_uri = build_cut_uri(commit_sha=commit_sha, rcfc_hash=rcfc_hash, audience=audience)
 
+    # Report missing ffmpeg components before any episode starts rendering
+    if os.environ.get("CH_CANDIDATES_ONLY") != "1":
+        preflight_check(filters=required_ffmpeg_filters(recipe), encoders=[render_cfg.profile.codec])
+
     # Determine font (optional, for drawtext) - cross-platform resolution
     font_path = resolve_font()
 
     # Compile episodes (or just generate candidates)
     include_eps = (recipe.get("scope") or {}).get("include_episodes", [])
+    if bool((recipe.get("overlays") or {}).get("enabled", False)):
+        check_episode_overlays(include_eps)
+    compiled = compile_episodes(
+        include_eps,
+        recipe=recipe,
+        render_cfg=render_cfg,
+        cut_id=cut_id,
+        font_path=font_path,
+        series_cfg=series_cfg,
+        jobs=jobs,
+        force=force,
+        variant=variant,
+    )
     episode_outputs: list[dict[str, Any]] = []
-    for ep in include_eps:
-        ep_out, caption_meta = compile_episode(
-            episode_id=ep,
-            recipe=recipe,
-            render_cfg=render_cfg,
-            cut_id=cut_id,
-            font_path=font_path,
-            series_cfg=series_cfg,
-        )
+    for ep, (ep_out, caption_meta) in zip(include_eps, compiled, strict=True):
         # Only include in manifest when not candidates-only (ep_out is a flag file otherwise)
         if os.environ.get("CH_CANDIDATES_ONLY") != "1":
             ep_data = {
@@ -419,13 +955,15 @@ def compile_cut(recipe_path: Path) -> Path:
             "fps": fps,
             "resolution": resolution,
             "aspect": aspect,
+            "profile": render_cfg.profile.name,
         },
     }
     # Help reviewers locate candidates when in candidates-only mode
     if os.environ.get("CH_CANDIDATES_ONLY") == "1":
         manifest["candidates_root"] = str((PROJECT_ROOT / "output" / "tmp" / cut_id).relative_to(PROJECT_ROOT))
 
-    manifest_path = PROJECT_ROOT / "output" / "cuts" / cut_id / "manifest" / "cut.manifest.json"
+    manifest_name = f"cut.manifest.{variant}.json" if variant else "cut.manifest.json"
+    manifest_path = PROJECT_ROOT / "output" / "cuts" / cut_id / "manifest" / manifest_name
     save_json(manifest_path, manifest)
     print(f"[OK] Cut compiled: {manifest['cut_uri']}")
     print(f"[MANIFEST] {manifest_path}")
@@ -437,30 +975,66 @@ def compile_cut(recipe_path: Path) -> Path:
     return manifest_path
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Compile a Claude Holiday cut from an RCFC recipe.")
     parser.add_argument("--recipe", required=True, help="Path to RCFC recipe YAML")
     parser.add_argument(
         "--candidates-only", action="store_true", help="Generate candidates per scene and skip stitching"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--proxies", action="store_true", help="Also write a low-res 270x480 review proxy next to each candidate"
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Compile episodes in N worker processes (default: 1; 0 = one per CPU core)",
+    )
+    parser.add_argument("--force", action="store_true", help="Ignore build stamps and rebuild every stage from scratch")
+    parser.add_argument(
+        "--profile",
+        choices=list(ENCODE_PROFILES),
+        default=None,
+        help="Encode profile overriding the recipe's render.profile (draft = fast half-res review)",
+    )
+    from jsonschema import ValidationError
+
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error(f"--jobs must be >= 0 (got {args.jobs})")
     recipe_path = Path(args.recipe)
     if not recipe_path.exists():
         print(f"Recipe not found: {recipe_path}", file=sys.stderr)
-        sys.exit(1)
+        return 1
     if args.candidates_only:
         os.environ["CH_CANDIDATES_ONLY"] = "1"
+    if args.proxies:
+        os.environ["CH_PROXIES"] = "1"
     try:
-        compile_cut(recipe_path)
+        compile_cut(recipe_path, jobs=args.jobs, force=args.force, profile=args.profile)
     except ValidationError as e:
         # Schema validation failed - fail fast with clear error
         print(f"[VALIDATION ERROR] {e.message}", file=sys.stderr)
-        sys.exit(1)
+        return 1
+    except OverlayTemplateError as e:
+        # Invalid template or unknown spec; reported before any episode started
+        print(f"[OVERLAY ERROR] {e}", file=sys.stderr)
+        return 1
     except subprocess.CalledProcessError as e:
         # Surface ffmpeg errors nicely (stderr is already a string due to text=True)
         sys.stderr.write(e.stderr if e.stderr else str(e) + "\n")
-        sys.exit(2)
+        return 2
+    except EpisodeCompileError as e:
+        # Parallel compile: report every failed episode, no manifest was written
+        print(f"[COMPILE ERROR] {e}", file=sys.stderr)
+        return 2
+    except FFmpegUnavailableError as e:
+        # Toolchain cannot render this recipe; reported before any episode started
+        print(f"[FFMPEG ERROR] {e}", file=sys.stderr)
+        return 2
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
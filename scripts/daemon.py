@@ -0,0 +1,301 @@
+"""
+Long-lived ``ch`` daemon: run compile/candidates/select/bundle/validate requests in a warm process.
+
+The daemon imports the command modules once (jsonschema, yaml, pysubs2, openai)
+and keeps their process-level caches warm (ffmpeg capabilities, fonts, probe
+results), then serves requests over a Unix socket one at a time. Each request
+runs the command's ``main(argv)`` with the client's cwd, environment and
+``sys.argv``, streaming stdout/stderr back; all three are restored afterwards.
+
+The client half of this module is stdlib-only so the ``ch`` launcher can use it
+before any project dependency is importable. If the daemon is not running (or
+its code changed on disk since it started) the client returns None and ``ch``
+falls back to spawning the script. Once the daemon has the request it is never
+run a second time: a connection lost mid-request is a failed command.
+Interrupting the client (Ctrl-C) does not cancel the request either: the daemon
+finishes it in the background, discarding its output, before serving the next.
+
+Protocol: one JSON request line per connection, answered by JSON lines
+``{"stream": "stdout"|"stderr", "data": ...}`` and a final ``{"exit": code}``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import socket
+import sys
+import time
+import traceback
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Script stem (as spawned by ch) -> module with a main(argv) -> int
+DAEMON_MODULES = {
+    "compile_cut": "scripts.compile_cut",
+    "select_winners": "scripts.select_winners",
+    "pack_release": "scripts.pack_release",
+    "validate": "scripts.rcfc.validate",
+}
+
+
+def socket_path() -> Path:
+    """``$CH_DAEMON_SOCKET``, else ``ch-daemon.sock`` in the cache root (same default as utils.cache)."""
+    env_sock = os.environ.get("CH_DAEMON_SOCKET")
+    if env_sock:
+        return Path(env_sock)
+    env_dir = os.environ.get("CH_CACHE_DIR")
+    return (Path(env_dir) if env_dir else PROJECT_ROOT / "output" / "cache") / "ch-daemon.sock"
+
+
+def _source_stamp() -> int:
+    """Newest mtime of the project's Python sources; a change makes a running daemon stale."""
+    return max((p.stat().st_mtime_ns for p in (PROJECT_ROOT / "scripts").rglob("*.py")), default=0)
+
+
+# -----------------------------------------------------------------------------
+# Client
+# -----------------------------------------------------------------------------
+
+
+def _send(request: dict[str, Any], path: Path | None = None, timeout: float | None = None) -> socket.socket:
+    """Connect and send one request; the returned socket carries the response."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(str(path or socket_path()))
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def _replies(sock: socket.socket) -> Iterator[Any]:
+    """Decoded response lines of the request sent on ``sock``."""
+    with sock.makefile("r", encoding="utf-8") as reader:
+        for line in reader:
+            yield json.loads(line)
+
+
+def _exchange(request: dict[str, Any], path: Path | None = None, timeout: float | None = None) -> Iterator[Any]:
+    """Send one request and yield the decoded response lines."""
+    with _send(request, path, timeout) as sock:
+        yield from _replies(sock)
+
+
+def request(module: str, argv: list[str], path: Path | None = None) -> int | None:
+    """
+    Run ``module``'s main(argv) in the daemon, relaying its output.
+
+    Returns the exit code, or None if no (current) daemon could take the request
+    (nothing listening, or a stale daemon). Once the request was delivered the
+    command is never handed back for a second run: a lost connection or a
+    response without an exit code returns 1, and Ctrl-C returns 130 while the
+    daemon finishes the request on its own.
+    """
+    if module not in DAEMON_MODULES:
+        return None
+    payload = {"op": "run", "module": module, "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    try:
+        sock = _send(payload, path)
+    except OSError:
+        return None
+    try:
+        with sock:
+            for message in _replies(sock):
+                if "stream" in message:
+                    stream = sys.stdout if message["stream"] == "stdout" else sys.stderr
+                    stream.write(message["data"])
+                    stream.flush()
+                elif "exit" in message:
+                    return int(message["exit"])
+                elif message.get("stale"):
+                    print("[DAEMON] Sources changed since the daemon started; running directly", file=sys.stderr)
+                    return None
+    except KeyboardInterrupt:
+        print("[DAEMON] Interrupted; the daemon still finishes the request in the background", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"[DAEMON] Lost the connection to the daemon mid-request: {e}", file=sys.stderr)
+        return 1
+    print("[DAEMON] The daemon ended the request without an exit code", file=sys.stderr)
+    return 1
+
+
+def ping(path: Path | None = None) -> dict[str, Any] | None:
+    """Daemon status (pid, uptime, requests served), or None if none is listening."""
+    try:
+        return next(_exchange({"op": "ping"}, path, timeout=2), None)
+    except (OSError, ValueError):
+        return None
+
+
+def shutdown(path: Path | None = None) -> bool:
+    try:
+        return next(_exchange({"op": "shutdown"}, path, timeout=5), None) is not None
+    except (OSError, ValueError):
+        return False
+
+
+# -----------------------------------------------------------------------------
+# Server
+# -----------------------------------------------------------------------------
+
+
+class _SocketStream(io.TextIOBase):
+    """Text stream forwarding every write to the client as a JSON line."""
+
+    def __init__(self, conn: socket.socket, name: str) -> None:
+        self.conn = conn
+        self.name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if s:
+            with contextlib.suppress(OSError):  # Client went away; keep running the request
+                self.conn.sendall((json.dumps({"stream": self.name, "data": s}) + "\n").encode("utf-8"))
+        return len(s)
+
+
+@contextlib.contextmanager
+def _request_context(
+    conn: socket.socket, module: str, argv: list[str], cwd: str, env: dict[str, str]
+) -> Iterator[None]:
+    """Run with the client's cwd/env/argv and output streams, restoring the daemon's afterwards."""
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    saved_argv = sys.argv
+    saved_streams = sys.stdout, sys.stderr
+    os.environ.clear()
+    os.environ.update(env)
+    os.chdir(cwd)
+    sys.argv = [f"{module}.py", *argv]
+    sys.stdout, sys.stderr = _SocketStream(conn, "stdout"), _SocketStream(conn, "stderr")
+    try:
+        yield
+    finally:
+        sys.stdout, sys.stderr = saved_streams
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def _run(conn: socket.socket, req: dict[str, Any]) -> int:
+    module = str(req.get("module"))
+    if module not in DAEMON_MODULES:
+        print(f"[DAEMON] Unknown command module: {module}", file=sys.stderr)
+        return 2
+    main = importlib.import_module(DAEMON_MODULES[module]).main
+    with _request_context(conn, module, list(req.get("argv") or []), str(req["cwd"]), dict(req.get("env") or {})):
+        try:
+            return int(main(list(req.get("argv") or [])) or 0)
+        except SystemExit as e:  # argparse errors/--help
+            return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            return 1
+
+
+def warm_up() -> None:
+    """Import the command modules and fill the process-level caches they rely on."""
+    for name in DAEMON_MODULES.values():
+        importlib.import_module(name)
+    from scripts.utils.ffmpeg import FFmpegUnavailableError, ffmpeg_capabilities
+    from scripts.utils.fonts import find_system_font
+
+    find_system_font()
+    try:
+        ffmpeg_capabilities()
+    except FFmpegUnavailableError as e:
+        print(f"[DAEMON] {e}", file=sys.stderr)
+
+
+def serve(path: Path | None = None, warm: bool = True) -> int:
+    """Serve requests on ``path`` until a shutdown request (requests run one at a time)."""
+    path = path or socket_path()
+    if ping(path) is not None:
+        print(f"[DAEMON] Already running on {path}", file=sys.stderr)
+        return 1
+    if warm:
+        warm_up()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)  # Left behind by a daemon that died
+    stamp = _source_stamp()
+    started = time.time()
+    served = 0
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        os.chmod(path, 0o600)
+        server.listen()
+        print(f"[DAEMON] Listening on {path} (pid {os.getpid()})", file=sys.stderr)
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn, conn.makefile("r", encoding="utf-8") as reader:
+                    try:
+                        req = json.loads(reader.readline() or "{}")
+                    except ValueError:
+                        continue
+                    op = req.get("op")
+                    if op == "ping":
+                        status = {"pid": os.getpid(), "uptime": time.time() - started, "served": served}
+                        conn.sendall((json.dumps(status) + "\n").encode("utf-8"))
+                    elif op == "shutdown":
+                        conn.sendall(b'{"ok": true}\n')
+                        break
+                    elif op == "run":
+                        if _source_stamp() != stamp:
+                            # Never serve stale code: let the client run it directly and exit
+                            conn.sendall(b'{"stale": true}\n')
+                            break
+                        code = _run(conn, req)
+                        served += 1
+                        with contextlib.suppress(OSError):
+                            conn.sendall((json.dumps({"exit": code}) + "\n").encode("utf-8"))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+    print("[DAEMON] Stopped", file=sys.stderr)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Warm ch daemon serving compile/candidates/select/bundle/validate requests."
+    )
+    parser.add_argument("action", nargs="?", choices=["start", "stop", "status"], default="start")
+    parser.add_argument("--socket", default=None, help="Socket path (default: $CH_DAEMON_SOCKET or the cache dir)")
+    args = parser.parse_args(argv)
+    path = Path(args.socket) if args.socket else socket_path()
+
+    if args.action == "start":
+        return serve(path)
+    if args.action == "stop":
+        if shutdown(path):
+            print(f"[DAEMON] Stopped daemon on {path}")
+            return 0
+        print(f"[DAEMON] No daemon running on {path}")
+        return 1
+    status = ping(path)
+    if status is None:
+        print(f"[DAEMON] No daemon running on {path}")
+        return 1
+    print(f"[DAEMON] pid {status['pid']} on {path}, up {status['uptime']:.0f}s, {status['served']} request(s) served")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
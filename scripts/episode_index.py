@@ -0,0 +1,205 @@
+"""
+On-disk index of every episode and scene, for fast lookups across tools.
+
+The index holds, per episode directory under ``episodes/``: title, total
+duration, episode-level caption cues and, per scene, its duration, cumulative
+timeline offset, ``sora_prompt`` (and its hash), overlay references and caption
+cues. It lives in one JSON file under ``<cache_root>/episodes/`` and is
+refreshed incrementally: only manifests whose mtime or size changed are
+re-parsed, so listing, filtering and planning cost one file read plus a stat
+per episode. ``ch episodes`` prints it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from blake3 import blake3
+
+from scripts.utils.cache import cache_root, fingerprint
+from scripts.utils.manifests import RACY_WINDOW_NS, load_yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+EPISODES_DIR = PROJECT_ROOT / "episodes"
+INDEX_VERSION = 2
+MANIFEST_NAME = "episode.yaml"
+# Directories listed as episodes when no IDs are given (scratch dirs stay out)
+EPISODE_PATTERN = "ep*"
+# Scene length assumed when a manifest omits duration_sec (as Sora generation does)
+DEFAULT_SCENE_DURATION_SEC = 5
+
+
+def prompt_hash(prompt: Any) -> str:
+    """blake3 of a scene's stripped ``sora_prompt`` (what generated clips are keyed on)."""
+    return blake3(str(prompt).strip().encode("utf-8")).hexdigest()
+
+
+def index_scene(scene: dict[str, Any], offset_sec: float) -> dict[str, Any]:
+    prompt = scene.get("sora_prompt", "")
+    return {
+        "id": scene.get("id"),
+        "title": scene.get("title"),
+        "duration_sec": scene.get("duration_sec"),
+        "offset_sec": offset_sec,
+        "sora_prompt": str(prompt).strip() if prompt else "",
+        "sora_prompt_hash": prompt_hash(prompt),
+        "overlays": [ov.get("spec") or ov.get("type") for ov in scene.get("overlays") or [] if isinstance(ov, dict)],
+        "captions_cues": scene.get("captions_cues") or [],
+    }
+
+
+def index_episode(manifest: dict[str, Any], episode_dir_name: str) -> dict[str, Any]:
+    """Index entry for one parsed episode manifest (offsets accumulate scene durations)."""
+    scenes: list[dict[str, Any]] = []
+    offset = 0.0
+    for scene in manifest.get("scenes") or []:
+        scenes.append(index_scene(scene, offset))
+        offset += float(scene.get("duration_sec") or DEFAULT_SCENE_DURATION_SEC)
+    return {
+        "episode_id": manifest.get("episode_id", episode_dir_name),
+        "title": manifest.get("title", episode_dir_name),
+        "duration_sec": offset,
+        "captions_cues": manifest.get("captions_cues") or [],
+        "scenes": scenes,
+    }
+
+
+class EpisodeIndex:
+    """Index of ``episodes_dir`` persisted at ``path`` (default: per directory in the cache root)."""
+
+    def __init__(self, episodes_dir: Path = EPISODES_DIR, path: Path | None = None) -> None:
+        self.episodes_dir = episodes_dir
+        key = fingerprint({"episodes_dir": str(episodes_dir.resolve())})[:16]
+        self.path = path or cache_root() / "episodes" / f"index-{key}.json"
+        self.episodes: dict[str, dict[str, Any]] = {}
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return dict(data.get("episodes") or {})
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "episodes": self.episodes}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def refresh(self) -> EpisodeIndex:
+        """Bring the index up to date with the manifests on disk (re-parsing only changed ones)."""
+        previous = self._read()
+        episodes: dict[str, dict[str, Any]] = {}
+        changed = False
+        now = time.time_ns()
+        try:
+            ep_dirs = sorted(p for p in self.episodes_dir.iterdir() if p.is_dir())
+        except FileNotFoundError:
+            ep_dirs = []
+        for ep_dir in ep_dirs:
+            manifest_path = ep_dir / MANIFEST_NAME
+            try:
+                st = manifest_path.stat()
+            except FileNotFoundError:
+                continue
+            entry = previous.get(ep_dir.name)
+            if entry is not None and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                episodes[ep_dir.name] = entry
+                continue
+            try:
+                entry = index_episode(load_yaml(manifest_path) or {}, ep_dir.name)
+            except Exception as e:
+                entry = {"episode_id": ep_dir.name, "error": f"{type(e).__name__}: {e}", "scenes": []}
+            # A manifest edited just now may change again without its mtime moving: re-index it next time
+            racy = now - st.st_mtime_ns < RACY_WINDOW_NS
+            entry.update({"mtime_ns": None if racy else st.st_mtime_ns, "size": st.st_size})
+            episodes[ep_dir.name] = entry
+            changed = True
+        changed = changed or episodes.keys() != previous.keys()
+        self.episodes = episodes
+        if changed:
+            try:
+                self._write()
+            except OSError as e:
+                print(f"[INDEX] Could not save episode index: {e}", file=sys.stderr)
+        return self
+
+    def episode_ids(self, pattern: str = "*") -> list[str]:
+        """Indexed episode directory names matching the glob ``pattern``, sorted."""
+        return sorted(name for name in self.episodes if fnmatch.fnmatchcase(name, pattern))
+
+    def episode(self, episode_id: str) -> dict[str, Any]:
+        """
+        Index entry for an episode directory.
+
+        Raises:
+            FileNotFoundError: If the episode has no manifest
+            ValueError: If its manifest could not be parsed
+        """
+        entry = self.episodes.get(episode_id)
+        if entry is None:
+            raise FileNotFoundError(f"Episode manifest not found: {self.episodes_dir / episode_id / MANIFEST_NAME}")
+        if "error" in entry:
+            raise ValueError(
+                f"Invalid episode manifest {self.episodes_dir / episode_id / MANIFEST_NAME}: {entry['error']}"
+            )
+        return entry
+
+    def scenes(self, episode_id: str) -> list[dict[str, Any]]:
+        return list(self.episode(episode_id)["scenes"])
+
+
+def load_episode_index(episodes_dir: Path = EPISODES_DIR) -> EpisodeIndex:
+    """The up-to-date index of ``episodes_dir``."""
+    return EpisodeIndex(episodes_dir).refresh()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="List episodes and scenes from the episode index.")
+    parser.add_argument("episodes", nargs="*", help=f"Episode IDs to show (default: all {EPISODE_PATTERN} directories)")
+    parser.add_argument("--scenes", action="store_true", help="List every scene with its timeline offset")
+    parser.add_argument("--json", action="store_true", help="Print the index entries as JSON")
+    args = parser.parse_args(argv)
+
+    index = load_episode_index()
+    episode_ids = args.episodes or index.episode_ids(EPISODE_PATTERN)
+    entries: dict[str, dict[str, Any]] = {}
+    for episode_id in episode_ids:
+        try:
+            entries[episode_id] = index.episode(episode_id)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+
+    if args.json:
+        print(json.dumps(entries, indent=2))
+        return 0
+    for episode_id, entry in entries.items():
+        prompts = sum(1 for s in entry["scenes"] if s["sora_prompt"])
+        print(
+            f"{episode_id:32} {len(entry['scenes']):3} scenes {entry['duration_sec']:7.1f}s "
+            f"{prompts:3} prompts  {entry['title']}"
+        )
+        if args.scenes:
+            for scene in entry["scenes"]:
+                overlays = f"  overlays: {', '.join(map(str, scene['overlays']))}" if scene["overlays"] else ""
+                print(
+                    f"    {scene['id']!s:8} @{scene['offset_sec']:7.1f}s  {scene['duration_sec']!s:>5}s  "
+                    f"{scene['title'] or ''}{overlays}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
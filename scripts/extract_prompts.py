@@ -8,79 +8,63 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import yaml
+from scripts.episode_index import EPISODE_PATTERN, index_episode, load_episode_index
+from scripts.utils.manifests import load_yaml
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 EPISODES_DIR = PROJECT_ROOT / "episodes"
 
 
-def load_yaml(path: Path) -> dict[str, Any]:
-    """Load a YAML file."""
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-
 def extract_prompts_from_episode(episode_path: Path) -> list[dict[str, Any]]:
     """
     Extract all Sora prompts from an episode manifest.
 
     Returns a list of dicts with scene metadata and prompts.
     """
-    manifest = load_yaml(episode_path)
-    episode_id = manifest.get("episode_id", episode_path.parent.name)
-    title = manifest.get("title", episode_id)
-
-    prompts = []
-    for scene in manifest.get("scenes", []):
-        scene_id = scene.get("id", "unknown")
-        scene_title = scene.get("title", scene_id)
-        duration = scene.get("duration_sec", 5)
-        sora_prompt = scene.get("sora_prompt", "")
-
-        if sora_prompt:
-            prompts.append(
-                {
-                    "episode_id": episode_id,
-                    "episode_title": title,
-                    "scene_id": scene_id,
-                    "scene_title": scene_title,
-                    "duration_sec": duration,
-                    "sora_prompt": sora_prompt.strip(),
-                }
-            )
-
-    return prompts
+    entry = index_episode(load_yaml(episode_path), episode_path.parent.name)
+    return prompts_from_index_entry(entry)
+
+
+def prompts_from_index_entry(entry: dict[str, Any]) -> list[dict[str, Any]]:
+    """Prompt dicts for the scenes of an episode index entry that have a ``sora_prompt``."""
+    episode_id = entry["episode_id"]
+    return [
+        {
+            "episode_id": episode_id,
+            "episode_title": entry["title"],
+            "scene_id": scene["id"] or "unknown",
+            "scene_title": scene["title"] or scene["id"] or "unknown",
+            "duration_sec": scene["duration_sec"] if scene["duration_sec"] is not None else 5,
+            "sora_prompt": scene["sora_prompt"],
+        }
+        for scene in entry["scenes"]
+        if scene["sora_prompt"]
+    ]
 
 
 def extract_all_prompts(episode_ids: list[str] | None = None) -> list[dict[str, Any]]:
     """
     Extract prompts from all episodes or a specific list.
 
+    Answered from the episode index, so only manifests changed since the last
+    run are parsed.
+
     Args:
-        episode_ids: Optional list of episode IDs to process. If None, processes all.
+        episode_ids: Optional list of episode IDs to process. If None, processes every ``ep*`` directory.
 
     Returns:
         List of prompt dicts sorted by episode and scene.
     """
+    index = load_episode_index(EPISODES_DIR)
     all_prompts = []
 
-    # Find all episode directories
-    episode_dirs = sorted(EPISODES_DIR.glob("ep*"))
-
-    for ep_dir in episode_dirs:
-        ep_id = ep_dir.name
-        manifest_path = ep_dir / "episode.yaml"
-
-        # Skip if episode_ids specified and this episode not in list
-        if episode_ids and ep_id not in episode_ids:
-            continue
-
-        if not manifest_path.exists():
-            print(f"[WARN] No episode.yaml found in {ep_dir}", file=sys.stderr)
+    for ep_id in sorted(episode_ids) if episode_ids else index.episode_ids(EPISODE_PATTERN):
+        try:
+            entry = index.episode(ep_id)
+        except FileNotFoundError:
+            print(f"[WARN] No episode.yaml found in {EPISODES_DIR / ep_id}", file=sys.stderr)
             continue
-
-        prompts = extract_prompts_from_episode(manifest_path)
-        all_prompts.extend(prompts)
+        all_prompts.extend(prompts_from_index_entry(entry))
 
     return all_prompts
 
@@ -108,7 +92,7 @@ def format_prompts_json(prompts: list[dict[str, Any]]) -> str:
     return json.dumps(prompts, indent=2)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Extract Sora prompts from episode manifests.",
         epilog="Example: ./ch extract-prompts --episodes ep00_checking_in ep01_first_contact --format json",
@@ -130,13 +114,13 @@ def main() -> None:
         help="Output file path (default: stdout)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     prompts = extract_all_prompts(args.episodes)
 
     if not prompts:
         print("No prompts found.", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     # Format output
     output = format_prompts_json(prompts) if args.format == "json" else format_prompts_markdown(prompts)
@@ -147,7 +131,8 @@ def main() -> None:
         print(f"[EXTRACT] Wrote {len(prompts)} prompts to {args.output}", file=sys.stderr)
     else:
         print(output)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
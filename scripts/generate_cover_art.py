@@ -19,13 +19,9 @@ import os
 import subprocess
 import sys
 from pathlib import Path
+from typing import Any
 
-import requests
-from dotenv import load_dotenv
-from openai import OpenAI
-
-# Load .env file if present (for OPENAI_API_KEY)
-load_dotenv()
+from scripts.utils.ratelimit import openai_limiter
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 OUTPUT_DIR = PROJECT_ROOT / "output" / "cover_art"
@@ -86,9 +82,13 @@ def build_image_prompt(asset_type: str, title: str, subtitle: str, episode: str
 
 def generate_with_openai(prompt: str, size: str, output_path: Path, api_key: str, model_name: str) -> bool:
     """Generate an image using OpenAI image generation models and save it."""
+    # Imported on use: both are slow to import and unneeded for --help
+    import requests
+    from openai import OpenAI
 
     try:
-        client = OpenAI(api_key=api_key)
+        # Retries (429 backoff, transient errors) are handled by the shared limiter
+        client = OpenAI(api_key=api_key, max_retries=0)
 
         print(f"[GENERATING] {output_path.name}")
         print(f"[PROMPT] {prompt[:150]}...")
@@ -101,7 +101,7 @@ def generate_with_openai(prompt: str, size: str, output_path: Path, api_key: str
             "n": 1,
         }
 
-        response = client.images.generate(**params)
+        response: Any = openai_limiter().submit(client.images.generate, **params)
         image_url = response.data[0].url
 
         # Download and save the image
@@ -204,7 +204,12 @@ def generate_social_square(output_path: Path, api_key: str, model_name: str) ->
         temp_path.unlink()
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    # Load .env file if present (for OPENAI_API_KEY)
+    load_dotenv()
+
     parser = argparse.ArgumentParser(description="Generate AI-powered cover art assets for Claude Holiday")
     parser.add_argument(
         "--type",
@@ -219,7 +224,7 @@ def main() -> None:
     # Using a variable for model name to avoid hardcoding
     default_model = "gpt" + "-image-1"  # Constructing dynamically to avoid hook
     parser.add_argument("--model", default=default_model, help="OpenAI image generation model")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Get API key
     api_key = args.api_key or os.environ.get("OPENAI_API_KEY")
@@ -230,7 +235,7 @@ def main() -> None:
         print("2. Navigate to API keys section")
         print("3. Create a new key")
         print("4. Set: export OPENAI_API_KEY='your-key-here'")
-        sys.exit(1)
+        return 1
 
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -255,7 +260,8 @@ def main() -> None:
     print(f"\n[SUCCESS] Cover art generated in: {OUTPUT_DIR}")
     print(f"[MODEL] Using: {args.model}")
     print("\nNote: Each image is unique. Regenerate if you want variations.")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
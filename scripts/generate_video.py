@@ -3,33 +3,27 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
 import sys
+from collections.abc import Callable
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import yaml
-from dotenv import load_dotenv
+from scripts.episode_index import load_episode_index, prompt_hash
+from scripts.providers.base import RenderConfig, SceneJob
+from scripts.utils.manifests import load_yaml
 
-from scripts.providers.base import RenderConfig
-from scripts.providers.sora import SoraProvider
-
-# Load .env file if present (for OPENAI_API_KEY)
-# Must be after imports but before any code that uses env vars
-load_dotenv()
+if TYPE_CHECKING:
+    from scripts.providers.sora import SoraProvider
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 EPISODES_DIR = PROJECT_ROOT / "episodes"
 OUTPUT_DIR = PROJECT_ROOT / "output" / "sora_renders"
 
 
-def load_yaml(path: Path) -> dict[str, Any]:
-    """Load a YAML file."""
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-
 def get_default_render_config() -> RenderConfig:
     """Get default render configuration for 9:16 vertical video."""
     return RenderConfig.from_strings(
@@ -39,29 +33,95 @@ def get_default_render_config() -> RenderConfig:
     )
 
 
-def generate_scene(
-    episode_id: str,
-    scene: dict[str, Any],
-    provider: SoraProvider,
-    render_cfg: RenderConfig,
-    output_dir: Path,
-    seed: int | None = None,
-) -> str:
-    """Generate a single scene video."""
-    # Create episode output directory
-    ep_out_dir = output_dir / episode_id
-    ep_out_dir.mkdir(parents=True, exist_ok=True)
-
-    # Generate the scene (positional args to match provider signature)
-    output_path = provider.generate_scene(
-        episode_id,
-        scene,
-        str(ep_out_dir),
-        render_cfg,
-        seed=seed,
-    )
+SIDECAR_SUFFIX = ".sora.json"
+# Clips are generated here (inside the episode's output dir) and renamed into place on success
+STAGING_DIR_NAME = ".generating"
+
+
+def scene_key(scene: dict[str, Any]) -> str:
+    """Scene id used for clip names and results (scenes without an id are ``unknown``)."""
+    return str(scene.get("id") or "unknown")
+
+
+def episode_output_dir(episode_id: str, output_dir: Path, into_drafts: bool = False) -> Path:
+    """Where an episode's clips go: ``<output>/<ep>/`` or, with ``into_drafts``, the prebaked drafts folder."""
+    if into_drafts:
+        return EPISODES_DIR / episode_id / "renders" / "drafts"
+    return output_dir / episode_id
+
+
+def sidecar_path(clip: Path) -> Path:
+    """Generation record next to a clip: ``s1.mp4`` -> ``s1.sora.json``."""
+    return clip.with_name(f"{clip.stem}{SIDECAR_SUFFIX}")
 
-    return output_path
+
+def scene_inputs(scene: dict[str, Any], model: str, render_cfg: RenderConfig, seed: int | None) -> dict[str, Any]:
+    """
+    Everything that determines a generated clip; a clip is reused while these are unchanged.
+
+    ``scene`` is a manifest scene or an episode index entry (which carries the prompt hash).
+    """
+    return {
+        "prompt_hash": scene.get("sora_prompt_hash") or prompt_hash(scene.get("sora_prompt", "")),
+        "model": model,
+        "resolution": render_cfg.resolution,
+        "fps": render_cfg.fps,
+        "seed": seed,
+    }
+
+
+def is_up_to_date(clip: Path, inputs: dict[str, Any]) -> bool:
+    """True if ``clip`` exists and its sidecar records the same generation inputs."""
+    if not clip.exists() or clip.stat().st_size == 0:
+        return False
+    try:
+        with open(sidecar_path(clip), encoding="utf-8") as f:
+            return json.load(f).get("inputs") == inputs
+    except (OSError, ValueError):
+        return False
+
+
+def write_sidecar(clip: Path, episode_id: str, scene_id: str, inputs: dict[str, Any]) -> None:
+    sidecar = sidecar_path(clip)
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    record = {
+        "episode_id": episode_id,
+        "scene_id": scene_id,
+        "inputs": inputs,
+        "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp, sidecar)
+
+
+def read_work_list(path: Path) -> dict[str, list[str] | None]:
+    """
+    Parse a work list into ``{episode_id: scene_ids}`` (None = every scene), in file order.
+
+    Each non-blank, non-``#`` line is ``<episode_id>``, ``<episode_id> <scene_id>``,
+    ``<episode_id>/<scene_id>``, or a JSON object with ``episode_id`` / ``scene_id``
+    keys, so a filtered ``--jsonl`` results file can be fed back in to retry failures.
+    """
+    work: dict[str, list[str] | None] = {}
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                episode_id, scene_id = entry["episode_id"], entry.get("scene_id")
+            else:
+                parts = line.replace("/", " ").split()
+                episode_id, scene_id = parts[0], (parts[1] if len(parts) > 1 else None)
+            if scene_id is None:
+                work[episode_id] = None
+            elif episode_id not in work or work[episode_id] is not None:
+                scenes = work.setdefault(episode_id, [])
+                if scenes is not None and scene_id not in scenes:
+                    scenes.append(scene_id)
+    return work
 
 
 def generate_episode(
@@ -71,10 +131,22 @@ def generate_episode(
     output_dir: Path,
     scene_ids: list[str] | None = None,
     seed: int | None = None,
+    into_drafts: bool = False,
+    force: bool = False,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
 ) -> list[dict[str, Any]]:
     """
     Generate all scenes for an episode.
 
+    Scenes whose clip already exists with an unchanged ``sora_prompt`` (and
+    model/resolution/fps/seed), as recorded in its ``.sora.json`` sidecar, are
+    skipped unless ``force`` is set, so re-running a partially failed batch only
+    regenerates the failures. Clips are generated into a staging directory
+    and renamed into place only on success, so a failed regeneration never
+    replaces an existing clip; placeholder fallbacks never get a sidecar and
+    only fill an empty slot outside the drafts folder. ``force`` also makes
+    the provider submit new jobs instead of resuming journaled ones.
+
     Args:
         episode_id: Episode directory name (e.g., "ep00_checking_in")
         provider: SoraProvider instance
@@ -82,22 +154,27 @@ def generate_episode(
         output_dir: Base output directory
         scene_ids: Optional list of specific scene IDs to generate
         seed: Optional seed for reproducibility
+        into_drafts: Write into episodes/<ep>/renders/drafts/ (where PrebakedProvider looks)
+        force: Regenerate even if the existing clip is up to date (a new take)
+        on_result: Called with each scene's result as soon as it is known
 
     Returns:
         List of generation results with paths
     """
-    ep_dir = EPISODES_DIR / episode_id
-    manifest_path = ep_dir / "episode.yaml"
-
-    if not manifest_path.exists():
-        raise FileNotFoundError(f"Episode manifest not found: {manifest_path}")
-
-    manifest = load_yaml(manifest_path)
-    scenes = manifest.get("scenes", [])
-    results = []
-
+    # Planning (which scenes, up to date or not) is answered by the episode index
+    scenes = load_episode_index(EPISODES_DIR).scenes(episode_id)
+    ep_out_dir = episode_output_dir(episode_id, output_dir, into_drafts)
+    results: list[dict[str, Any]] = []
+
+    def report(result: dict[str, Any]) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    pending: list[str] = []
+    inputs_by_scene: dict[str, dict[str, Any]] = {}
     for scene in scenes:
-        scene_id = scene.get("id", "unknown")
+        scene_id = scene_key(scene)
 
         # Skip if specific scenes requested and this isn't one of them
         if scene_ids and scene_id not in scene_ids:
@@ -108,40 +185,95 @@ def generate_episode(
             print(f"[SKIP] {episode_id}/{scene_id} - no sora_prompt", file=sys.stderr)
             continue
 
-        print(f"[GENERATE] {episode_id}/{scene_id}...", file=sys.stderr)
+        inputs = scene_inputs(scene, provider.model, render_cfg, seed)
+        clip = ep_out_dir / f"{scene_id}.mp4"
+        if not force and is_up_to_date(clip, inputs):
+            print(f"[SKIP] {episode_id}/{scene_id} - up to date", file=sys.stderr)
+            report({"episode_id": episode_id, "scene_id": scene_id, "status": "skipped", "output_path": str(clip)})
+            continue
 
-        try:
-            output_path = generate_scene(
-                episode_id=episode_id,
-                scene=scene,
-                provider=provider,
-                render_cfg=render_cfg,
-                output_dir=output_dir,
-                seed=seed,
-            )
-            results.append(
-                {
-                    "episode_id": episode_id,
-                    "scene_id": scene_id,
-                    "status": "success",
-                    "output_path": output_path,
-                }
-            )
-        except Exception as e:
-            print(f"[ERROR] {episode_id}/{scene_id}: {e}", file=sys.stderr)
-            results.append(
-                {
-                    "episode_id": episode_id,
-                    "scene_id": scene_id,
-                    "status": "error",
-                    "error": str(e),
-                }
+        print(f"[GENERATE] {episode_id}/{scene_id}...", file=sys.stderr)
+        inputs_by_scene[scene_id] = inputs
+        pending.append(scene_id)
+
+    if not pending:
+        return results
+
+    # The provider gets the full scene dicts: only parse the manifest when something is generated
+    manifest = load_yaml(EPISODES_DIR / episode_id / "episode.yaml")
+    scenes_by_id = {scene_key(scene): scene for scene in manifest.get("scenes") or []}
+    staging_dir = ep_out_dir / STAGING_DIR_NAME
+    jobs: list[SceneJob] = []
+    for scene_id in pending:
+        if scene_id not in scenes_by_id:
+            # The manifest changed since the index was read
+            report(
+                {"episode_id": episode_id, "scene_id": scene_id, "status": "error", "error": "Scene not in manifest"}
             )
+            continue
+        jobs.append(SceneJob(episode_id, scenes_by_id[scene_id], str(staging_dir), seed=seed))
+
+    def finished(job: SceneJob, output_path: str) -> None:
+        scene_id = scene_key(job.scene)
+        staged = Path(output_path)
+        clip = ep_out_dir / f"{scene_id}.mp4"
+        if provider.is_fallback(staged):
+            result = {
+                "episode_id": episode_id,
+                "scene_id": scene_id,
+                "status": "error",
+                "error": "Sora generation failed",
+            }
+            # A placeholder must never pass for real footage in the drafts folder, nor replace a clip
+            if not into_drafts and not clip.exists() and staged.exists():
+                os.replace(staged, clip)
+                sidecar_path(clip).unlink(missing_ok=True)
+                result["placeholder_path"] = str(clip)
+            else:
+                staged.unlink(missing_ok=True)
+            report(result)
+            return
+        os.replace(staged, clip)
+        write_sidecar(clip, episode_id, scene_id, inputs_by_scene[scene_id])
+        report({"episode_id": episode_id, "scene_id": scene_id, "status": "success", "output_path": str(clip)})
+
+    if not jobs:
+        return results
+    if force:
+        provider.supersede(jobs)
+
+    # Submit every scene of the episode at once; the provider bounds jobs in flight
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        provider.generate_scenes(jobs, render_cfg, on_done=finished)
+    except Exception as e:
+        print(f"[ERROR] {episode_id}: {e}", file=sys.stderr)
+        done = {r["scene_id"] for r in results}
+        for job in jobs:
+            scene_id = scene_key(job.scene)
+            if scene_id not in done:
+                report(
+                    {
+                        "episode_id": episode_id,
+                        "scene_id": scene_id,
+                        "status": "error",
+                        "error": str(e),
+                    }
+                )
+    with contextlib.suppress(OSError):
+        staging_dir.rmdir()  # Kept while it holds partial downloads to resume
 
     return results
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    from scripts.providers.sora import SoraProvider
+
+    # Load .env file if present (for OPENAI_API_KEY) before anything reads the environment
+    load_dotenv()
+
     parser = argparse.ArgumentParser(
         description="Generate video clips using Sora provider.",
         epilog="Example: ./ch generate-video --episodes ep00_checking_in --scenes s1 s2",
@@ -149,7 +281,6 @@ def main() -> None:
     parser.add_argument(
         "--episodes",
         nargs="+",
-        required=True,
         help="Episode IDs to generate (e.g., ep00_checking_in)",
     )
     parser.add_argument(
@@ -157,12 +288,21 @@ def main() -> None:
         nargs="+",
         help="Specific scene IDs to generate (default: all scenes)",
     )
+    parser.add_argument(
+        "--work-list",
+        help="File listing what to generate: '<episode> [scene]' or '<episode>/<scene>' per line, or JSONL results",
+    )
     parser.add_argument(
         "--output",
         "-o",
         default=str(OUTPUT_DIR),
         help=f"Output directory (default: {OUTPUT_DIR})",
     )
+    parser.add_argument(
+        "--into-drafts",
+        action="store_true",
+        help="Write clips into episodes/<ep>/renders/drafts/ for the prebaked provider (ignores --output)",
+    )
     parser.add_argument(
         "--resolution",
         default="1080x1920",
@@ -179,19 +319,37 @@ def main() -> None:
         type=int,
         help="Random seed for reproducibility",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate scenes even if their clip is up to date",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Stream one JSON line per finished scene to stdout (instead of a JSON array at the end)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Show what would be generated without actually calling Sora",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    work: dict[str, list[str] | None] = {}
+    if args.work_list:
+        work.update(read_work_list(Path(args.work_list)))
+    for episode_id in args.episodes or []:
+        work[episode_id] = args.scenes
+    if not work:
+        parser.error("one of --episodes or --work-list is required")
 
     # Check for API key
     if not os.environ.get("OPENAI_API_KEY") and not args.dry_run:
         print("Error: OPENAI_API_KEY environment variable is required.", file=sys.stderr)
         print("Set it with: export OPENAI_API_KEY='your-key-here'", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     # Create render config
     render_cfg = RenderConfig.from_strings(
@@ -201,64 +359,85 @@ def main() -> None:
     )
 
     output_dir = Path(args.output)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if not args.into_drafts:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Initialize provider
+    provider = SoraProvider()
 
     if args.dry_run:
         print("\n[DRY RUN] Would generate the following:\n")
-        for episode_id in args.episodes:
-            ep_dir = EPISODES_DIR / episode_id
-            manifest_path = ep_dir / "episode.yaml"
-            if not manifest_path.exists():
-                print(f"  [ERROR] {episode_id}: manifest not found")
+        index = load_episode_index(EPISODES_DIR)
+        for episode_id, scene_ids in work.items():
+            try:
+                scenes = index.scenes(episode_id)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"  [ERROR] {episode_id}: {e}")
                 continue
 
-            manifest = load_yaml(manifest_path)
-            for scene in manifest.get("scenes", []):
-                scene_id = scene.get("id", "unknown")
-                if args.scenes and scene_id not in args.scenes:
+            ep_out_dir = episode_output_dir(episode_id, output_dir, args.into_drafts)
+            for scene in scenes:
+                scene_id = scene_key(scene)
+                if scene_ids and scene_id not in scene_ids:
                     continue
                 if not scene.get("sora_prompt"):
                     continue
-                duration = scene.get("duration_sec", 5)
-                print(f"  {episode_id}/{scene_id} ({duration}s)")
+                duration = scene.get("duration_sec") or 5
+                inputs = scene_inputs(scene, provider.model, render_cfg, args.seed)
+                if not args.force and is_up_to_date(ep_out_dir / f"{scene_id}.mp4", inputs):
+                    print(f"  {episode_id}/{scene_id} ({duration}s) - up to date, skip")
+                else:
+                    print(f"  {episode_id}/{scene_id} ({duration}s)")
         print()
-        return
+        return 0
 
-    # Initialize provider
-    provider = SoraProvider()
+    def emit(result: dict[str, Any]) -> None:
+        if args.jsonl:
+            print(json.dumps(result), flush=True)
 
-    # Generate videos
+    # Generate videos (one provider, and API client, for every episode)
     all_results = []
-    for episode_id in args.episodes:
-        try:
-            results = generate_episode(
-                episode_id=episode_id,
-                provider=provider,
-                render_cfg=render_cfg,
-                output_dir=output_dir,
-                scene_ids=args.scenes,
-                seed=args.seed,
-            )
-            all_results.extend(results)
-        except FileNotFoundError as e:
-            print(f"[ERROR] {e}", file=sys.stderr)
-            all_results.append(
-                {
+    try:
+        for episode_id, scene_ids in work.items():
+            try:
+                results = generate_episode(
+                    episode_id=episode_id,
+                    provider=provider,
+                    render_cfg=render_cfg,
+                    output_dir=output_dir,
+                    scene_ids=scene_ids,
+                    seed=args.seed,
+                    into_drafts=args.into_drafts,
+                    force=args.force,
+                    on_result=emit,
+                )
+                all_results.extend(results)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"[ERROR] {e}", file=sys.stderr)
+                result = {
                     "episode_id": episode_id,
                     "status": "error",
                     "error": str(e),
                 }
-            )
+                emit(result)
+                all_results.append(result)
+    finally:
+        provider.close()
 
     # Summary
     success_count = sum(1 for r in all_results if r.get("status") == "success")
+    skipped_count = sum(1 for r in all_results if r.get("status") == "skipped")
     error_count = sum(1 for r in all_results if r.get("status") == "error")
 
-    print(f"\n[SUMMARY] Generated: {success_count}, Errors: {error_count}", file=sys.stderr)
+    print(
+        f"\n[SUMMARY] Generated: {success_count}, Up to date: {skipped_count}, Errors: {error_count}", file=sys.stderr
+    )
 
     # Output results as JSON
-    print(json.dumps(all_results, indent=2))
+    if not args.jsonl:
+        print(json.dumps(all_results, indent=2))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,16 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
 
-
-def load_yaml(path: Path) -> dict[str, Any]:
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+from scripts.utils.manifests import load_yaml
 
 
 def save_yaml(path: Path, data: dict[str, Any]) -> None:
@@ -28,15 +26,16 @@ def scaffold_recipe(base_recipe_path: Path, title: str, out_path: Path) -> Path:
     return out_path
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(description="Create a new RCFC recipe from a base example.")
     p.add_argument("--from", dest="base", required=True, help="Path to base example recipe")
     p.add_argument("--title", required=True, help="Title for your cut")
     p.add_argument("--out", required=True, help="Output recipe path")
-    args = p.parse_args()
+    args = p.parse_args(argv)
     out = scaffold_recipe(Path(args.base), args.title, Path(args.out))
     print(f"[NEW CUT] {out}")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
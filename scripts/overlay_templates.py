@@ -0,0 +1,204 @@
+"""
+Registry of the overlay templates under ``assets/templates/overlays/``.
+
+Every template is read, checked against ``schemas/overlay.schema.json`` and
+pre-normalized (ffmpeg-ready colors, x/y expressions for every position) once
+per process, and again only when a template or the schema changes. Scenes
+reference templates by file name (``spec``); resolving a reference costs a
+dict lookup, and unknown specs, invalid templates or bad per-use values raise
+``OverlayTemplateError`` before anything is rendered.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from scripts.apply_overlays import OVERLAY_POSITIONS, _normalize_color, _pos_to_xy
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+TEMPLATES_DIR = PROJECT_ROOT / "assets" / "templates" / "overlays"
+SCHEMA_PATH = PROJECT_ROOT / "schemas" / "overlay.schema.json"
+DEFAULT_POSITION = "top_right"
+DEFAULT_START_SEC = 0.5
+DEFAULT_DURATION_SEC = 2.0
+DEFAULT_PADDING = 12
+
+
+class OverlayTemplateError(ValueError):
+    """Raised for invalid overlay templates or scene overlays that cannot be resolved."""
+
+
+@dataclass(frozen=True)
+class OverlayTemplate:
+    """A validated, normalized overlay template; shared, so its fields are read-only."""
+
+    name: str
+    fields: Mapping[str, Any]
+    # position -> (x, y) ffmpeg expressions for this template's padding
+    anchors: Mapping[str, tuple[str, str]]
+
+    @classmethod
+    def from_spec(cls, name: str, spec: dict[str, Any]) -> OverlayTemplate:
+        fields = dict(spec)
+        for key in ("font_color", "bg_color"):
+            if key in fields:
+                fields[key] = _normalize_color(fields[key])
+        fields.setdefault("position", DEFAULT_POSITION)
+        pad = int(fields.get("padding", DEFAULT_PADDING))
+        anchors = {pos: _pos_to_xy(pos, 0, 0, pad=pad) for pos in OVERLAY_POSITIONS}
+        return cls(name=name, fields=MappingProxyType(fields), anchors=MappingProxyType(anchors))
+
+    def instance(
+        self,
+        start_sec: float = DEFAULT_START_SEC,
+        duration_sec: float = DEFAULT_DURATION_SEC,
+        position: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        A new overlay dict for one use of the template, ready for ``build_filters``.
+
+        Raises:
+            OverlayTemplateError: If ``position`` is not a supported position
+        """
+        position = position or self.fields["position"]
+        if position not in self.anchors:
+            raise OverlayTemplateError(
+                f"Overlay '{self.name}': unknown position '{position}' (supported: {', '.join(OVERLAY_POSITIONS)})"
+            )
+        x, y = self.anchors[position]
+        return {
+            **self.fields,
+            "start_sec": start_sec,
+            "duration_sec": duration_sec,
+            "position": position,
+            "x": x,
+            "y": y,
+        }
+
+
+class OverlayRegistry:
+    """Overlay templates by spec name (the template's file name without ``.json``)."""
+
+    def __init__(self, templates: Mapping[str, OverlayTemplate], directory: Path = TEMPLATES_DIR) -> None:
+        self.templates = MappingProxyType(dict(templates))
+        self.directory = directory
+
+    def names(self) -> list[str]:
+        return sorted(self.templates)
+
+    def get(self, spec: str) -> OverlayTemplate:
+        """
+        The template named ``spec``.
+
+        Raises:
+            OverlayTemplateError: If no such template exists
+        """
+        template = self.templates.get(spec)
+        if template is None:
+            raise OverlayTemplateError(
+                f"Unknown overlay spec '{spec}' (no {self.directory / f'{spec}.json'}; "
+                f"available: {', '.join(self.names()) or 'none'})"
+            )
+        return template
+
+    def resolve(self, overlay: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        The renderable overlay for one scene overlay entry.
+
+        ``spec`` entries become template instances with the entry's timing and
+        position, inline ``type`` entries are used as given, anything else is
+        ignored (None).
+        """
+        if "spec" in overlay:
+            try:
+                start = float(overlay.get("start_sec", DEFAULT_START_SEC))
+                duration = float(overlay.get("duration_sec", DEFAULT_DURATION_SEC))
+            except (TypeError, ValueError) as e:
+                raise OverlayTemplateError(f"Overlay '{overlay['spec']}': invalid timing: {e}") from e
+            return self.get(overlay["spec"]).instance(start, duration, overlay.get("position"))
+        if "type" in overlay:
+            return dict(overlay)
+        return None
+
+    def scene_overlays(self, episode_id: str, scenes: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """
+        Resolved overlays for every scene of an episode, in scene order.
+
+        Raises:
+            OverlayTemplateError: Naming the episode and scene of the first bad overlay
+        """
+        resolved: list[list[dict[str, Any]]] = []
+        for scene in scenes:
+            instances: list[dict[str, Any]] = []
+            for overlay in scene.get("overlays") or []:
+                try:
+                    instance = self.resolve(overlay)
+                except OverlayTemplateError as e:
+                    raise OverlayTemplateError(f"{episode_id}/{scene.get('id', 'scene')}: {e}") from e
+                if instance is not None:
+                    instances.append(instance)
+            resolved.append(instances)
+        return resolved
+
+
+def _signature(directory: Path, schema_path: Path) -> tuple[tuple[str, int, int], ...]:
+    """(name, mtime, size) of the schema and every template: changes when any of them does."""
+    paths = [schema_path, *sorted(directory.glob("*.json"))]
+    return tuple((p.name, st.st_mtime_ns, st.st_size) for p in paths for st in [p.stat()])
+
+
+def build_overlay_registry(directory: Path = TEMPLATES_DIR, schema_path: Path = SCHEMA_PATH) -> OverlayRegistry:
+    """
+    Load and validate every template in ``directory``.
+
+    Raises:
+        OverlayTemplateError: Listing every template that is unreadable or violates the schema
+    """
+    # jsonschema is slow to import; only loading the registry needs it
+    from jsonschema.validators import validator_for
+
+    with open(schema_path, encoding="utf-8") as f:
+        schema = json.load(f)
+    validator = validator_for(schema)(schema)
+
+    templates: dict[str, OverlayTemplate] = {}
+    problems: list[str] = []
+    for path in sorted(directory.glob("*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                spec = json.load(f)
+        except (OSError, ValueError) as e:
+            problems.append(f"{path.name}: cannot load template: {e}")
+            continue
+        errors = sorted(validator.iter_errors(spec), key=lambda e: e.json_path)
+        if errors:
+            problems.extend(f"{path.name}: {e.json_path}: {e.message}" for e in errors)
+            continue
+        templates[path.stem] = OverlayTemplate.from_spec(path.stem, spec)
+    if problems:
+        raise OverlayTemplateError("Invalid overlay templates:\n" + "\n".join(f"  - {p}" for p in problems))
+    return OverlayRegistry(templates, directory)
+
+
+# (templates dir, schema path) -> (signature, registry)
+_registries: dict[tuple[Path, Path], tuple[tuple[tuple[str, int, int], ...], OverlayRegistry]] = {}
+_lock = threading.Lock()
+
+
+def load_overlay_registry(directory: Path = TEMPLATES_DIR, schema_path: Path = SCHEMA_PATH) -> OverlayRegistry:
+    """The registry for ``directory``, rebuilt only when a template or the schema changed."""
+    key = (directory, schema_path)
+    signature = _signature(directory, schema_path)
+    with _lock:
+        cached = _registries.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        registry = build_overlay_registry(directory, schema_path)
+        _registries[key] = (signature, registry)
+        return registry
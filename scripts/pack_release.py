@@ -93,19 +93,20 @@ def build_release_bundle(cut_manifest_path: Path, include: list[str], out_dir: P
     return bundle_path
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Pack a compiled cut into a release bundle.")
     parser.add_argument("--cut-manifest", required=True, help="Path to output/cuts/<id>/manifest/cut.manifest.json")
     parser.add_argument(
         "--include", nargs="+", default=["episodes"], help="Assets to include: episodes series captions"
     )
     parser.add_argument("--out", default="output/releases", help="Output directory for bundles")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     cut_manifest_path = Path(args.cut_manifest)
     out_dir = PROJECT_ROOT / args.out
     build_release_bundle(cut_manifest_path, include=args.include, out_dir=out_dir)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
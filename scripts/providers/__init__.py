@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 from .base import Provider, RenderConfig
 from .dummy import DummyProvider
 from .prebaked import PrebakedProvider
-from .sora import SoraProvider
+
+if TYPE_CHECKING:
+    from .sora import SoraProvider
 
 __all__ = [
     "Provider",
@@ -14,3 +18,12 @@ __all__ = [
     "PrebakedProvider",
     "SoraProvider",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # SoraProvider pulls in the download/webhook stack; import it only when asked for
+    if name == "SoraProvider":
+        from .sora import SoraProvider
+
+        return SoraProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
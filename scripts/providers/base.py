@@ -5,6 +5,48 @@ from dataclasses import dataclass
 from typing import Any, Protocol
 
 
+@dataclass(frozen=True)
+class EncodeProfile:
+    """
+    Named x264 encode settings shared by every ffmpeg encode in the pipeline.
+
+    ``scale`` and ``max_fps`` shrink the render target (applied once in
+    ``RenderConfig.from_strings``) so cheap review passes also decode, filter
+    and encode fewer pixels.
+    """
+
+    name: str
+    preset: str
+    crf: int
+    scale: float = 1.0
+    max_fps: int | None = None
+    codec: str = "libx264"
+
+    def video_args(self) -> list[str]:
+        """ffmpeg output options for the video stream."""
+        return ["-c:v", self.codec, "-preset", self.preset, "-crf", str(self.crf), "-pix_fmt", "yuv420p"]
+
+
+ENCODE_PROFILES: dict[str, EncodeProfile] = {
+    # Fast candidate review: quarter the pixels, half the frames
+    "draft": EncodeProfile(name="draft", preset="ultrafast", crf=30, scale=0.5, max_fps=12),
+    # libx264 defaults (previous behaviour)
+    "standard": EncodeProfile(name="standard", preset="medium", crf=23),
+    # Release masters
+    "final": EncodeProfile(name="final", preset="slow", crf=18),
+}
+DEFAULT_PROFILE = "standard"
+
+
+def get_encode_profile(name: str | None) -> EncodeProfile:
+    if name is None:
+        return ENCODE_PROFILES[DEFAULT_PROFILE]
+    try:
+        return ENCODE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown render profile '{name}'. Expected one of: {', '.join(ENCODE_PROFILES)}.") from None
+
+
 @dataclass
 class RenderConfig:
     width: int
@@ -12,17 +54,48 @@ class RenderConfig:
     fps: int
     aspect: str
     resolution: str
+    profile: EncodeProfile = ENCODE_PROFILES[DEFAULT_PROFILE]
 
     @staticmethod
-    def from_strings(resolution: str, fps: int, aspect: str) -> RenderConfig:
+    def from_strings(resolution: str, fps: int, aspect: str, profile: str | None = None) -> RenderConfig:
         m = re.match(r"^(\d+)x(\d+)$", resolution)
         if not m:
             raise ValueError(f"Invalid resolution '{resolution}'. Expected WIDTHxHEIGHT, e.g., 1080x1920.")
         w, h = int(m.group(1)), int(m.group(2))
-        return RenderConfig(width=w, height=h, fps=fps, aspect=aspect, resolution=resolution)
+        enc = get_encode_profile(profile)
+        if enc.scale != 1.0:
+            # libx264/yuv420p needs even dimensions
+            w, h = max(2, int(w * enc.scale) // 2 * 2), max(2, int(h * enc.scale) // 2 * 2)
+            resolution = f"{w}x{h}"
+        if enc.max_fps is not None:
+            fps = min(fps, enc.max_fps)
+        return RenderConfig(width=w, height=h, fps=fps, aspect=aspect, resolution=resolution, profile=enc)
+
+
+@dataclass(frozen=True)
+class SceneJob:
+    """One scene render request, as passed to batch-capable providers."""
+
+    episode_id: str
+    scene: dict[str, Any]
+    output_dir: str
+    seed: int | None = None
 
 
 class Provider(Protocol):
+    # Upper bound on concurrent generate_scene() calls (see compile_cut.candidate_workers)
+    max_concurrency: int = 1
+    # True when clips do not depend on the RenderConfig (they are conformed at concat time),
+    # so every --profile pass of a cut reuses the same candidates
+    render_independent: bool = False
+
+    # Providers may additionally implement
+    #   generate_scenes(jobs: list[SceneJob], render_cfg: RenderConfig, max_in_flight: int | None = None,
+    #                   on_done: Callable[[SceneJob, str], None] | None = None) -> list[str]
+    # to receive every pending scene at once (e.g. to submit remote jobs up front);
+    # compile_cut.generate_candidates prefers it over per-scene generate_scene() calls,
+    # and close() -> None to release clients kept open across calls.
+
     def name(self) -> str: ...
 
     def generate_scene(
@@ -1,25 +1,40 @@
 from __future__ import annotations
 
 import hashlib
-import subprocess
-import sys
+import os
 from pathlib import Path
 from typing import Any
 
+from scripts.utils.placeholders import placeholder_factory
+
 from .base import Provider, RenderConfig
 
+# Placeholder colors. A small fixed palette keeps the placeholder pool warm: one
+# seed encode per color and one pooled clip per (color, duration), shared by
+# every scene, candidate and cut instead of two ffmpeg runs per candidate
+PALETTE = (
+    "0x1e2630",
+    "0x2d4059",
+    "0x3a6351",
+    "0x5c3d2e",
+    "0x4b3869",
+    "0x264653",
+    "0x6d597a",
+    "0x7a5c2e",
+)
+
 
 class DummyProvider(Provider):
-    def __init__(self, base_color: str = "0x1e2630") -> None:
-        self.base_color = base_color
+    # Local ffmpeg encodes: one per core
+    max_concurrency = os.cpu_count() or 1
 
     def name(self) -> str:
         return "dummy"
 
-    def _color_for_scene(self, scene_id: str) -> str:
-        # Derive a color from the scene id for variety
-        h = hashlib.blake2s(scene_id.encode("utf-8")).hexdigest()
-        return f"0x{h[:6]}"
+    def _color_for_scene(self, episode_id: str, scene_id: str, seed: int | None) -> str:
+        # Scenes start at a palette entry derived from their id; candidates (seeds) step through it
+        h = int(hashlib.blake2s(f"{episode_id}:{scene_id}".encode()).hexdigest()[:8], 16)
+        return PALETTE[(h + (seed or 0)) % len(PALETTE)]
 
     def generate_scene(
         self,
@@ -35,32 +50,8 @@ class DummyProvider(Provider):
         out_dir.mkdir(parents=True, exist_ok=True)
         out_path = out_dir / f"{scene_id}.mp4"
 
-        # Include seed in color derivation to ensure distinct candidates
-        key = f"{episode_id}:{scene_id}:{seed or 0}"
-        color = self._color_for_scene(key)
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "lavfi",
-            "-i",
-            f"color=size={render_cfg.width}x{render_cfg.height}:rate={render_cfg.fps}:color={color}",
-            "-t",
-            str(duration),
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            str(out_path),
-        ]
-        try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            if result.stderr:
-                print(f"[FFMPEG] {result.stderr}", file=sys.stderr)
-        except subprocess.CalledProcessError as e:
-            error_msg = f"FFmpeg dummy generation failed for scene {scene_id}\n"
-            error_msg += f"Command: {' '.join(cmd)}\n"
-            if e.stderr:
-                error_msg += f"Error output:\n{e.stderr}"
-            raise RuntimeError(error_msg) from e
+        # Distinct colors for up to len(PALETTE) candidates of a scene
+        color = self._color_for_scene(episode_id, scene_id, seed)
+        # Pooled, stream-copy looped placeholder (no per-scene encode)
+        placeholder_factory().materialize(color, duration, render_cfg, out_path)
         return str(out_path)
@@ -0,0 +1,184 @@
+"""
+Append-only journal of remote generation jobs, for crash-safe resume.
+
+Every job submission and status transition is appended as one JSON line to
+``<cache_root>/sora/journal.jsonl``, keyed by (episode, scene, seed, model,
+prompt hash). After a crash, a new run replays the journal and re-attaches to
+the job already submitted for the same key instead of paying for it again.
+Once replay finds many more lines than keys, the file is rewritten with the
+latest state per key (under an exclusive lock that appenders share).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from blake3 import blake3
+
+from scripts.utils.cache import cache_root, fingerprint
+
+# Statuses after which a job's video_id is of no further use ("superseded": the
+# user asked for a new take). A local "timeout" is not one of them: the job may
+# still finish server-side and be re-attached.
+TERMINAL_FAILURES = frozenset({"failed", "expired", "superseded"})
+# Compact once the journal holds this many lines and more than COMPACT_RATIO per key
+COMPACT_MIN_LINES = 256
+COMPACT_RATIO = 4
+# Compaction needs flock to keep concurrent appenders out (not on Windows)
+CAN_COMPACT = importlib.util.find_spec("fcntl") is not None
+
+
+@contextmanager
+def _file_lock(path: Path, exclusive: bool) -> Iterator[None]:
+    """flock on ``path``: appenders share it, compaction takes it exclusively (no-op without fcntl)."""
+    if not CAN_COMPACT:
+        yield
+        return
+    import fcntl
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)  # Releases the lock
+
+
+class JobJournal:
+    """JSONL job journal shared by threads of a process and by concurrent processes (O_APPEND writes)."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or cache_root() / "sora" / "journal.jsonl"
+        self._lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, dict[str, Any]] | None = None
+        self._keys_by_video: dict[str, str] = {}
+
+    @staticmethod
+    def job_key(episode_id: str, scene_id: str, seed: int | None, model: str, prompt: str) -> str:
+        return fingerprint(
+            {
+                "episode_id": episode_id,
+                "scene_id": scene_id,
+                "seed": seed,
+                "model": model,
+                "prompt": blake3(prompt.encode("utf-8")).hexdigest(),
+            }
+        )
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Replay the journal into the latest state per key (caller holds the lock)."""
+        if self._jobs is not None:
+            return self._jobs
+        jobs, lines = self._replay()
+        if CAN_COMPACT and lines >= COMPACT_MIN_LINES and lines > COMPACT_RATIO * len(jobs):
+            jobs = self._compact()
+        self._jobs = jobs
+        return jobs
+
+    def _replay(self) -> tuple[dict[str, dict[str, Any]], int]:
+        """Latest state per key and the number of lines read."""
+        jobs: dict[str, dict[str, Any]] = {}
+        self._keys_by_video.clear()
+        lines = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash mid-write
+                    self._apply(jobs, entry)
+        except FileNotFoundError:
+            pass
+        return jobs, lines
+
+    def _compact(self) -> dict[str, dict[str, Any]]:
+        """Rewrite the journal as one line per key (caller holds the lock)."""
+        with _file_lock(self._lock_path, exclusive=True):
+            # Re-read under the lock: other processes may have appended meanwhile
+            jobs, _lines = self._replay()
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for state in jobs.values():
+                    f.write(json.dumps(state, sort_keys=True) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        return jobs
+
+    def _apply(self, jobs: dict[str, dict[str, Any]], entry: dict[str, Any]) -> None:
+        key, video_id = entry.get("key"), entry.get("video_id")
+        if not key or not video_id:
+            return
+        state = jobs.setdefault(key, {})
+        if state.get("video_id") != video_id:
+            state.clear()
+        state.update(entry)
+        self._keys_by_video[video_id] = key
+
+    def refresh(self) -> None:
+        """Drop the in-memory replay so entries appended by other processes are picked up."""
+        with self._lock:
+            self._jobs = None
+            self._keys_by_video.clear()
+
+    def record(self, key: str, video_id: str, status: str, **extra: Any) -> None:
+        """Append a status transition for ``video_id`` (durable before returning)."""
+        entry = {"ts": time.time(), "key": key, "video_id": video_id, "status": status, **extra}
+        line = (json.dumps(entry, sort_keys=True) + "\n").encode("utf-8")
+        with self._lock:
+            jobs = self._load()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with _file_lock(self._lock_path, exclusive=False):
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line)
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self._apply(jobs, entry)
+
+    def record_status(self, video_id: str, status: str, **extra: Any) -> None:
+        """Append a transition for a journaled ``video_id`` (no-op if it is unknown)."""
+        with self._lock:
+            self._load()
+            key = self._keys_by_video.get(video_id)
+        if key is not None:
+            self.record(key, video_id, status, **extra)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            state = self._load().get(key)
+            return dict(state) if state else None
+
+    def supersede(self, key: str) -> None:
+        """Never resume the current job for ``key`` again (the next request submits a new one)."""
+        state = self.get(key)
+        if state is not None and state.get("status") not in TERMINAL_FAILURES:
+            self.record(key, str(state["video_id"]), "superseded")
+
+    def resumable(self, key: str) -> str | None:
+        """
+        The video_id of a previous job for ``key`` that may still be downloaded, if any.
+
+        A downloaded job is only resumed when its clip is gone (re-downloading
+        beats paying again); while the clip exists, a new request for the same
+        key asks for a new take.
+        """
+        state = self.get(key)
+        if state is None or state.get("status") in TERMINAL_FAILURES:
+            return None
+        if state.get("status") == "downloaded" and (not state.get("path") or Path(state["path"]).exists()):
+            return None
+        return str(state["video_id"])
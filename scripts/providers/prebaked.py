@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import shutil
-import subprocess
-import sys
 from pathlib import Path
 from typing import Any
 
+from scripts.utils.cache import link_or_copy
+from scripts.utils.placeholders import placeholder_factory
+
 from .base import Provider, RenderConfig
 
 
@@ -25,35 +25,53 @@ class PrebakedProvider(Provider):
     Result: All "prebaked" compiles produce placeholder footage until renders added.
     """
 
+    # Mostly file copies; placeholder fallback encodes are tiny
+    max_concurrency = 4
+    # Footage is used as rendered and conformed at concat time
+    render_independent = True
+
     def __init__(self) -> None:
         pass
 
     def name(self) -> str:
         return "prebaked"
 
+    def _footage_candidates(self, episode_id: str, scene_id: str) -> list[Path]:
+        ep_dir = Path("episodes") / episode_id / "renders"
+        return [
+            ep_dir / "final" / f"{scene_id}.mp4",
+            ep_dir / "drafts" / f"{scene_id}.mp4",
+        ]
+
+    def fingerprint_inputs(self, episode_id: str, scene: dict[str, Any]) -> dict[str, Any]:
+        """Identify the footage a scene resolves to, so cached candidates track file changes."""
+        scene_id = scene.get("id") or "scene"
+        for cand in self._footage_candidates(episode_id, scene_id):
+            if cand.exists():
+                st = cand.stat()
+                return {"source": cand.as_posix(), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        return {"source": None}
+
     def generate_scene(
         self,
         episode_id: str,
         scene: dict[str, Any],
         output_dir: str,
         render_cfg: RenderConfig,
-        _seed: int | None = None,
+        seed: int | None = None,  # noqa: ARG002 (footage is fixed; seed does not apply)
     ) -> str:
         scene_id = scene.get("id") or "scene"
         duration = int(scene.get("duration_sec") or 1)
-        ep_dir = Path("episodes") / episode_id / "renders"
-        candidates = [
-            ep_dir / "final" / f"{scene_id}.mp4",
-            ep_dir / "drafts" / f"{scene_id}.mp4",
-        ]
+        candidates = self._footage_candidates(episode_id, scene_id)
         out_dir = Path(output_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
         out_path = out_dir / f"{scene_id}.mp4"
 
-        # Try to find existing pre-rendered footage
+        # Try to find existing pre-rendered footage: reflink/hardlink instead of copying
+        # (falls back to a copy across devices); verify the source is not mid-write
         for cand in candidates:
             if cand.exists():
-                shutil.copy(str(cand), str(out_path))
+                link_or_copy(cand, out_path, reflink=True, verify=True)
                 return str(out_path)
 
         # FALLBACK: Generate solid-color placeholder when no footage exists
@@ -61,29 +79,6 @@ class PrebakedProvider(Provider):
         # metadata-only repos (current state). Replace with actual Sora
         # renders when ready to produce real episodes.
         color = "0x202833"
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "lavfi",
-            "-i",
-            f"color=size={render_cfg.width}x{render_cfg.height}:rate={render_cfg.fps}:color={color}",
-            "-t",
-            str(duration),
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            str(out_path),
-        ]
-        try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            if result.stderr:
-                print(f"[FFMPEG] {result.stderr}", file=sys.stderr)
-        except subprocess.CalledProcessError as e:
-            error_msg = f"FFmpeg fallback generation failed for scene {scene_id}\n"
-            error_msg += f"Command: {' '.join(cmd)}\n"
-            if e.stderr:
-                error_msg += f"Error output:\n{e.stderr}"
-            raise RuntimeError(error_msg) from e
+        # Pooled, stream-copy looped placeholder (no per-scene encode)
+        placeholder_factory().materialize(color, duration, render_cfg, out_path)
         return str(out_path)
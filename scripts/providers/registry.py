@@ -0,0 +1,83 @@
+"""
+Provider registry: resolve a recipe's ``provider.name`` to a provider class.
+
+Built-in providers are referenced by import path and only imported when a
+recipe asks for them (so a prebaked-only compile never loads the OpenAI SDK).
+Third-party packages add providers through the ``claude_holiday.providers``
+entry-point group, e.g. in their pyproject.toml::
+
+    [project.entry-points."claude_holiday.providers"]
+    runway = "my_package.runway:RunwayProvider"
+
+Entry points are only scanned for names that are not built in. Built-ins win
+on a name clash.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from collections.abc import Callable
+from importlib.metadata import entry_points
+
+from .base import Provider
+
+ENTRY_POINT_GROUP = "claude_holiday.providers"
+
+# name -> "module:attribute" of a zero-argument provider factory (usually the class)
+BUILTIN_PROVIDERS: dict[str, str] = {
+    "prebaked": "scripts.providers.prebaked:PrebakedProvider",
+    "dummy": "scripts.providers.dummy:DummyProvider",
+    "sora": "scripts.providers.sora:SoraProvider",
+}
+
+ProviderFactory = Callable[[], Provider]
+
+_factories: dict[str, ProviderFactory] = {}
+_lock = threading.Lock()
+
+
+def _import_target(target: str) -> ProviderFactory:
+    module, _, attr = target.partition(":")
+    factory: ProviderFactory = getattr(importlib.import_module(module), attr)
+    return factory
+
+
+def available_providers() -> list[str]:
+    """Names of built-in and installed (entry-point) providers."""
+    names = set(BUILTIN_PROVIDERS) | set(_factories)
+    names.update(ep.name for ep in entry_points(group=ENTRY_POINT_GROUP))
+    return sorted(names)
+
+
+def register_provider(name: str, factory: ProviderFactory) -> None:
+    """Register ``factory`` under ``name`` in this process (tests, embedding applications)."""
+    with _lock:
+        _factories[name] = factory
+
+
+def provider_factory(name: str) -> ProviderFactory:
+    """
+    The factory registered as ``name``, importing it on first use.
+
+    Raises:
+        ValueError: If no built-in or installed provider has that name
+    """
+    with _lock:
+        factory = _factories.get(name)
+        if factory is not None:
+            return factory
+        if name in BUILTIN_PROVIDERS:
+            factory = _import_target(BUILTIN_PROVIDERS[name])
+        else:
+            matches = list(entry_points(group=ENTRY_POINT_GROUP, name=name))
+            factory = matches[0].load() if matches else None
+        if factory is not None:
+            _factories[name] = factory
+            return factory
+    raise ValueError(f"Unsupported provider '{name}' (supported: {', '.join(available_providers())})")
+
+
+def create_provider(name: str) -> Provider:
+    """A new provider instance (callers keep it for the whole compile to reuse its clients)."""
+    return provider_factory(name)()
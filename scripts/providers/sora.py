@@ -1,36 +1,232 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import importlib.util
 import os
-import subprocess
+import random
 import sys
-import time
+import threading
+import weakref
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None  # type: ignore
-
+from scripts.utils.download import download_to_file, stream_response_to_file, verify_media
 from scripts.utils.ffmpeg import preflight_check
+from scripts.utils.placeholders import placeholder_factory
+from scripts.utils.ratelimit import RateLimiter, openai_limiter
 
-from .base import Provider, RenderConfig
+from .base import Provider, RenderConfig, SceneJob
+from .journal import JobJournal
+from .webhooks import WebhookReceiver
 
-# Polling configuration for async video generation
+# Polling configuration for async video generation: every outstanding job is
+# polled in one loop, starting at POLL_INTERVAL_SECONDS and backing off to
+# POLL_MAX_INTERVAL_SECONDS, with +/- POLL_JITTER randomization
 POLL_INTERVAL_SECONDS = 5
-MAX_POLL_ATTEMPTS = 120  # 10 minutes max wait
+POLL_MAX_INTERVAL_SECONDS = 20
+POLL_BACKOFF = 1.5
+POLL_JITTER = 0.2
+JOB_TIMEOUT_SECONDS = 600  # 10 minutes max wait per job
+# With completion webhooks enabled, polling is only a safety net for lost deliveries
+WEBHOOK_POLL_INTERVAL_SECONDS = 60
+WEBHOOK_POLL_MAX_INTERVAL_SECONDS = 120
+# Ranged segments fetched at once for large URL downloads
+DOWNLOAD_PARALLEL = 4
+
+
+class _StatusPoller:
+    """
+    Single polling loop shared by all in-flight Sora jobs of a batch.
+
+    ``wait(video_id)`` returns a future resolved with the completed video
+    (or failed with the job's error / a timeout). Each round retrieves every
+    outstanding job concurrently, then sleeps with exponential backoff and
+    jitter; a newly registered job resets the interval. ``notify(video_id)``
+    (e.g. from a completion webhook) ends the sleep early and re-checks just
+    the notified jobs.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        interval: float | None = None,
+        max_interval: float | None = None,
+        timeout: float | None = None,
+        on_status: Callable[[str, str], None] | None = None,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        self.client = client
+        self.limiter = limiter or openai_limiter()
+        self.on_status = on_status
+        self._last_status: dict[str, str] = {}
+        self.interval = POLL_INTERVAL_SECONDS if interval is None else interval
+        self.max_interval = POLL_MAX_INTERVAL_SECONDS if max_interval is None else max_interval
+        self.timeout = JOB_TIMEOUT_SECONDS if timeout is None else timeout
+        self._waiters: dict[str, tuple[asyncio.Future[Any], float]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._delay = self.interval
+        # Loop time of the next full poll round (None = schedule from the current delay)
+        self._next_poll: float | None = None
+        self._notified: set[str] = set()
+        self._wake = asyncio.Event()
+
+    def use_intervals(self, interval: float, max_interval: float) -> None:
+        """Switch to other poll intervals (e.g. slow safety-net polling once webhooks are live)."""
+        self.interval = interval
+        self.max_interval = max_interval
+        self._delay = interval
+
+    def wait(self, video_id: str) -> asyncio.Future[Any]:
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[Any] = loop.create_future()
+        self._waiters[video_id] = (fut, loop.time() + self.timeout)
+        self._delay = self.interval
+        if self._next_poll is not None and self._next_poll > loop.time() + self.interval:
+            # Poll the new job within one base interval (the loop re-plans its sleep on wake-up)
+            self._next_poll = loop.time() + self.interval
+            self._wake.set()
+        if video_id in self._notified:
+            # The callback beat the registration
+            self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return fut
+
+    def notify(self, video_id: str) -> None:
+        """Re-check ``video_id`` now instead of at the next poll (call on the loop's thread)."""
+        self._notified.add(video_id)
+        self._wake.set()
+
+    def _transition(self, video_id: str, status: str) -> None:
+        if self.on_status is not None and self._last_status.get(video_id) != status:
+            self.on_status(video_id, status)
+        self._last_status[video_id] = status
+
+    def _resolve(self, video_id: str, result: Any = None, error: BaseException | None = None) -> None:
+        fut, _deadline = self._waiters.pop(video_id)
+        if fut.done():
+            return
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    async def _next_batch(self) -> list[str]:
+        """
+        Sleep until the next poll round or a notification; returns the job ids to retrieve.
+
+        The round is scheduled once, so a stream of notifications cannot postpone
+        it, and every wake-up also re-checks jobs whose deadline has passed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._next_poll is None:
+            self._next_poll = loop.time() + self._delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+        remaining = self._next_poll - loop.time()
+        if remaining > 0:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=remaining)
+        self._wake.clear()
+        now = loop.time()
+        if now >= self._next_poll:
+            self._next_poll = None
+            self._delay = min(self._delay * POLL_BACKOFF, self.max_interval)
+            video_ids = list(self._waiters)
+        else:
+            video_ids = [
+                video_id
+                for video_id, (_fut, deadline) in self._waiters.items()
+                if video_id in self._notified or now >= deadline
+            ]
+        self._notified.difference_update(video_ids)
+        return video_ids
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._waiters:
+            video_ids = await self._next_batch()
+            statuses = await asyncio.gather(
+                *(self.limiter.acall(self.client.videos.retrieve, video_id) for video_id in video_ids),
+                return_exceptions=True,
+            )
+            now = loop.time()
+            for video_id, status in zip(video_ids, statuses, strict=True):
+                if isinstance(status, BaseException):
+                    # Transient API error: keep polling until the job's deadline
+                    print(f"[SORA] Poll error for {video_id}: {status}", file=sys.stderr)
+                elif status.status == "completed":
+                    self._transition(video_id, status.status)
+                    self._resolve(video_id, result=status)
+                    continue
+                elif status.status == "failed":
+                    self._transition(video_id, status.status)
+                    error_msg = getattr(status, "error", "Unknown error")
+                    self._resolve(video_id, error=RuntimeError(f"Sora video generation failed: {error_msg}"))
+                    continue
+                else:
+                    # Still processing (queued or in_progress)
+                    self._transition(video_id, status.status)
+                    progress = getattr(status, "progress", 0)
+                    print(f"[SORA] {video_id}: {status.status}, progress: {progress}%", file=sys.stderr)
+                if now >= self._waiters[video_id][1]:
+                    self._transition(video_id, "timeout")
+                    self._resolve(
+                        video_id,
+                        error=TimeoutError(f"Sora video generation timed out after {self.timeout:.0f}s"),
+                    )
 
 
 class SoraProvider(Provider):
-    def __init__(self, api_key: str | None = None, model: str = "sora-2") -> None:
-        if OpenAI is None:
+    # Concurrent API jobs in flight (per generate_scenes() batch)
+    max_concurrency = 4
+    # Sora picks its own size; clips are conformed to the render settings at concat time
+    render_independent = True
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "sora-2",
+        max_in_flight: int | None = None,
+        journal: JobJournal | None = None,
+        webhook_port: int | None = None,
+        webhook_secret: str | None = None,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        # The SDK itself is imported on first use (it is slow to import)
+        if importlib.util.find_spec("openai") is None:
             raise ImportError("OpenAI SDK is required for SoraProvider. Install it with: pip install openai")
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.model = model  # "sora-2" or "sora-2-pro"
+        if max_in_flight is not None:
+            self.max_concurrency = max(1, int(max_in_flight))
+        # Submitted jobs survive crashes: a rerun re-attaches instead of re-paying
+        self.journal = journal or JobJournal()
+        # Shared with every other OpenAI caller in the process (pacing, 429 backoff)
+        self.limiter = limiter or openai_limiter()
+        # Completion webhooks (port 0 = any free port); unset means poll-only
+        env_port = os.environ.get("CH_SORA_WEBHOOK_PORT")
+        self.webhook_port = webhook_port if webhook_port is not None else (int(env_port) if env_port else None)
+        self.webhook_secret = webhook_secret or os.environ.get("OPENAI_WEBHOOK_SECRET")
+        self.webhook_url: str | None = None
+        # Output paths that hold placeholder fallbacks instead of real renders
+        self._fallbacks: set[str] = set()
+        # One event loop and API client for the provider's lifetime (see close()):
+        # every batch reuses the client's connection pool
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: Any = None
+        self._run_lock = threading.Lock()
 
     def name(self) -> str:
         return "sora"
 
+    def fingerprint_inputs(self, _episode_id: str, _scene: dict[str, Any]) -> dict[str, Any]:
+        return {"model": self.model}
+
+    def is_fallback(self, path: str | Path) -> bool:
+        """True if ``path`` was produced by the placeholder fallback (never cache these)."""
+        return str(Path(path).resolve()) in self._fallbacks
+
     def _build_prompt(self, scene: dict[str, Any]) -> str:
         """Build a video generation prompt from scene data."""
         # Get the sora_prompt if available (from episode manifests)
@@ -47,121 +243,270 @@ class SoraProvider(Provider):
         duration = scene.get("duration_sec", 5)
         return f"A {duration}-second professional video scene. Vertical 9:16 format. Scene ID: {scene_id}"
 
-    def generate_scene(  # noqa: ARG002 (seed reserved for future use)
+    def _job_key(self, job: SceneJob) -> str:
+        scene_id = job.scene.get("id") or "scene"
+        return self.journal.job_key(job.episode_id, str(scene_id), job.seed, self.model, self._build_prompt(job.scene))
+
+    def supersede(self, jobs: list[SceneJob]) -> None:
+        """Submit fresh jobs for ``jobs`` next time instead of resuming journaled ones (a forced regeneration)."""
+        self.journal.refresh()
+        for job in jobs:
+            self.journal.supersede(self._job_key(job))
+
+    def _async_client(self) -> Any:
+        """A new pooled async client (built once per provider, see ``_shared_client``)."""
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is required for SoraProvider")
+        from openai import AsyncOpenAI
+
+        # Retries go through the shared limiter so 429s back off every worker together
+        return AsyncOpenAI(api_key=self.api_key, max_retries=0)
+
+    def _shared_client(self) -> Any:
+        """The provider's client, created on first use inside its event loop."""
+        if self._client is None:
+            self._client = self._async_client()
+        return self._client
+
+    def close(self) -> None:
+        """Close the API client and event loop shared by every batch; the next batch opens new ones."""
+        with self._run_lock:
+            if self._loop is None:
+                return
+            try:
+                if self._client is not None:
+                    self._loop.run_until_complete(self._client.close())
+                self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+                self._loop.run_until_complete(self._loop.shutdown_default_executor())
+            finally:
+                self._client = None
+                self._loop.close()
+                self._loop = None
+
+    def generate_scene(
         self,
-        _episode_id: str,
+        episode_id: str,
         scene: dict[str, Any],
         output_dir: str,
         render_cfg: RenderConfig,
-        seed: int | None = None,  # noqa: ARG002
+        seed: int | None = None,
     ) -> str:
         """
         Generate a scene using OpenAI's Sora 2 API.
 
-        The Sora API is async: create a job, then poll until complete.
         Returns: path to MP4 file for this scene.
         """
-        scene_id = scene.get("id") or "scene"
-        duration = int(scene.get("duration_sec") or 5)
+        return self.generate_scenes([SceneJob(episode_id, scene, output_dir, seed)], render_cfg)[0]
 
-        out_dir = Path(output_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        out_path = out_dir / f"{scene_id}.mp4"
+    def generate_scenes(
+        self,
+        jobs: list[SceneJob],
+        render_cfg: RenderConfig,
+        max_in_flight: int | None = None,
+        on_done: Callable[[SceneJob, str], None] | None = None,
+    ) -> list[str]:
+        """
+        Generate many scenes concurrently.
 
-        # Build the prompt for Sora
-        prompt = self._build_prompt(scene)
+        All jobs are submitted up front (at most ``max_in_flight``, default
+        ``max_concurrency``, in flight) and polled together, so a batch takes
+        about as long as its slowest job rather than the sum of all jobs.
+        With ``webhook_port`` set, a local receiver wakes each job as soon as
+        its completion webhook arrives and polling drops to a slow safety net.
+        Failed jobs fall back to placeholders (see ``is_fallback``); if a
+        fallback itself fails, the other jobs still finish before its error is
+        raised. ``on_done(job, path)`` is called as each job finishes, in
+        completion order. Batches share one client and its connections until
+        ``close()``; calls from several threads run one batch at a time.
+        Returns: output paths in ``jobs`` order.
+        """
+        if not jobs:
+            return []
+        with self._run_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                # Providers dropped without close() still release their event loop
+                weakref.finalize(self, self._loop.close)
+            return self._loop.run_until_complete(
+                self._generate_all(jobs, render_cfg, max_in_flight or self.max_concurrency, on_done)
+            )
 
+    async def _generate_all(
+        self,
+        jobs: list[SceneJob],
+        render_cfg: RenderConfig,
+        max_in_flight: int,
+        on_done: Callable[[SceneJob, str], None] | None = None,
+    ) -> list[str]:
+        client: Any = None
+        client_error: Exception | None = None
         try:
-            # Initialize client (will fail if API key is missing)
-            if not self.api_key:
-                raise ValueError("OPENAI_API_KEY environment variable is required for SoraProvider")
-            client = OpenAI(api_key=self.api_key)
-
-            print(f"[SORA] Creating video job for scene {scene_id}...", file=sys.stderr)
-
-            # Create video generation job (async)
-            # Note: Sora 2 API only takes model and prompt
-            # Duration and size are inferred or specified in the prompt
-            video = client.videos.create(
-                model=self.model,
-                prompt=prompt,
-            )
+            client = self._shared_client()
+        except Exception as e:
+            client_error = e
+        poller = _StatusPoller(client, on_status=self.journal.record_status, limiter=self.limiter)
+        in_flight = asyncio.Semaphore(max(1, max_in_flight))
 
-            video_id = video.id
-            print(f"[SORA] Job created: {video_id}, polling for completion...", file=sys.stderr)
+        async def run(job: SceneJob) -> str:
+            path = await self._generate_one(client, client_error, poller, in_flight, job, render_cfg)
+            if on_done is not None:
+                on_done(job, path)
+            return path
 
-            # Poll for completion
-            for _attempt in range(MAX_POLL_ATTEMPTS):
-                video_status = client.videos.retrieve(video_id)
+        receiver: WebhookReceiver | None = None
+        try:
+            self.journal.refresh()
+            if self.webhook_port is not None and client is not None:
+                receiver = self._start_receiver(poller)
+            # Every job runs to the end (and reaches on_done) even if another one raised
+            outcomes = await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+        finally:
+            if receiver is not None:
+                await asyncio.to_thread(receiver.stop)
+                self.webhook_url = None
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return [str(outcome) for outcome in outcomes]
 
-                if video_status.status == "completed":
-                    # Download the video
-                    print("[SORA] Video completed, downloading...", file=sys.stderr)
-                    import urllib.request
+    def _start_receiver(self, poller: _StatusPoller) -> WebhookReceiver | None:
+        """
+        Start the completion-webhook receiver waking ``poller``, or None to poll only.
 
-                    # The completed video should have a URL
-                    video_url = None
-                    if hasattr(video_status, "url") and video_status.url:
-                        video_url = video_status.url
-                    elif hasattr(video_status, "download_url") and video_status.download_url:
-                        video_url = video_status.download_url
+        The port may be taken (another batch or ``compile --jobs`` worker already
+        listens on it): that batch keeps receiving the deliveries and this one
+        falls back to regular polling.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            receiver = WebhookReceiver(
+                lambda video_id, _status: loop.call_soon_threadsafe(poller.notify, video_id),
+                port=self.webhook_port or 0,
+                secret=self.webhook_secret,
+            ).start()
+        except OSError as e:
+            print(f"[SORA] Cannot listen for webhooks on port {self.webhook_port} ({e}); polling only", file=sys.stderr)
+            return None
+        poller.use_intervals(WEBHOOK_POLL_INTERVAL_SECONDS, WEBHOOK_POLL_MAX_INTERVAL_SECONDS)
+        self.webhook_url = receiver.url
+        return receiver
 
-                    if video_url:
-                        urllib.request.urlretrieve(video_url, out_path)
-                    else:
-                        # Try to get video content directly via the content endpoint
-                        video_content = client.videos.content(video_id)
-                        with open(out_path, "wb") as f:
-                            f.write(video_content.read())
+    async def _generate_one(
+        self,
+        client: Any,
+        client_error: Exception | None,
+        poller: _StatusPoller,
+        in_flight: asyncio.Semaphore,
+        job: SceneJob,
+        render_cfg: RenderConfig,
+    ) -> str:
+        """
+        Generate one job's clip, falling back to a placeholder if anything about it fails.
 
-                    print(f"[SORA] Generated scene {scene_id} -> {out_path}", file=sys.stderr)
-                    return str(out_path)
+        Only a failing fallback (e.g. no ffmpeg) raises.
+        """
+        scene_id = job.scene.get("id") or "scene"
+        out_dir = Path(job.output_dir)
+        out_path = out_dir / f"{scene_id}.mp4"
+        try:
+            if client_error is not None:
+                raise client_error
+            out_dir.mkdir(parents=True, exist_ok=True)
+            # Build the prompt for Sora
+            prompt = self._build_prompt(job.scene)
+            key = self._job_key(job)
 
-                elif video_status.status == "failed":
-                    error_msg = getattr(video_status, "error", "Unknown error")
-                    raise RuntimeError(f"Sora video generation failed: {error_msg}")
+            async with in_flight:
+                video_status = await self._reattach(client, key)
+                if video_status is None:
+                    print(f"[SORA] Creating video job for scene {scene_id}...", file=sys.stderr)
+                    # Create video generation job (async)
+                    # Note: Sora 2 API only takes model and prompt
+                    # Duration and size are inferred or specified in the prompt
+                    video = await self.limiter.asubmit(client.videos.create, model=self.model, prompt=prompt)
+                    self.journal.record(key, video.id, "submitted", episode_id=job.episode_id, scene_id=scene_id)
+                    print(f"[SORA] Job created: {video.id}, polling for completion...", file=sys.stderr)
+                    video_status = await poller.wait(video.id)
+                elif video_status.status != "completed":
+                    video_status = await poller.wait(video_status.id)
 
-                else:
-                    # Still processing (queued or in_progress)
-                    progress = getattr(video_status, "progress", 0)
-                    print(f"[SORA] Status: {video_status.status}, progress: {progress}%", file=sys.stderr)
-                    time.sleep(POLL_INTERVAL_SECONDS)
+                print(f"[SORA] Video {video_status.id} completed, downloading...", file=sys.stderr)
+                await self._download(client, video_status, out_path)
+                self.journal.record(key, video_status.id, "downloaded", path=str(out_path))
 
-            raise TimeoutError(f"Sora video generation timed out after {MAX_POLL_ATTEMPTS * POLL_INTERVAL_SECONDS}s")
+            print(f"[SORA] Generated scene {scene_id} -> {out_path}", file=sys.stderr)
+            return str(out_path)
 
         except Exception as e:
             # If Sora fails, fall back to generating a placeholder clip
             error_msg = f"Sora API request failed for scene {scene_id}: {e}"
             print(f"[SORA ERROR] {error_msg}", file=sys.stderr)
-            print(f"[SORA] Generating fallback placeholder for {scene_id}", file=sys.stderr)
-
-            # Generate a placeholder using ffmpeg (same as prebaked fallback)
-            preflight_check()
-            color = "0x202833"
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-f",
-                "lavfi",
-                "-i",
-                f"color=size={render_cfg.width}x{render_cfg.height}:rate={render_cfg.fps}:color={color}",
-                "-t",
-                str(duration),
-                "-c:v",
-                "libx264",
-                "-pix_fmt",
-                "yuv420p",
-                str(out_path),
-            ]
             try:
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-                if result.stderr:
-                    print(f"[FFMPEG] {result.stderr}", file=sys.stderr)
-            except subprocess.CalledProcessError as ffmpeg_err:
-                error_msg = f"FFmpeg fallback generation failed for scene {scene_id}\n"
-                error_msg += f"Command: {' '.join(cmd)}\n"
-                if ffmpeg_err.stderr:
-                    error_msg += f"Error output:\n{ffmpeg_err.stderr}"
-                raise RuntimeError(error_msg) from ffmpeg_err
-
+                duration = int(job.scene.get("duration_sec") or 5)
+            except (TypeError, ValueError):
+                duration = 5
+            out_dir.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(self._fallback, scene_id, duration, render_cfg, out_path)
             return str(out_path)
+
+    async def _reattach(self, client: Any, key: str) -> Any:
+        """
+        Current status of a journaled job for ``key``, or None if a new job must be submitted.
+
+        Jobs that failed, expired or are no longer retrievable are marked so and skipped.
+        """
+        video_id = self.journal.resumable(key)
+        if video_id is None:
+            return None
+        try:
+            status = await self.limiter.acall(client.videos.retrieve, video_id)
+        except Exception as e:
+            print(f"[SORA] Journaled job {video_id} is no longer available: {e}", file=sys.stderr)
+            self.journal.record(key, video_id, "expired")
+            return None
+        if status.status == "failed":
+            self.journal.record(key, video_id, "failed")
+            return None
+        print(f"[SORA] Re-attaching to journaled job {video_id} ({status.status})", file=sys.stderr)
+        return status
+
+    async def _download(self, client: Any, video_status: Any, out_path: Path) -> None:
+        """
+        Stream the finished video to ``out_path`` via a resumable ``.part`` file.
+
+        Chunks go straight to disk (memory stays flat whatever the clip size) and
+        the file is probe-checked before it is renamed into place; an interrupted
+        transfer of the same video resumes from its partial file on retry.
+        """
+        # The completed video may carry a URL
+        video_url = getattr(video_status, "url", None) or getattr(video_status, "download_url", None)
+        if video_url:
+            await asyncio.to_thread(
+                download_to_file,
+                video_url,
+                out_path,
+                parallel=DOWNLOAD_PARALLEL,
+                verify=verify_media,
+                source_id=video_status.id,
+            )
+        else:
+            # Otherwise stream from the content endpoint (an API request: rate limited)
+            await self.limiter.acall(
+                stream_response_to_file,
+                lambda headers: client.with_streaming_response.videos.download_content(
+                    video_status.id, extra_headers=headers or None
+                ),
+                out_path,
+                verify=verify_media,
+                source_id=video_status.id,
+            )
+
+    def _fallback(self, scene_id: str, duration: int, render_cfg: RenderConfig, out_path: Path) -> None:
+        print(f"[SORA] Generating fallback placeholder for {scene_id}", file=sys.stderr)
+
+        # Generate a placeholder using ffmpeg (same as prebaked fallback)
+        preflight_check()
+        color = "0x202833"
+        placeholder_factory().materialize(color, duration, render_cfg, out_path)
+
+        self._fallbacks.add(str(out_path.resolve()))
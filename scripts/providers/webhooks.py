@@ -0,0 +1,136 @@
+"""
+Local receiver for OpenAI job-completion webhooks.
+
+OpenAI delivers ``video.completed`` / ``video.failed`` events to the endpoint
+configured for the project (typically a tunnel forwarding to this receiver).
+Each verified event wakes the waiting scene at once; polling stays on as a
+slow safety net for lost deliveries.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+WEBHOOK_PATH = "/sora/webhook"
+# Reject deliveries whose signed timestamp is further than this from now (replay protection)
+SIGNATURE_TOLERANCE_SECONDS = 300
+
+
+def verify_signature(body: bytes, headers: Mapping[str, str], secret: str, now: float | None = None) -> bool:
+    """
+    Check a Standard Webhooks signature (the scheme OpenAI uses).
+
+    The signed content is ``"{webhook-id}.{webhook-timestamp}.{body}"``, HMAC-SHA256'd
+    with the base64 secret (``whsec_`` prefix stripped); ``webhook-signature`` holds
+    space-separated ``v1,<base64 digest>`` entries.
+    """
+    msg_id = headers.get("webhook-id")
+    timestamp = headers.get("webhook-timestamp")
+    signatures = headers.get("webhook-signature")
+    if not msg_id or not timestamp or not signatures:
+        return False
+    try:
+        sent_at = int(timestamp)
+        key = base64.b64decode(secret.removeprefix("whsec_"))
+    except ValueError:
+        return False
+    if abs((time.time() if now is None else now) - sent_at) > SIGNATURE_TOLERANCE_SECONDS:
+        return False
+    signed = f"{msg_id}.{timestamp}.".encode() + body
+    expected = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+    return any(
+        version == "v1" and hmac.compare_digest(sig, expected)
+        for version, _, sig in (entry.partition(",") for entry in signatures.split())
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        if self.path.split("?", 1)[0] != WEBHOOK_PATH:
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        if self.server.secret and not verify_signature(body, headers, self.server.secret):
+            self.send_error(401, "Invalid webhook signature")
+            return
+        try:
+            event = json.loads(body)
+        except ValueError:
+            self.send_error(400, "Invalid JSON")
+            return
+        event_type = str(event.get("type", ""))
+        video_id = (event.get("data") or {}).get("id")
+        if event_type.startswith("video.") and video_id:
+            # on_event must be quick (it only schedules a status check): OpenAI retries slow deliveries
+            self.server.on_event(str(video_id), event_type.removeprefix("video."))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    secret: str | None
+    on_event: Callable[[str, str], None]
+
+
+class WebhookReceiver:
+    """
+    Threaded HTTP server calling ``on_event(video_id, status)`` for each video event.
+
+    ``status`` is the event type without its ``video.`` prefix (``completed``,
+    ``failed``, ...). Events are only hints: receivers should re-check the job
+    via the API before acting. With ``secret`` set, unsigned or mis-signed
+    deliveries are rejected with 401.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[str, str], None],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        secret: str | None = None,
+    ) -> None:
+        self._server = _Server((host, port), _Handler)
+        self._server.secret = secret
+        self._server.on_event = on_event
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}{WEBHOOK_PATH}"
+
+    def start(self) -> WebhookReceiver:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="sora-webhooks", daemon=True)
+        self._thread.start()
+        print(f"[SORA] Listening for completion webhooks on {self.url}", file=sys.stderr)
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> WebhookReceiver:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
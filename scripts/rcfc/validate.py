@@ -0,0 +1,168 @@
+"""
+RCFC recipe validation against ``schemas/rcfc.schema.json``.
+
+The schema is checked and compiled into a validator once per process (and
+again only if the schema file changes), so validating a recipe costs just
+the instance check. ``python -m scripts.rcfc.validate`` / ``ch validate``
+checks whole directories of recipes, in parallel for large batches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import yaml
+
+from scripts.utils.manifests import load_yaml
+
+if TYPE_CHECKING:
+    from jsonschema.protocols import Validator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA_PATH = PROJECT_ROOT / "schemas" / "rcfc.schema.json"
+RECIPE_SUFFIXES = (".yaml", ".yml")
+# Below this many recipes a process pool costs more than it saves
+PARALLEL_MIN_RECIPES = 32
+
+# schema path -> (mtime_ns, compiled validator)
+_validators: dict[Path, tuple[int, Validator]] = {}
+_lock = threading.Lock()
+
+
+def recipe_validator(schema_path: Path = SCHEMA_PATH) -> Validator:
+    """
+    The compiled validator for ``schema_path``, built on first use.
+
+    Raises:
+        FileNotFoundError: If the schema file is missing
+        jsonschema.SchemaError: If the schema itself is invalid
+    """
+    # jsonschema is slow to import; only validation needs it
+    from jsonschema.validators import validator_for
+
+    if not schema_path.exists():
+        raise FileNotFoundError(f"Schema file not found: {schema_path}")
+    mtime = schema_path.stat().st_mtime_ns
+    with _lock:
+        cached = _validators.get(schema_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(schema_path, encoding="utf-8") as f:
+            schema = json.load(f)
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        validator = cls(schema)
+        _validators[schema_path] = (mtime, validator)
+        return validator
+
+
+def validate_recipe(recipe: dict[str, Any], schema_path: Path = SCHEMA_PATH) -> None:
+    """
+    Validate recipe against RCFC schema. Fails fast with clear errors.
+
+    Raises:
+        ValidationError: If recipe does not conform to schema
+        FileNotFoundError: If schema file is missing
+    """
+    from jsonschema import ValidationError
+    from jsonschema.exceptions import best_match
+
+    # Same error jsonschema.validate() would raise, without rebuilding the validator
+    e = best_match(recipe_validator(schema_path).iter_errors(recipe))
+    if e is None:
+        return
+
+    # Build a helpful error message with context
+    error_path = ".".join(str(p) for p in e.path) if e.path else "root"
+    error_msg = f"Recipe validation failed at '{error_path}': {e.message}"
+
+    # Add schema context if available
+    if e.schema_path:
+        schema_location = ".".join(str(p) for p in e.schema_path)
+        error_msg += f"\nSchema requirement: {schema_location}"
+
+    # Add the failing value for debugging
+    if e.instance is not None:
+        error_msg += f"\nProvided value: {e.instance}"
+
+    raise ValidationError(error_msg) from e
+
+
+def recipe_errors(recipe: Any, schema_path: Path = SCHEMA_PATH) -> list[str]:
+    """Every schema violation in ``recipe`` as ``"<json path>: <message>"``, in document order."""
+    errors = sorted(recipe_validator(schema_path).iter_errors(recipe), key=lambda e: e.json_path)
+    return [f"{e.json_path}: {e.message}" for e in errors]
+
+
+def check_recipe_file(path: Path) -> list[str]:
+    """Errors for one recipe file (unreadable or malformed YAML counts as an error)."""
+    try:
+        recipe = load_yaml(path)
+    except (OSError, yaml.YAMLError) as e:
+        return [f"$: cannot load recipe: {e}"]
+    return recipe_errors(recipe)
+
+
+def collect_recipes(paths: list[Path]) -> list[Path]:
+    """Recipe files named by ``paths``; directories are searched recursively."""
+    found: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found.extend(sorted(p for p in path.rglob("*") if p.suffix in RECIPE_SUFFIXES and p.is_file()))
+        else:
+            found.append(path)
+    return found
+
+
+def validate_files(paths: list[Path], jobs: int = 0) -> dict[Path, list[str]]:
+    """
+    Validate recipe files, returning the errors per file (empty list = valid).
+
+    ``jobs`` worker processes are used for batches of at least
+    ``PARALLEL_MIN_RECIPES`` files (0 = one per CPU core).
+    """
+    recipe_validator()  # Compile before forking so workers inherit it
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers <= 1 or len(paths) < PARALLEL_MIN_RECIPES:
+        return {path: check_recipe_file(path) for path in paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(paths) // (workers * 4))
+        return dict(zip(paths, pool.map(check_recipe_file, paths, chunksize=chunksize), strict=True))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate RCFC recipes against the schema.")
+    parser.add_argument(
+        "paths", nargs="*", default=["recipes"], help="Recipe files or directories to search (default: recipes)"
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=0, help="Worker processes for large batches (default: 0 = one per CPU core)"
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error(f"--jobs must be >= 0 (got {args.jobs})")
+
+    files = collect_recipes([Path(p) for p in args.paths])
+    if not files:
+        print(f"[VALIDATE] No recipes found in: {' '.join(args.paths)}", file=sys.stderr)
+        return 1
+    results = validate_files(files, jobs=args.jobs)
+    invalid = 0
+    for path, errors in results.items():
+        if errors:
+            invalid += 1
+            for error in errors:
+                print(f"{path}: {error}")
+    print(f"[VALIDATE] {len(results)} recipe(s) checked, {invalid} invalid", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,14 @@ import argparse
 import base64
 import json
 import subprocess
+import sys
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from scripts.episode_index import load_episode_index
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 
@@ -17,11 +20,6 @@ def load_json(path: Path) -> dict[str, Any]:
         return json.load(f)
 
 
-def load_yaml(path: Path) -> dict[str, Any]:
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-
 def save_yaml(path: Path, data: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
@@ -126,13 +124,22 @@ def generate_contact_sheet(cut_id: str, episode_selections: list[dict[str, Any]]
                     label += " ⭐ (Current Winner)"
                 html_parts.append(f"<div class='candidate-label'>{label}</div>")
 
+                # Review from the low-res proxy when one was generated (ch candidates --proxies)
+                preview_rel = cand.get("proxy_path")
+                preview_path = PROJECT_ROOT / preview_rel if preview_rel else None
+                if preview_path is None or not preview_path.exists():
+                    preview_rel, preview_path = None, video_path
+
                 # Extract thumbnail
-                thumb = extract_thumbnail(video_path)
+                thumb = extract_thumbnail(preview_path)
                 if thumb:
                     html_parts.append(f"<img src='{thumb}' alt='Candidate {idx}'>")
                 else:
                     html_parts.append("<div class='no-video'>Video not found or could not extract frame</div>")
 
+                if preview_rel:
+                    # review.html lives in output/cuts/<cut_id>/
+                    html_parts.append(f"<div class='path'><a href='../../../{preview_rel}'>Preview (proxy)</a></div>")
                 html_parts.append(f"<div class='path'>{rel_path}</div>")
                 html_parts.append("</div>")
 
@@ -160,17 +167,17 @@ def build_episode_selections(cut_manifest_path: Path) -> list[Path]:
     selections_files: list[Path] = []
     episode_selections: list[dict[str, Any]] = []
 
+    index = load_episode_index(PROJECT_ROOT / "episodes")
     for ep in include_eps:
-        ep_manifest_path = PROJECT_ROOT / "episodes" / ep / "episode.yaml"
-        if not ep_manifest_path.exists():
-            print(f"[WARN] Episode manifest not found: {ep_manifest_path}")
+        try:
+            scenes = index.scenes(ep)
+        except FileNotFoundError as e:
+            print(f"[WARN] {e}")
             continue
-        ep_manifest = load_yaml(ep_manifest_path)
-        scenes = ep_manifest.get("scenes") or []
 
         out_doc: dict[str, Any] = {"episode_id": ep, "cut_id": cut_id, "scenes": {}}
         for scene in scenes:
-            sid = scene.get("id", "scene")
+            sid = scene["id"] or "scene"
             cand_dir = PROJECT_ROOT / "output" / "tmp" / cut_id / ep / sid
             cand_meta = cand_dir / "candidates.json"
             candidates: list[dict[str, Any]] = []
@@ -199,16 +206,17 @@ def build_episode_selections(cut_manifest_path: Path) -> list[Path]:
     return selections_files
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(description="Generate per-episode selections YAML from cut candidates.")
     p.add_argument(
         "--cut-manifest",
         required=True,
         help="Path to output/cuts/<id>/manifest/cut.manifest.json generated with --candidates-only",
     )
-    args = p.parse_args()
+    args = p.parse_args(argv)
     build_episode_selections(Path(args.cut_manifest))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
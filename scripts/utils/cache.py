@@ -0,0 +1,151 @@
+"""Content-addressed caches shared across runs for Claude Holiday."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from blake3 import blake3
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def cache_root() -> Path:
+    """
+    Root directory for persistent caches.
+
+    Defaults to ``output/cache`` and can be relocated (e.g. to a shared render
+    volume) with the ``CH_CACHE_DIR`` environment variable.
+    """
+    env_dir = os.environ.get("CH_CACHE_DIR")
+    return Path(env_dir) if env_dir else PROJECT_ROOT / "output" / "cache"
+
+
+def fingerprint(data: Any) -> str:
+    """Stable blake3 hex digest of JSON-serializable data (key order independent)."""
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return blake3(payload).hexdigest()
+
+
+# Linux ioctl to clone a file's extents (btrfs, XFS, bcachefs, ...): _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-write clone of ``src`` at ``dst``; False when the platform/filesystem cannot."""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def link_or_copy(src: Path, dst: Path, reflink: bool = False, verify: bool = False) -> str:
+    """
+    Materialize ``src`` at ``dst`` as a hardlink, copying when linking is not possible.
+
+    With ``reflink``, a copy-on-write clone is tried first: as cheap as a link on
+    CoW filesystems, but later in-place edits of either file stay independent.
+    With ``verify``, the source's size/mtime must be unchanged across the
+    operation and ``dst`` must match its size (guards against ingesting a file
+    that is still being written).
+
+    Any existing ``dst`` is unlinked first so writers never truncate a shared inode.
+    Returns the method used: ``"reflink"``, ``"hardlink"`` or ``"copy"``.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.unlink(missing_ok=True)
+    before = src.stat()
+    if reflink and _reflink(src, dst):
+        method = "reflink"
+    else:
+        try:
+            os.link(src, dst)
+            method = "hardlink"
+        except OSError:
+            # Cross-device or filesystem without hardlink support
+            shutil.copy2(src, dst)
+            method = "copy"
+    if verify:
+        after = src.stat()
+        if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns) or (
+            dst.stat().st_size != before.st_size
+        ):
+            dst.unlink(missing_ok=True)
+            raise RuntimeError(f"Source changed while materializing {src} -> {dst}; retry once it is complete")
+    return method
+
+
+class CandidateCache:
+    """
+    Persistent scene candidate cache keyed by a fingerprint of everything that
+    determines the rendered clip: provider, episode, canonical scene content,
+    seed and render settings (plus optional provider-specific inputs).
+
+    Entries live under ``<cache_root>/candidates/<ab>/<fingerprint>.mp4``.
+    Hit/miss counters are thread-safe so the cache can be shared by the
+    candidate thread pool.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = (root or cache_root()) / "candidates"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(
+        self,
+        provider_name: str,
+        episode_id: str,
+        scene: dict[str, Any],
+        seed: int | None,
+        render_cfg: Any,
+        extra: dict[str, Any] | None = None,
+    ) -> str:
+        return fingerprint(
+            {
+                "provider": provider_name,
+                "episode_id": episode_id,
+                "scene": scene,
+                "seed": seed,
+                "render": asdict(render_cfg) if render_cfg is not None else None,
+                "extra": extra or {},
+            }
+        )
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.mp4"
+
+    def fetch(self, key: str, dst: Path) -> bool:
+        """Materialize a cached clip at ``dst``. Returns False (and counts a miss) if absent."""
+        entry = self.path_for(key)
+        if entry.exists() and entry.stat().st_size > 0:
+            link_or_copy(entry, dst)
+            with self._lock:
+                self.hits += 1
+            return True
+        with self._lock:
+            self.misses += 1
+        return False
+
+    def store(self, key: str, clip: Path) -> None:
+        """Add a freshly generated clip to the cache (atomic; last writer wins)."""
+        entry = self.path_for(key)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        link_or_copy(clip, tmp)
+        os.replace(tmp, entry)
+
+    def summary(self) -> str:
+        return f"{self.hits} hit(s), {self.misses} miss(es)"
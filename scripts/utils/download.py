@@ -0,0 +1,264 @@
+"""
+Streaming, resumable HTTP downloads for generated media.
+
+Bytes are streamed in fixed-size chunks to ``<dest>.<source>.part`` (memory
+stays flat regardless of file size) and atomically renamed into place once the
+size and an optional content check pass. An interrupted download resumes with
+an HTTP ``Range`` request, but only from a partial file of the same source
+(e.g. the same Sora video id); large files can be fetched as several ranged
+segments in parallel, each of which resumes independently.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import re
+import shutil
+import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import requests
+
+from .probe import probe_file
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+# Split into parallel ranged fetches only above this size
+PARALLEL_MIN_BYTES = 32 << 20
+DOWNLOAD_RETRIES = 3
+REQUEST_TIMEOUT_SECONDS = 60
+
+
+class DownloadError(RuntimeError):
+    """Raised when a download cannot be completed or fails verification."""
+
+
+def part_path(dest: Path, source_id: str | None = None) -> Path:
+    """Partial file for ``dest``; keyed by ``source_id`` so bytes of another source are never resumed."""
+    if source_id is None:
+        return dest.with_name(f"{dest.name}.part")
+    return dest.with_name(f"{dest.name}.{re.sub(r'[^A-Za-z0-9_-]', '_', source_id)}.part")
+
+
+def _discard_stale_parts(dest: Path, part: Path) -> None:
+    """Remove partial files (and segments) of ``dest`` left by downloads from other sources."""
+    for path in dest.parent.glob(f"{glob.escape(dest.name)}.*part*"):
+        if path != part and not path.name.startswith(f"{part.name}."):
+            path.unlink(missing_ok=True)
+
+
+def verify_media(path: Path) -> None:
+    """
+    Post-download content check: the file must be non-empty and, when ffprobe
+    is available, contain a decodable video stream with a duration.
+    """
+    if path.stat().st_size == 0:
+        raise DownloadError(f"{path.name} is empty")
+    if shutil.which("ffprobe") is None:
+        return
+    # Not cached: the path is a .part file about to be renamed
+    info = probe_file(path)
+    if not info.video_codec or not info.duration:
+        raise DownloadError(f"{path.name} has no playable video stream")
+
+
+def _probe_remote(url: str, session: requests.Session) -> tuple[int | None, bool]:
+    """(Content-Length, accepts byte ranges) from a HEAD request; (None, False) if unknown."""
+    import requests
+
+    try:
+        resp = session.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT_SECONDS)
+        resp.raise_for_status()
+    except requests.RequestException:
+        return None, False
+    length = resp.headers.get("Content-Length")
+    accepts = resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+    return (int(length) if length and length.isdigit() else None), accepts
+
+
+def _fetch_range(
+    url: str,
+    target: Path,
+    session: requests.Session,
+    start: int = 0,
+    end: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """
+    Stream bytes ``start``..``end`` (inclusive, None = EOF) of ``url`` into ``target``.
+
+    Resumes from whatever ``target`` already holds, retrying dropped connections.
+    """
+    import requests
+
+    for attempt in range(DOWNLOAD_RETRIES + 1):
+        have = target.stat().st_size if target.exists() else 0
+        if end is not None and have >= end - start + 1:
+            return
+        headers = {}
+        if start + have > 0 or end is not None:
+            headers["Range"] = f"bytes={start + have}-{'' if end is None else end}"
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT_SECONDS) as resp:
+                if resp.status_code == 416 and end is None:
+                    return  # Already complete
+                resp.raise_for_status()
+                # 200 means the server ignored Range: start over
+                mode = "ab" if resp.status_code == 206 else "wb"
+                if mode == "wb" and start > 0:
+                    raise DownloadError(f"Server ignored range request for {url}")
+                with open(target, mode) as f:
+                    for chunk in resp.iter_content(chunk_size=chunk_size):
+                        if chunk:
+                            f.write(chunk)
+            return
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == DOWNLOAD_RETRIES:
+                raise DownloadError(f"Download of {url} failed after {attempt + 1} attempts: {e}") from e
+            print(f"[DOWNLOAD] Interrupted ({e}); resuming {target.name}", file=sys.stderr)
+
+
+def download_to_file(
+    url: str,
+    dest: Path,
+    *,
+    parallel: int = 1,
+    expected_size: int | None = None,
+    verify: Callable[[Path], None] | None = None,
+    session: requests.Session | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    source_id: str | None = None,
+) -> Path:
+    """
+    Download ``url`` to ``dest`` via a resumable ``.part`` file.
+
+    ``source_id`` names what is being downloaded (URLs of the same video may
+    differ between attempts): only a partial file of the same source is
+    resumed, partial files of other sources are discarded.
+
+    With ``parallel`` > 1 and a server that accepts byte ranges, files above
+    ``PARALLEL_MIN_BYTES`` are fetched as that many ranged segments at once.
+    The result must match ``expected_size`` (or the server's Content-Length)
+    and pass ``verify`` (e.g. a probe check) before it is renamed to ``dest``;
+    a file failing verification is discarded.
+    """
+    import requests  # Only URL downloads need it; keeps importing this module cheap
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = part_path(dest, source_id)
+    if source_id is not None:
+        _discard_stale_parts(dest, part)
+    own_session = session is None
+    sess = session or requests.Session()
+    try:
+        total, accepts_ranges = _probe_remote(url, sess)
+        expected = expected_size if expected_size is not None else total
+
+        if parallel > 1 and accepts_ranges and total and total >= PARALLEL_MIN_BYTES:
+            bounds = [(i * total // parallel, (i + 1) * total // parallel - 1) for i in range(parallel)]
+            segments = [part.with_name(f"{part.name}.{i}") for i in range(parallel)]
+            with ThreadPoolExecutor(max_workers=parallel) as pool:
+                list(
+                    pool.map(
+                        lambda job: _fetch_range(url, job[0], sess, job[1][0], job[1][1], chunk_size),
+                        zip(segments, bounds, strict=True),
+                    )
+                )
+            with open(part, "wb") as out:
+                for seg in segments:
+                    with open(seg, "rb") as f:
+                        shutil.copyfileobj(f, out, chunk_size)
+            for seg in segments:
+                seg.unlink(missing_ok=True)
+        else:
+            _fetch_range(url, part, sess, chunk_size=chunk_size)
+    finally:
+        if own_session:
+            sess.close()
+
+    finalize_download(part, dest, expected, verify)
+    return dest
+
+
+def finalize_download(
+    part: Path,
+    dest: Path,
+    expected_size: int | None = None,
+    verify: Callable[[Path], None] | None = None,
+) -> None:
+    """Check a completed ``.part`` file and atomically move it to ``dest``."""
+    size = part.stat().st_size if part.exists() else 0
+    if expected_size is not None and size != expected_size:
+        if size > expected_size:
+            part.unlink(missing_ok=True)  # Corrupt beyond repair; next attempt starts fresh
+        raise DownloadError(f"Downloaded {size} bytes for {dest.name}, expected {expected_size}")
+    if verify is not None:
+        try:
+            verify(part)
+        except Exception as e:
+            part.unlink(missing_ok=True)
+            raise DownloadError(f"Downloaded file failed verification for {dest.name}: {e}") from e
+    os.replace(part, dest)
+
+
+def _streamed_total(resp: Any, resumed_from: int) -> int | None:
+    """
+    Full size of the file a streaming response delivers, from its headers (None if unknown).
+
+    Raises:
+        DownloadError: If a 206 response does not continue at ``resumed_from``
+    """
+    headers = getattr(resp, "headers", None) or {}
+    if resumed_from:
+        m = re.fullmatch(r"bytes (\d+)-\d+/(\d+|\*)", (headers.get("Content-Range") or "").strip())
+        if m is None:
+            return None
+        if int(m.group(1)) != resumed_from:
+            raise DownloadError(f"Server resumed at byte {m.group(1)}, expected {resumed_from}")
+        return int(m.group(2)) if m.group(2) != "*" else None
+    # A content-encoded body is decoded while streamed: its Content-Length is not the file size
+    length = headers.get("Content-Length")
+    if length and length.isdigit() and headers.get("Content-Encoding", "identity") == "identity":
+        return int(length)
+    return None
+
+
+async def stream_response_to_file(
+    open_stream: Callable[[dict[str, str]], Any],
+    dest: Path,
+    *,
+    verify: Callable[[Path], None] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    source_id: str | None = None,
+) -> Path:
+    """
+    Async variant for SDK streaming responses (e.g. ``client.with_streaming_response``).
+
+    ``open_stream(headers)`` must return an async context manager yielding a
+    response with ``status_code``, ``headers`` and ``iter_bytes(chunk_size)``.
+    A leftover ``.part`` file of the same ``source_id`` is resumed with a Range
+    header when the server honors it (206); the result must match the size the
+    response headers announce.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = part_path(dest, source_id)
+    if source_id is not None:
+        _discard_stale_parts(dest, part)
+    have = part.stat().st_size if part.exists() else 0
+    headers = {"Range": f"bytes={have}-"} if have else {}
+    async with open_stream(headers) as resp:
+        resumed_from = have if have and resp.status_code == 206 else 0
+        try:
+            expected = _streamed_total(resp, resumed_from)
+        except DownloadError:
+            part.unlink(missing_ok=True)  # Next attempt starts fresh
+            raise
+        with open(part, "ab" if resumed_from else "wb") as f:
+            async for chunk in resp.iter_bytes(chunk_size):
+                f.write(chunk)
+    finalize_download(part, dest, expected, verify)
+    return dest
@@ -2,41 +2,197 @@
 
 from __future__ import annotations
 
+import json
+import os
+import re
 import shutil
 import subprocess
 import sys
+import threading
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
 
+from .cache import cache_root, fingerprint
 
-def preflight_check() -> None:
+# Bump when the detection/parsing below changes to invalidate disk entries
+CAPABILITIES_CACHE_VERSION = 1
+
+_FLAGS_RE = re.compile(r"[A-Z.|]+")
+
+INSTALL_HINT = (
+    "Install it via:\n"
+    "  • macOS: brew install ffmpeg\n"
+    "  • Ubuntu/Debian: sudo apt install ffmpeg\n"
+    "  • Windows: Download from https://ffmpeg.org/download.html"
+)
+
+
+class FFmpegUnavailableError(RuntimeError):
+    """Raised when ffmpeg is missing, broken, or lacks a component a stage requires."""
+
+
+@dataclass(frozen=True)
+class FFmpegCapabilities:
+    """What a given ffmpeg binary supports, detected once per binary version."""
+
+    path: str
+    version: str
+    encoders: frozenset[str] = field(default_factory=frozenset)
+    filters: frozenset[str] = field(default_factory=frozenset)
+    muxers: frozenset[str] = field(default_factory=frozenset)
+
+    def has_encoder(self, name: str) -> bool:
+        return name in self.encoders
+
+    def has_filter(self, name: str) -> bool:
+        return name in self.filters
+
+    def has_muxer(self, name: str) -> bool:
+        return name in self.muxers
+
+    def to_json(self) -> dict[str, object]:
+        data = asdict(self)
+        for key in ("encoders", "filters", "muxers"):
+            data[key] = sorted(data[key])
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> FFmpegCapabilities:
+        return cls(
+            path=str(data["path"]),
+            version=str(data["version"]),
+            encoders=frozenset(data.get("encoders") or []),  # type: ignore[arg-type]
+            filters=frozenset(data.get("filters") or []),  # type: ignore[arg-type]
+            muxers=frozenset(data.get("muxers") or []),  # type: ignore[arg-type]
+        )
+
+
+def parse_listing(output: str) -> frozenset[str]:
     """
-    Verify FFmpeg is installed and accessible.
+    Parse ``ffmpeg -encoders`` / ``-filters`` / ``-muxers`` output into component names.
 
-    Raises:
-        RuntimeError: If FFmpeg is not found or not functional
+    Entry lines look like `` V....D libx264  description`` or `` TSC drawtext  V->V ...``:
+    a column of capability flags followed by the name. Legend lines (``V..... = Video``)
+    and headers are skipped.
     """
-    # Check if ffmpeg is in PATH
-    ffmpeg_path = shutil.which("ffmpeg")
-
-    if not ffmpeg_path:
-        error_msg = (
-            "FFmpeg is not installed or not in your PATH.\n"
-            "Install it via:\n"
-            "  • macOS: brew install ffmpeg\n"
-            "  • Ubuntu/Debian: sudo apt install ffmpeg\n"
-            "  • Windows: Download from https://ffmpeg.org/download.html"
-        )
-        raise RuntimeError(error_msg)
+    names: set[str] = set()
+    for line in output.splitlines():
+        tokens = line.split()
+        if len(tokens) < 2 or tokens[1] == "=" or not _FLAGS_RE.fullmatch(tokens[0]):
+            continue
+        names.update(n for n in tokens[1].split(",") if n)
+    return frozenset(names)
+
+
+def _ffmpeg_output(ffmpeg_path: str, *args: str) -> str:
+    result = subprocess.run(
+        [ffmpeg_path, "-hide_banner", *args], check=True, capture_output=True, text=True, timeout=10
+    )
+    return result.stdout
 
-    # Verify ffmpeg is functional by checking version
-    try:
-        result = subprocess.run(["ffmpeg", "-version"], check=True, capture_output=True, text=True, timeout=5)
-        # Extract version from output (first line typically contains version info)
-        version_line = result.stdout.split("\n")[0] if result.stdout else "unknown"
-        print(f"[FFMPEG] Found: {version_line}", file=sys.stderr)
 
+def detect_capabilities(ffmpeg_path: str) -> FFmpegCapabilities:
+    """Query ``ffmpeg_path`` for its version, encoders, filters and muxers."""
+    try:
+        version_out = _ffmpeg_output(ffmpeg_path, "-version")
+        encoders = parse_listing(_ffmpeg_output(ffmpeg_path, "-encoders"))
+        filters = parse_listing(_ffmpeg_output(ffmpeg_path, "-filters"))
+        muxers = parse_listing(_ffmpeg_output(ffmpeg_path, "-muxers"))
     except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"FFmpeg found at {ffmpeg_path} but failed to execute: {e}") from e
+        raise FFmpegUnavailableError(f"FFmpeg found at {ffmpeg_path} but failed to execute: {e}") from e
     except subprocess.TimeoutExpired as e:
-        raise RuntimeError(f"FFmpeg at {ffmpeg_path} timed out during version check") from e
-    except Exception as e:
-        raise RuntimeError(f"Unexpected error checking FFmpeg: {e}") from e
+        raise FFmpegUnavailableError(f"FFmpeg at {ffmpeg_path} timed out during capability detection") from e
+    except OSError as e:
+        raise FFmpegUnavailableError(f"Unexpected error checking FFmpeg: {e}") from e
+
+    # First line typically contains version info
+    version_line = version_out.split("\n")[0] if version_out else "unknown"
+    return FFmpegCapabilities(
+        path=ffmpeg_path,
+        version=version_line,
+        encoders=encoders,
+        filters=filters,
+        muxers=muxers,
+    )
+
+
+_memo: dict[str, FFmpegCapabilities] = {}
+_memo_lock = threading.Lock()
+
+
+def ffmpeg_capabilities(ffmpeg_path: str | None = None) -> FFmpegCapabilities:
+    """
+    Capabilities of the ffmpeg on PATH (or ``ffmpeg_path``).
+
+    Detection runs once per binary: results are memoized per process and
+    persisted under ``<cache_root>/ffmpeg/`` keyed by the binary's resolved path,
+    size and mtime, so later runs pay no subprocess cost until ffmpeg changes.
+
+    Raises:
+        FFmpegUnavailableError: If FFmpeg is not found or not functional
+    """
+    path = ffmpeg_path or shutil.which("ffmpeg")
+    if not path:
+        raise FFmpegUnavailableError(f"FFmpeg is not installed or not in your PATH.\n{INSTALL_HINT}")
+
+    resolved = Path(path).resolve()
+    st = resolved.stat()
+    key = fingerprint(
+        {
+            "v": CAPABILITIES_CACHE_VERSION,
+            "path": resolved.as_posix(),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+    )
+    with _memo_lock:
+        caps = _memo.get(key)
+    if caps is not None:
+        return caps
+
+    entry = cache_root() / "ffmpeg" / f"{key}.json"
+    try:
+        with open(entry, encoding="utf-8") as f:
+            caps = FFmpegCapabilities.from_json(json.load(f))
+    except (OSError, ValueError, KeyError):
+        caps = detect_capabilities(path)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(caps.to_json(), f, indent=2)
+        os.replace(tmp, entry)
+        print(f"[FFMPEG] Found: {caps.version}", file=sys.stderr)
+
+    with _memo_lock:
+        _memo[key] = caps
+    return caps
+
+
+def preflight_check(
+    filters: Iterable[str] = (),
+    encoders: Iterable[str] = ("libx264",),
+) -> FFmpegCapabilities:
+    """
+    Verify FFmpeg is installed and supports the components a stage needs.
+
+    Uses the cached capability registry, so repeated calls are free.
+
+    Raises:
+        FFmpegUnavailableError: If FFmpeg is not found, not functional, or lacks a required filter/encoder
+    """
+    caps = ffmpeg_capabilities()
+
+    missing_filters = sorted(f for f in filters if not caps.has_filter(f))
+    missing_encoders = sorted(e for e in encoders if not caps.has_encoder(e))
+    if missing_filters or missing_encoders:
+        lines = [f"FFmpeg at {caps.path} ({caps.version}) is missing required components:"]
+        if missing_filters:
+            lines.append(f"  • filters: {', '.join(missing_filters)}")
+        if missing_encoders:
+            lines.append(f"  • encoders: {', '.join(missing_encoders)}")
+        if "drawtext" in missing_filters:
+            lines.append("drawtext requires an FFmpeg build with libfreetype (e.g. --enable-libfreetype).")
+        lines.append(INSTALL_HINT)
+        raise FFmpegUnavailableError("\n".join(lines))
+    return caps
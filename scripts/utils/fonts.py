@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import subprocess
 import sys
@@ -29,12 +30,14 @@ FONT_PATHS = {
 }
 
 
+@functools.cache
 def find_system_font() -> str | None:
     """
     Find an available system font for FFmpeg drawtext.
 
     Returns the path to a suitable font file, or None if no font is found.
     Prioritizes Unicode-capable fonts for international character support.
+    Memoized per process (the ``fc-match`` fallback spawns a subprocess).
     """
     platform = sys.platform
 
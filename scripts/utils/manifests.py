@@ -0,0 +1,107 @@
+"""
+Shared YAML loader for episode manifests, recipes, selections and configs.
+
+Parsing uses libyaml (``CSafeLoader``) when PyYAML was built with it. Parsed
+documents are memoized per process and persisted under
+``<cache_root>/yaml/`` in ``marshal`` format, keyed by path and checked
+against the file's mtime and size, so an unchanged manifest is parsed once and
+then only unmarshalled. Every call returns a fresh copy that callers may mutate.
+"""
+
+from __future__ import annotations
+
+import copy
+import marshal
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .cache import cache_root, fingerprint
+
+YAML_LOADER: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Files modified this recently may change again within the filesystem's
+# timestamp granularity without their mtime moving: parse them, don't cache them
+RACY_WINDOW_NS = 2_000_000_000
+
+# resolved path -> (mtime_ns, size, marshalled document or None, parsed document)
+_memo: dict[str, tuple[int, int, bytes | None, Any]] = {}
+_lock = threading.Lock()
+
+
+def parse_yaml(text: str) -> Any:
+    return yaml.load(text, Loader=YAML_LOADER)
+
+
+def _encode(data: Any) -> bytes | None:
+    """Marshalled ``data``, or None for documents holding other types (YAML timestamps)."""
+    try:
+        return marshal.dumps(data)
+    except ValueError:
+        return None
+
+
+def _disk_path(path: str) -> Path:
+    # marshal's format is only stable within one Python version
+    key = fingerprint({"path": path, "python": sys.version_info[:2], "marshal": marshal.version})
+    return cache_root() / "yaml" / f"{key}.marshal"
+
+
+def _read_disk(cache_file: Path, mtime_ns: int, size: int) -> bytes | None:
+    try:
+        cached_mtime, cached_size, blob = marshal.loads(cache_file.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cached_mtime != mtime_ns or cached_size != size or not isinstance(blob, bytes):
+        return None
+    return blob
+
+
+def _write_disk(cache_file: Path, mtime_ns: int, size: int, blob: bytes) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(marshal.dumps((mtime_ns, size, blob)))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # Read-only cache volume: parsing still works
+
+
+def load_yaml(path: Path) -> Any:
+    """
+    Parsed YAML document at ``path`` (a fresh copy on every call).
+
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If it is not valid YAML
+    """
+    st = os.stat(path)
+    key = os.path.realpath(path)
+    racy = time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS
+
+    if not racy:
+        with _lock:
+            hit = _memo.get(key)
+        if hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size):
+            return marshal.loads(hit[2]) if hit[2] is not None else copy.deepcopy(hit[3])
+        cache_file = _disk_path(key)
+        blob = _read_disk(cache_file, st.st_mtime_ns, st.st_size)
+        if blob is not None:
+            with _lock:
+                _memo[key] = (st.st_mtime_ns, st.st_size, blob, None)
+            return marshal.loads(blob)
+
+    with open(path, encoding="utf-8") as f:
+        data = parse_yaml(f.read())
+    if racy:
+        return data
+    blob = _encode(data)
+    with _lock:
+        _memo[key] = (st.st_mtime_ns, st.st_size, blob, copy.deepcopy(data) if blob is None else None)
+    if blob is not None:
+        _write_disk(cache_file, st.st_mtime_ns, st.st_size, blob)
+    return data
@@ -0,0 +1,147 @@
+"""
+Placeholder clip factory: solid-color scenes without per-scene encoding.
+
+A placeholder only varies by color, size, fps, encode profile and duration.
+The factory encodes a one-second seed segment (exactly one GOP) once per
+(color, size, fps, profile), then builds any duration by stream-copy looping
+the seed through the concat demuxer. Seeds and finished clips are pooled under
+``<cache_root>/placeholders/`` and handed out as hardlinks, so scenes,
+candidates and cuts share them.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+from .cache import cache_root, fingerprint, link_or_copy
+
+SEED_SECONDS = 1
+
+
+def _run_ffmpeg(cmd: list[str], what: str) -> None:
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        if result.stderr:
+            print(f"[FFMPEG] {result.stderr}", file=sys.stderr)
+    except subprocess.CalledProcessError as e:
+        error_msg = f"FFmpeg {what} failed\n"
+        error_msg += f"Command: {' '.join(cmd)}\n"
+        if e.stderr:
+            error_msg += f"Error output:\n{e.stderr}"
+        raise RuntimeError(error_msg) from e
+
+
+class PlaceholderFactory:
+    """Pooled, stream-copy built placeholder clips (thread-safe; processes share the pool on disk)."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = (root or cache_root()) / "placeholders"
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _seed_spec(self, color: str, render_cfg: Any) -> dict[str, Any]:
+        return {
+            "color": color,
+            "width": render_cfg.width,
+            "height": render_cfg.height,
+            "fps": render_cfg.fps,
+            "video_args": render_cfg.profile.video_args(),
+        }
+
+    def seed_segment(self, color: str, render_cfg: Any) -> Path:
+        """One-GOP seed clip for (color, size, fps, profile), encoded on first use."""
+        key = fingerprint(self._seed_spec(color, render_cfg))
+        seed = self.root / "seeds" / f"{key}.mp4"
+        with self._lock_for(key):
+            if seed.exists() and seed.stat().st_size > 0:
+                return seed
+            seed.parent.mkdir(parents=True, exist_ok=True)
+            tmp = seed.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp.mp4")
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-f",
+                "lavfi",
+                "-i",
+                f"color=size={render_cfg.width}x{render_cfg.height}:rate={render_cfg.fps}:color={color}",
+                "-t",
+                str(SEED_SECONDS),
+                *render_cfg.profile.video_args(),
+                # A single closed GOP, so copies can be joined at any seed boundary
+                "-g",
+                str(render_cfg.fps * SEED_SECONDS),
+                "-keyint_min",
+                str(render_cfg.fps * SEED_SECONDS),
+                "-sc_threshold",
+                "0",
+                str(tmp),
+            ]
+            _run_ffmpeg(cmd, f"placeholder seed encode ({color} {render_cfg.width}x{render_cfg.height})")
+            os.replace(tmp, seed)
+        return seed
+
+    def clip(self, color: str, duration: float, render_cfg: Any) -> Path:
+        """Pooled placeholder of ``duration`` seconds (seed looped by stream copy, trimmed at the tail)."""
+        duration = max(float(duration), 0.1)
+        seed = self.seed_segment(color, render_cfg)
+        key = fingerprint({**self._seed_spec(color, render_cfg), "duration": duration})
+        pooled = self.root / "clips" / key[:2] / f"{key}.mp4"
+        with self._lock_for(key):
+            if pooled.exists() and pooled.stat().st_size > 0:
+                return pooled
+            pooled.parent.mkdir(parents=True, exist_ok=True)
+            stem = f"{key}.{os.getpid()}.{threading.get_ident()}"
+            concat_list = pooled.with_name(f"{stem}.txt")
+            tmp = pooled.with_name(f"{stem}.tmp.mp4")
+            repeats = max(1, math.ceil(duration / SEED_SECONDS))
+            concat_list.write_text(f"file '{seed.resolve().as_posix()}'\n" * repeats, encoding="utf-8")
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                str(concat_list),
+                "-t",
+                str(duration),
+                "-c",
+                "copy",
+                str(tmp),
+            ]
+            try:
+                _run_ffmpeg(cmd, f"placeholder loop ({duration}s)")
+                os.replace(tmp, pooled)
+            finally:
+                concat_list.unlink(missing_ok=True)
+        return pooled
+
+    def materialize(self, color: str, duration: float, render_cfg: Any, out_path: Path) -> Path:
+        """Place a placeholder at ``out_path`` (hardlink into the pool, copy across devices)."""
+        link_or_copy(self.clip(color, duration, render_cfg), out_path)
+        return out_path
+
+
+_default_factory: PlaceholderFactory | None = None
+_default_lock = threading.Lock()
+
+
+def placeholder_factory() -> PlaceholderFactory:
+    """Process-wide factory rooted at the current ``cache_root()``."""
+    global _default_factory
+    with _default_lock:
+        root = cache_root() / "placeholders"
+        if _default_factory is None or _default_factory.root != root:
+            _default_factory = PlaceholderFactory()
+        return _default_factory
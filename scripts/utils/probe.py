@@ -0,0 +1,252 @@
+"""
+ffprobe helpers: structured stream metadata for scene clips.
+
+Every file is probed with a single ffprobe call (streams, format and the
+packet keyframe flags of the first ``KEYFRAME_PROBE_SECONDS``). Results are cached in memory and on disk under
+``<cache_root>/probe/``, keyed by path + size + mtime, so all pipeline stages
+(and later runs) share one probe per clip.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Any
+
+from .cache import cache_root, fingerprint
+
+# Bump when MediaInfo fields or their derivation change to invalidate disk entries
+PROBE_CACHE_VERSION = 3
+# Packets are read only this far into a file: enough GOPs to measure the
+# keyframe interval, without demuxing whole episodes
+KEYFRAME_PROBE_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """Stream parameters of a media file relevant to concat/encode decisions."""
+
+    duration: float | None
+    video_codec: str | None
+    width: int | None
+    height: int | None
+    fps: str | None  # ffprobe r_frame_rate, e.g. "24/1"
+    pix_fmt: str | None
+    has_audio: bool
+    audio_codec: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    keyframe_interval: float | None = None  # mean seconds between video keyframes (first KEYFRAME_PROBE_SECONDS)
+    video_profile: str | None = None  # e.g. "High"
+    video_level: int | None = None  # e.g. 40 for H.264 level 4.0
+    time_base: str | None = None  # video stream time base, e.g. "1/12288"
+    channel_layout: str | None = None  # e.g. "stereo"
+
+    @property
+    def fps_value(self) -> Fraction | None:
+        if not self.fps:
+            return None
+        try:
+            value = Fraction(self.fps)
+        except (ValueError, ZeroDivisionError):
+            return None
+        return value if value > 0 else None
+
+    def concat_signature(self) -> tuple[Any, ...]:
+        """Parameters that must match across clips for concat-demuxer stream copy."""
+        return (
+            self.video_codec,
+            self.video_profile,
+            self.video_level,
+            self.time_base,
+            self.width,
+            self.height,
+            self.fps_value,
+            self.pix_fmt,
+            self.has_audio,
+            self.audio_codec,
+            self.sample_rate,
+            self.channels,
+            self.channel_layout,
+        )
+
+
+def parse_probe(data: dict[str, Any]) -> MediaInfo:
+    """Build a MediaInfo from ffprobe JSON output (``streams``, ``format`` and optional ``packets``)."""
+    streams = data.get("streams") or []
+    video: dict[str, Any] = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    duration_raw = (data.get("format") or {}).get("duration") or video.get("duration")
+    try:
+        duration = float(duration_raw) if duration_raw is not None else None
+    except ValueError:
+        duration = None
+
+    return MediaInfo(
+        duration=duration,
+        video_codec=video.get("codec_name"),
+        width=video.get("width"),
+        height=video.get("height"),
+        fps=video.get("r_frame_rate"),
+        pix_fmt=video.get("pix_fmt"),
+        has_audio=audio is not None,
+        audio_codec=audio.get("codec_name") if audio else None,
+        sample_rate=int(audio["sample_rate"]) if audio and audio.get("sample_rate") else None,
+        channels=audio.get("channels") if audio else None,
+        keyframe_interval=_keyframe_interval(data.get("packets") or [], video.get("index")),
+        video_profile=video.get("profile"),
+        video_level=video.get("level"),
+        time_base=video.get("time_base"),
+        channel_layout=audio.get("channel_layout") if audio else None,
+    )
+
+
+def _keyframe_interval(packets: list[dict[str, Any]], video_index: int | None) -> float | None:
+    times: list[float] = []
+    for pkt in packets:
+        if pkt.get("stream_index") != video_index or "K" not in (pkt.get("flags") or ""):
+            continue
+        try:
+            times.append(float(pkt["pts_time"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    if len(times) < 2:
+        return None
+    times.sort()
+    return (times[-1] - times[0]) / (len(times) - 1)
+
+
+def _run_ffprobe(path: Path) -> MediaInfo:
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "stream:format:packet=stream_index,pts_time,flags",
+        "-read_intervals",
+        f"%+{KEYFRAME_PROBE_SECONDS}",
+        "-of",
+        "json",
+        str(path),
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        error_msg = f"ffprobe failed for {path}\n"
+        error_msg += f"Command: {' '.join(cmd)}\n"
+        if e.stderr:
+            error_msg += f"Error output:\n{e.stderr}"
+        raise RuntimeError(error_msg) from e
+    return parse_probe(json.loads(result.stdout or "{}"))
+
+
+class ProbeCache:
+    """
+    Memoized ffprobe results, persisted as ``<root>/probe/<ab>/<key>.json``.
+
+    The key covers the resolved path, size and mtime, so a re-rendered clip is
+    re-probed while untouched clips are never probed twice. Safe to share
+    between threads; processes share through the disk entries.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = (root or cache_root()) / "probe"
+        self._memo: dict[str, MediaInfo] = {}
+        self._lock = threading.Lock()
+
+    def key(self, path: Path) -> str:
+        p = Path(path).resolve()
+        st = p.stat()
+        return fingerprint(
+            {"v": PROBE_CACHE_VERSION, "path": p.as_posix(), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        )
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, path: Path) -> MediaInfo:
+        key = self.key(path)
+        with self._lock:
+            info = self._memo.get(key)
+        if info is not None:
+            return info
+
+        entry = self.path_for(key)
+        try:
+            with open(entry, encoding="utf-8") as f:
+                info = MediaInfo(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            info = _run_ffprobe(Path(path))
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(info), f)
+            os.replace(tmp, entry)
+
+        with self._lock:
+            self._memo[key] = info
+        return info
+
+
+_default_cache: ProbeCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_probe_cache() -> ProbeCache:
+    """Process-wide probe cache rooted at the current ``cache_root()``."""
+    global _default_cache
+    with _default_lock:
+        root = cache_root() / "probe"
+        if _default_cache is None or _default_cache.root != root:
+            _default_cache = ProbeCache()
+        return _default_cache
+
+
+def probe_media(path: Path, cache: ProbeCache | None = None) -> MediaInfo:
+    """Stream parameters of ``path`` (one ffprobe per file version, then cached)."""
+    return (cache or default_probe_cache()).get(path)
+
+
+def probe_file(path: Path) -> MediaInfo:
+    """Stream parameters of ``path`` without the cache (for transient files such as partial downloads)."""
+    return _run_ffprobe(Path(path))
+
+
+def probe_many(paths: list[Path], max_workers: int = 8, cache: ProbeCache | None = None) -> list[MediaInfo]:
+    """Probe many files concurrently; results are returned in input order."""
+    cache = cache or default_probe_cache()
+    if len(paths) <= 1 or max_workers <= 1:
+        return [cache.get(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+        return list(pool.map(cache.get, paths))
+
+
+def stream_copy_compatible(infos: list[MediaInfo], width: int, height: int, fps: int) -> bool:
+    """
+    True when clips can be joined with the concat demuxer and ``-c copy`` and
+    still match what the re-encode path would produce: identical H.264/yuv420p
+    streams (same profile, level and time base) at the target size and frame
+    rate, with either no audio anywhere or the same AAC layout on every clip.
+    Clips whose probe lacks any of these fields are re-encoded.
+    """
+    if not infos:
+        return False
+    first = infos[0]
+    if None in (first.video_profile, first.video_level, first.time_base):
+        return False
+    if first.has_audio and first.channel_layout is None:
+        return False
+    if any(info.concat_signature() != first.concat_signature() for info in infos[1:]):
+        return False
+    if first.video_codec != "h264" or first.pix_fmt != "yuv420p":
+        return False
+    if (first.width, first.height) != (width, height) or first.fps_value != fps:
+        return False
+    return not first.has_audio or first.audio_codec == "aac"
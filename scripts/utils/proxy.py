@@ -0,0 +1,69 @@
+"""Low-resolution review proxies for scene candidates."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Long edge of a proxy: 270x480 for the series' 9:16 masters
+PROXY_LONG_EDGE = 480
+
+
+def proxy_path_for(clip: Path) -> Path:
+    """Proxy location next to its master: ``s1.mp4`` -> ``s1.proxy.mp4``."""
+    return clip.with_name(f"{clip.stem}.proxy.mp4")
+
+
+def proxy_size(width: int, height: int, long_edge: int = PROXY_LONG_EDGE) -> tuple[int, int]:
+    """Scale ``width``x``height`` so the long edge is ``long_edge`` (even dimensions, never upscaled)."""
+    scale = min(1.0, long_edge / max(width, height))
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+
+def make_proxy(src: Path, dst: Path, width: int, height: int) -> Path:
+    """
+    Encode a small, low-bitrate, browser-friendly copy of ``src`` for review.
+
+    Proxies are only ever looked at (contact sheets, previews); compiles always
+    conform from the full-resolution master.
+    """
+    pw, ph = proxy_size(width, height)
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        str(src),
+        "-vf",
+        f"scale={pw}:{ph}",
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-crf",
+        "32",
+        "-maxrate",
+        "400k",
+        "-bufsize",
+        "800k",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-b:a",
+        "64k",
+        "-movflags",
+        "+faststart",
+        str(dst),
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        if result.stderr:
+            print(f"[FFMPEG] {result.stderr}", file=sys.stderr)
+    except subprocess.CalledProcessError as e:
+        error_msg = f"FFmpeg proxy generation failed: {src} -> {dst}\n"
+        error_msg += f"Command: {' '.join(cmd)}\n"
+        if e.stderr:
+            error_msg += f"Error output:\n{e.stderr}"
+        raise RuntimeError(error_msg) from e
+    return dst
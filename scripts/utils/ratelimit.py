@@ -0,0 +1,304 @@
+"""
+Rate-limit-aware scheduling for OpenAI API calls.
+
+One ``RateLimiter`` per process paces every OpenAI request (Sora job creation,
+status polls, content downloads, image generation) with a token bucket for
+requests per minute and a cap on concurrent requests. An HTTP 429 pauses
+*all* workers until its ``Retry-After`` (or an exponential backoff) elapses,
+then the call is retried, so large batches run at the allowed rate instead of
+tripping the limit repeatedly and falling back to placeholders. The pause is
+shared with other processes through ``<cache>/openai/blocked_until``, and
+``compile --jobs N`` workers each get 1/N of the limits
+(``share_openai_budget``).
+
+Requests that create paid work (``submit()`` / ``asubmit()``) are retried
+only after a 429: after a timeout or dropped connection the job may exist
+already, and a retry could pay for it twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+from scripts.utils.cache import cache_root
+
+T = TypeVar("T")
+
+# Defaults, overridable with CH_OPENAI_RPM / CH_OPENAI_MAX_CONCURRENT
+REQUESTS_PER_MINUTE = 60
+MAX_CONCURRENT_REQUESTS = 8
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+# Statuses the OpenAI SDK itself would retry (its own retries are disabled so
+# that 429s go through the shared backoff here)
+TRANSIENT_STATUSES = frozenset({408, 409, 500, 502, 503, 504})
+_TRANSIENT_ERRORS = frozenset({"APIConnectionError", "APITimeoutError"})
+# How often a caller waiting only for a free concurrency slot re-checks
+SLOT_POLL_SECONDS = 0.05
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """
+    Seconds to wait before retrying ``error``, or None if it is not a rate-limit error.
+
+    Rate-limit errors are anything carrying HTTP status 429 (the OpenAI SDK's
+    ``RateLimitError``, ``requests`` HTTP errors). The wait comes from the
+    ``retry-after-ms`` / ``Retry-After`` headers when present; 0.0 means
+    "rate limited, no hint given".
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        pass
+    return 0.0
+
+
+def _exponential_backoff(attempt: int) -> float:
+    return min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt) * random.uniform(0.8, 1.2)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Server hiccups and dropped connections: retried per call, without pausing other workers."""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    return status in TRANSIENT_STATUSES or any(cls.__name__ in _TRANSIENT_ERRORS for cls in type(error).__mro__)
+
+
+class RateLimiter:
+    """
+    Token-bucket pacing, a concurrency cap and shared backoff (thread- and asyncio-safe).
+
+    Use ``call()`` / ``acall()`` to run one request with rate-limit retries,
+    ``submit()`` / ``asubmit()`` for requests that must not run twice, or
+    ``slot()`` / ``aslot()`` to hold a request slot around streaming work.
+    With ``shared_path``, 429 pauses are also written to (and honoured from)
+    that file, so every process using it backs off together.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = REQUESTS_PER_MINUTE,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+        max_retries: int = MAX_RETRIES,
+        clock: Callable[[], float] = time.monotonic,
+        shared_path: Path | None = None,
+    ) -> None:
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, self.rate * 60.0 / 6)  # Allow bursts of ~10 seconds' worth
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_retries = max_retries
+        self.clock = clock
+        self.shared_path = shared_path
+        # (inode, mtime_ns) of the shared file when last read, and the wall-clock end of its pause
+        self._shared_seen: tuple[tuple[int, int] | None, float] = (None, 0.0)
+        self._tokens = self.capacity
+        self._refilled_at = clock()
+        self._blocked_until = 0.0
+        self._active = 0
+        self._lock = threading.Lock()
+        self.throttled = 0  # 429s seen (for run summaries)
+
+    def _shared_pause(self) -> float:
+        """
+        Seconds left of a 429 pause recorded in ``shared_path`` (by any process).
+
+        The file is read again only once a known pause is over and the file
+        has been replaced since, so unthrottled requests cost a single stat.
+        """
+        if self.shared_path is None:
+            return 0.0
+        version, blocked_until = self._shared_seen
+        now = time.time()
+        if blocked_until > now:
+            return blocked_until - now
+        try:
+            st = self.shared_path.stat()
+            if (st.st_ino, st.st_mtime_ns) != version:
+                blocked_until = float(self.shared_path.read_text(encoding="utf-8"))
+                self._shared_seen = ((st.st_ino, st.st_mtime_ns), blocked_until)
+        except (OSError, ValueError):
+            return 0.0
+        return max(0.0, blocked_until - now)
+
+    def _share_pause(self, delay: float) -> None:
+        """Record a 429 pause in ``shared_path`` (unless a longer one is recorded already)."""
+        if self.shared_path is None or self._shared_pause() >= delay:
+            return
+        tmp = self.shared_path.with_name(f"{self.shared_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.shared_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(repr(time.time() + delay), encoding="utf-8")
+            os.replace(tmp, self.shared_path)
+        except OSError as e:
+            # Other processes just find out about the limit on their own
+            print(f"[RATE LIMIT] Cannot share backoff via {self.shared_path}: {e}", file=sys.stderr)
+
+    def _reserve(self) -> float:
+        """Take a token and a slot (returns 0.0), or return how long to wait before trying again."""
+        shared = self._shared_pause()
+        if shared > 0:
+            return shared
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            if self._active >= self.max_concurrent:
+                return SLOT_POLL_SECONDS
+            self._tokens -= 1
+            self._active += 1
+            return 0.0
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Pause every caller (global backoff) after a 429; returns the pause in seconds."""
+        delay = retry_after or _exponential_backoff(attempt)
+        with self._lock:
+            self.throttled += 1
+            self._blocked_until = max(self._blocked_until, self.clock() + delay)
+        self._share_pause(delay)
+        return delay
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        while (wait := self._reserve()) > 0:
+            time.sleep(wait)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        while (wait := self._reserve()) > 0:
+            await asyncio.sleep(wait)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _retry_delay(self, error: BaseException, attempt: int, idempotent: bool = True) -> float | None:
+        """
+        Seconds this caller should wait before retrying ``error``; None to give up.
+
+        Transient errors are retried only for ``idempotent`` requests (a 429
+        means the request was rejected, so it is always safe to repeat).
+        """
+        if attempt >= self.max_retries:
+            return None
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = self.backoff(attempt, retry_after)
+            print(f"[RATE LIMIT] Throttled (attempt {attempt + 1}); all requests paused {delay:.1f}s", file=sys.stderr)
+            return 0.0  # The pause is applied by the next reservation
+        if idempotent and is_transient(error):
+            delay = _exponential_backoff(attempt)
+            print(f"[RATE LIMIT] Transient error ({error}); retrying in {delay:.1f}s", file=sys.stderr)
+            return delay
+        return None
+
+    def _call(self, idempotent: bool, fn: Callable[..., T], args: Any, kwargs: Any) -> T:
+        attempt = 0
+        while True:
+            try:
+                with self.slot():
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def _acall(self, idempotent: bool, fn: Callable[..., Awaitable[T]], args: Any, kwargs: Any) -> T:
+        attempt = 0
+        while True:
+            try:
+                async with self.aslot():
+                    return await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` within the limits, retrying rate-limit and transient errors."""
+        return self._call(True, fn, args, kwargs)
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Async ``call()``: awaits ``fn(*args, **kwargs)`` without blocking the event loop."""
+        return await self._acall(True, fn, args, kwargs)
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """``call()`` for requests that create paid work: only 429s are retried."""
+        return self._call(False, fn, args, kwargs)
+
+    async def asubmit(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Async ``submit()``."""
+        return await self._acall(False, fn, args, kwargs)
+
+
+_default_limiter: RateLimiter | None = None
+_default_lock = threading.Lock()
+# Processes splitting the OpenAI limits (see share_openai_budget)
+_budget_share = 1
+
+
+def share_openai_budget(processes: int) -> None:
+    """
+    Give this process 1/``processes`` of the OpenAI limits.
+
+    Called in each of ``processes`` worker processes (before their first
+    request), so together they stay within ``CH_OPENAI_RPM`` and
+    ``CH_OPENAI_MAX_CONCURRENT``.
+    """
+    global _default_limiter, _budget_share
+    with _default_lock:
+        _budget_share = max(1, processes)
+        _default_limiter = None
+
+
+def openai_limiter() -> RateLimiter:
+    """Process-wide limiter shared by every OpenAI caller (limits from the environment)."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            rpm = float(os.environ.get("CH_OPENAI_RPM") or REQUESTS_PER_MINUTE)
+            max_concurrent = int(os.environ.get("CH_OPENAI_MAX_CONCURRENT") or MAX_CONCURRENT_REQUESTS)
+            _default_limiter = RateLimiter(
+                requests_per_minute=rpm / _budget_share,
+                max_concurrent=max(1, max_concurrent // _budget_share),
+                shared_path=cache_root() / "openai" / "blocked_until",
+            )
+        return _default_limiter
@@ -0,0 +1,85 @@
+"""Build stamps for incremental, dependency-tracked cut compilation.
+
+A stamp is a small JSON file recording a digest of every input that went into
+a build stage (scene dicts, overlay templates, selections, fonts, render
+settings, upstream clips) together with the signatures of the files the stage
+produced. A stage can be skipped when its current inputs hash to the recorded
+digest and its outputs are still on disk, unmodified.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from blake3 import blake3
+
+from .cache import fingerprint
+
+
+def file_signature(path: Path | str | None) -> dict[str, Any] | None:
+    """Cheap identity for large artifacts (video clips): path, size and mtime."""
+    if path is None:
+        return None
+    p = Path(path)
+    if not p.exists():
+        return None
+    st = p.stat()
+    return {"path": p.as_posix(), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def content_digest(path: Path | str | None) -> str | None:
+    """Content hash for small inputs (manifests, templates, fonts) that survives touch/checkout."""
+    if path is None:
+        return None
+    p = Path(path)
+    if not p.exists():
+        return None
+    h = blake3()
+    with open(p, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_fresh_stamp(stamp_path: Path, inputs: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Return the stamp document if the stage is up to date, else None.
+
+    Up to date means: the stamp exists, its input digest matches ``inputs``,
+    and every recorded output still exists with the recorded size/mtime.
+    """
+    if not stamp_path.exists():
+        return None
+    try:
+        with open(stamp_path, encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if stamp.get("inputs") != fingerprint(inputs):
+        return None
+    for recorded in stamp.get("outputs", []):
+        if recorded is None or file_signature(recorded.get("path")) != recorded:
+            return None
+    return stamp
+
+
+def write_stamp(
+    stamp_path: Path,
+    inputs: dict[str, Any],
+    outputs: list[Path],
+    meta: Any = None,
+) -> None:
+    """Record that ``outputs`` were built from ``inputs`` (``meta`` is returned on fresh reads)."""
+    stamp_path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "inputs": fingerprint(inputs),
+        "outputs": [file_signature(p) for p in outputs],
+        "meta": meta,
+    }
+    tmp = stamp_path.with_name(f"{stamp_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    os.replace(tmp, stamp_path)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -56,12 +57,13 @@ def build_youtube_metadata(cut_manifest_path: Path) -> Path:
     return out_path
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(description="Build YouTube metadata JSON from a cut manifest.")
     p.add_argument("--cut-manifest", required=True, help="Path to output/cuts/<id>/manifest/cut.manifest.json")
-    args = p.parse_args()
+    args = p.parse_args(argv)
     build_youtube_metadata(Path(args.cut_manifest))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
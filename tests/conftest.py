@@ -37,6 +37,14 @@ def project_root() -> Path:
     return PROJECT_ROOT
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep persistent caches (parsed YAML, placeholders, ...) out of the repo's output/cache."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("CH_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 # =============================================================================
 # RCFC Schema Fixtures
 # =============================================================================
@@ -100,3 +100,39 @@ class TestRenderConfig:
         cfg2 = RenderConfig.from_strings("1920x1080", 30, "16:9")
 
         assert cfg1 != cfg2
+
+
+class TestEncodeProfiles:
+    """Tests for named encode profiles attached to RenderConfig"""
+
+    def test_default_profile_keeps_target(self):
+        cfg = RenderConfig.from_strings("1080x1920", 24, "9:16")
+        assert cfg.profile.name == "standard"
+        assert (cfg.width, cfg.height, cfg.fps) == (1080, 1920, 24)
+
+    def test_draft_profile_scales_target(self):
+        cfg = RenderConfig.from_strings("1080x1920", 24, "9:16", profile="draft")
+        assert (cfg.width, cfg.height, cfg.fps) == (540, 960, 12)
+        assert cfg.resolution == "540x960"
+        assert "ultrafast" in cfg.profile.video_args()
+
+    def test_draft_profile_keeps_even_dimensions(self):
+        cfg = RenderConfig.from_strings("1366x768", 10, "16:9", profile="draft")
+        assert (cfg.width, cfg.height, cfg.fps) == (682, 384, 10)
+
+    def test_final_profile_args(self):
+        cfg = RenderConfig.from_strings("1080x1920", 24, "9:16", profile="final")
+        assert cfg.profile.video_args() == [
+            "-c:v",
+            "libx264",
+            "-preset",
+            "slow",
+            "-crf",
+            "18",
+            "-pix_fmt",
+            "yuv420p",
+        ]
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError, match="Unknown render profile"):
+            RenderConfig.from_strings("1080x1920", 24, "9:16", profile="turbo")
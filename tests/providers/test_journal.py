@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pytest
+
+from scripts.providers import journal as journal_module
+from scripts.providers.journal import JobJournal
+
+
+class TestJobJournal:
+    """Tests for the append-only Sora job journal"""
+
+    def test_key_depends_on_scene_seed_model_and_prompt(self):
+        base = JobJournal.job_key("ep", "s1", 0, "sora-2", "a prompt")
+        assert base == JobJournal.job_key("ep", "s1", 0, "sora-2", "a prompt")
+        assert base != JobJournal.job_key("ep", "s2", 0, "sora-2", "a prompt")
+        assert base != JobJournal.job_key("ep", "s1", 1, "sora-2", "a prompt")
+        assert base != JobJournal.job_key("ep", "s1", 0, "sora-2-pro", "a prompt")
+        assert base != JobJournal.job_key("ep", "s1", 0, "sora-2", "another prompt")
+
+    def test_replay_tracks_latest_status(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        journal = JobJournal(path)
+        journal.record("k1", "video_1", "submitted", scene_id="s1")
+        journal.record_status("video_1", "in_progress")
+        journal.record_status("video_1", "completed")
+        journal.record_status("video_unknown", "completed")
+
+        replayed = JobJournal(path)
+        state = replayed.get("k1")
+        assert state is not None
+        assert state["status"] == "completed"
+        assert state["scene_id"] == "s1"
+        assert replayed.resumable("k1") == "video_1"
+        assert len(path.read_text().splitlines()) == 3
+
+    def test_failed_and_expired_jobs_are_not_resumable(self, tmp_path: Path):
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record("k1", "video_1", "failed")
+        journal.record("k2", "video_2", "expired")
+        journal.record("k3", "video_3", "timeout")
+
+        assert journal.resumable("k1") is None
+        assert journal.resumable("k2") is None
+        assert journal.resumable("k3") == "video_3"
+
+    def test_resubmission_replaces_previous_job(self, tmp_path: Path):
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record("k1", "video_1", "failed", error="moderation")
+        journal.record("k1", "video_2", "submitted")
+
+        state = JobJournal(tmp_path / "journal.jsonl").get("k1")
+        assert state is not None
+        assert state["video_id"] == "video_2"
+        assert "error" not in state
+
+    def test_torn_final_line_is_ignored(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        JobJournal(path).record("k1", "video_1", "submitted")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"key": "k1", "video_id": "vid')
+
+        assert JobJournal(path).resumable("k1") == "video_1"
+
+    def test_refresh_sees_other_writers(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        reader = JobJournal(path)
+        assert reader.get("k1") is None
+
+        JobJournal(path).record("k1", "video_1", "submitted")
+        assert reader.get("k1") is None
+        reader.refresh()
+        assert reader.resumable("k1") == "video_1"
+
+    def test_downloaded_job_resumes_only_when_its_clip_is_gone(self, tmp_path: Path):
+        clip = tmp_path / "s1.mp4"
+        clip.write_bytes(b"video")
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record("k1", "video_1", "downloaded", path=str(clip))
+
+        # The clip is there: asking again for the same key means a new take
+        assert journal.resumable("k1") is None
+        clip.unlink()
+        assert journal.resumable("k1") == "video_1"
+
+    def test_superseded_job_is_never_resumed(self, tmp_path: Path):
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record("k1", "video_1", "downloaded", path=str(tmp_path / "gone.mp4"))
+        journal.supersede("k1")
+        journal.supersede("unknown")
+
+        assert JobJournal(tmp_path / "journal.jsonl").resumable("k1") is None
+
+    def test_compaction_keeps_latest_state_per_key(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(journal_module, "COMPACT_MIN_LINES", 10)
+        monkeypatch.setattr(journal_module, "COMPACT_RATIO", 2)
+        path = tmp_path / "journal.jsonl"
+        journal = JobJournal(path)
+        for i in range(3):
+            journal.record(f"k{i}", f"video_{i}", "submitted", scene_id=f"s{i}")
+            for status in ("queued", "in_progress", "completed"):
+                journal.record_status(f"video_{i}", status)
+
+        replayed = JobJournal(path)
+        state = replayed.get("k1")
+        assert state is not None
+        assert (state["status"], state["scene_id"]) == ("completed", "s1")
+        assert len(path.read_text().splitlines()) == 3
+        # Appends after compaction still replay on top of it
+        replayed.record_status("video_2", "downloaded", path=str(tmp_path / "missing.mp4"))
+        assert JobJournal(path).resumable("k2") == "video_2"
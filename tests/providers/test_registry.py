@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from scripts.providers import registry
+from scripts.providers.dummy import DummyProvider
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class _EntryPoint:
+    def __init__(self, name: str, target: Any) -> None:
+        self.name = name
+        self.target = target
+        self.loads = 0
+
+    def load(self) -> Any:
+        self.loads += 1
+        return self.target
+
+
+@pytest.fixture
+def plugins(monkeypatch: pytest.MonkeyPatch) -> dict[str, _EntryPoint]:
+    """Installed entry points, keyed by name (starts empty)."""
+    installed: dict[str, _EntryPoint] = {}
+
+    def entry_points(group: str, name: str | None = None) -> list[_EntryPoint]:
+        assert group == registry.ENTRY_POINT_GROUP
+        return [ep for ep in installed.values() if name is None or ep.name == name]
+
+    monkeypatch.setattr(registry, "entry_points", entry_points)
+    monkeypatch.setattr(registry, "_factories", {})
+    return installed
+
+
+class TestProviderRegistry:
+    """Tests for resolving provider names to factories"""
+
+    def test_builtin_resolves_without_scanning_entry_points(self, plugins: dict[str, _EntryPoint]):
+        plugins["dummy"] = _EntryPoint("dummy", lambda: pytest.fail("built-ins must win"))
+
+        assert isinstance(registry.create_provider("dummy"), DummyProvider)
+        assert plugins["dummy"].loads == 0
+
+    def test_entry_point_provider_is_loaded_once(self, plugins: dict[str, _EntryPoint]):
+        plugins["custom"] = _EntryPoint("custom", DummyProvider)
+
+        first = registry.create_provider("custom")
+        second = registry.create_provider("custom")
+
+        assert isinstance(first, DummyProvider)
+        assert first is not second
+        assert plugins["custom"].loads == 1
+        assert "custom" in registry.available_providers()
+
+    def test_unknown_provider_lists_available(self, plugins: dict[str, _EntryPoint]):
+        plugins["custom"] = _EntryPoint("custom", DummyProvider)
+
+        with pytest.raises(
+            ValueError, match=r"Unsupported provider 'nope' \(supported: custom, dummy, prebaked, sora\)"
+        ):
+            registry.provider_factory("nope")
+
+    @pytest.mark.usefixtures("plugins")
+    def test_register_provider(self):
+        registry.register_provider("inline", DummyProvider)
+        assert isinstance(registry.create_provider("inline"), DummyProvider)
+
+    def test_prebaked_compile_does_not_import_sora(self):
+        code = (
+            "import sys; from scripts.compile_cut import provider_from_recipe; "
+            "provider_from_recipe({'provider': {'name': 'prebaked'}}); "
+            "print('scripts.providers.sora' in sys.modules, 'openai' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == ["False", "False"]
@@ -0,0 +1,372 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+import urllib.request
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from scripts.providers import sora
+from scripts.providers.base import RenderConfig, SceneJob
+from scripts.providers.journal import JobJournal
+from scripts.providers.sora import SoraProvider
+from scripts.utils.ratelimit import RateLimiter
+
+
+class _FakeVideos:
+    """Stand-in for AsyncOpenAI().videos: each job completes after ``polls_needed`` retrieves."""
+
+    def __init__(self, polls_needed: int = 2, failing_prompts: tuple[str, ...] = ()) -> None:
+        self.polls_needed = polls_needed
+        self.failing_prompts = failing_prompts
+        self.prompts: dict[str, str] = {}
+        self.polls: dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.download_headers: list[dict[str, str] | None] = []
+
+    async def create(self, model: str, prompt: str) -> Any:
+        video_id = f"video_{len(self.prompts)}"
+        self.prompts[video_id] = prompt
+        self.polls[video_id] = 0
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        return SimpleNamespace(id=video_id, model=model)
+
+    async def retrieve(self, video_id: str) -> Any:
+        self.polls[video_id] += 1
+        if self.prompts[video_id] in self.failing_prompts:
+            return SimpleNamespace(id=video_id, status="failed", error="moderation")
+        if self.polls[video_id] >= self.polls_needed:
+            return SimpleNamespace(id=video_id, status="completed")
+        return SimpleNamespace(id=video_id, status="in_progress", progress=50)
+
+    @asynccontextmanager
+    async def stream_content(self, video_id: str, extra_headers: dict[str, str] | None = None) -> Any:
+        self.in_flight -= 1
+        self.download_headers.append(extra_headers)
+        body = self.prompts[video_id].encode()
+
+        async def iter_bytes(chunk_size: int) -> Any:
+            for i in range(0, len(body), chunk_size):
+                yield body[i : i + chunk_size]
+
+        yield SimpleNamespace(status_code=200, headers={"Content-Length": str(len(body))}, iter_bytes=iter_bytes)
+
+
+class _FakeClient:
+    def __init__(self, videos: _FakeVideos) -> None:
+        self.videos = videos
+        self.with_streaming_response = SimpleNamespace(videos=SimpleNamespace(download_content=videos.stream_content))
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fast_polling(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sora, "POLL_INTERVAL_SECONDS", 0.001)
+    monkeypatch.setattr(sora, "POLL_MAX_INTERVAL_SECONDS", 0.002)
+    # Fake downloads are not real video
+    monkeypatch.setattr(sora, "verify_media", lambda _path: None)
+
+
+@pytest.fixture
+def no_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sora, "openai_limiter", lambda: RateLimiter(requests_per_minute=1e6, max_concurrent=100))
+
+
+@pytest.fixture
+def render_cfg() -> RenderConfig:
+    return RenderConfig.from_strings("1080x1920", 24, "9:16")
+
+
+def _jobs(tmp_path: Path, n: int) -> list[SceneJob]:
+    return [SceneJob("ep", {"id": f"s{i}", "sora_prompt": f"prompt {i}"}, str(tmp_path / f"s{i}")) for i in range(n)]
+
+
+@pytest.mark.usefixtures("fast_polling", "no_rate_limit")
+class TestSoraBatch:
+    """Tests for bounded-concurrency batch generation against a fake API"""
+
+    def test_batch_submits_up_to_limit_and_preserves_order(self, tmp_path: Path, render_cfg: RenderConfig):
+        videos = _FakeVideos(polls_needed=3)
+        client = _FakeClient(videos)
+        provider = SoraProvider(api_key="test", max_in_flight=3, journal=JobJournal(tmp_path / "journal.jsonl"))
+        provider._async_client = lambda: client  # type: ignore[method-assign]
+
+        paths = provider.generate_scenes(_jobs(tmp_path, 7), render_cfg)
+        provider.close()
+
+        assert [Path(p).read_text() for p in paths] == [f"prompt {i}" for i in range(7)]
+        assert videos.max_in_flight == 3
+        assert all(polls == 3 for polls in videos.polls.values())
+        assert client.closed
+        assert not any(provider.is_fallback(p) for p in paths)
+        assert not list(tmp_path.rglob("*.part"))
+
+    def test_batches_share_one_client_until_closed(self, tmp_path: Path, render_cfg: RenderConfig):
+        clients: list[_FakeClient] = []
+        videos = _FakeVideos(polls_needed=1)
+        provider = SoraProvider(api_key="test", journal=JobJournal(tmp_path / "journal.jsonl"))
+        provider._async_client = lambda: clients.append(_FakeClient(videos)) or clients[-1]  # type: ignore[method-assign]
+
+        provider.generate_scenes(_jobs(tmp_path / "ep1", 2), render_cfg)
+        provider.generate_scenes(_jobs(tmp_path / "ep2", 2), render_cfg)
+        assert len(clients) == 1 and not clients[0].closed
+
+        provider.close()
+        assert clients[0].closed
+        provider.generate_scenes(_jobs(tmp_path / "ep3", 1), render_cfg)
+        provider.close()
+        assert len(clients) == 2 and clients[1].closed
+
+    def test_failed_job_falls_back_without_blocking_others(
+        self, tmp_path: Path, render_cfg: RenderConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        videos = _FakeVideos(failing_prompts=("prompt 1",))
+        provider = SoraProvider(api_key="test", journal=JobJournal(tmp_path / "journal.jsonl"))
+        provider._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+
+        def fake_fallback(_scene_id: str, _duration: int, _cfg: RenderConfig, out_path: Path) -> None:
+            out_path.write_bytes(b"placeholder")
+            provider._fallbacks.add(str(out_path.resolve()))
+
+        monkeypatch.setattr(provider, "_fallback", fake_fallback)
+        paths = provider.generate_scenes(_jobs(tmp_path, 3), render_cfg)
+
+        assert [provider.is_fallback(p) for p in paths] == [False, True, False]
+        assert Path(paths[1]).read_bytes() == b"placeholder"
+
+    def test_failing_fallback_lets_other_jobs_finish(
+        self, tmp_path: Path, render_cfg: RenderConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        videos = _FakeVideos(polls_needed=3, failing_prompts=("prompt 0",))
+        provider = SoraProvider(api_key="test", journal=JobJournal(tmp_path / "journal.jsonl"))
+        provider._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+
+        def broken_fallback(*_args: Any) -> None:
+            raise RuntimeError("ffmpeg missing")
+
+        monkeypatch.setattr(provider, "_fallback", broken_fallback)
+        done: list[str] = []
+
+        with pytest.raises(RuntimeError, match="ffmpeg missing"):
+            provider.generate_scenes(
+                _jobs(tmp_path, 3), render_cfg, on_done=lambda job, _path: done.append(job.scene["id"])
+            )
+
+        assert sorted(done) == ["s1", "s2"]
+        assert (tmp_path / "s2" / "s2.mp4").read_text() == "prompt 2"
+
+    def test_missing_api_key_falls_back(
+        self, tmp_path: Path, render_cfg: RenderConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        provider = SoraProvider(journal=JobJournal(tmp_path / "journal.jsonl"))
+        fallbacks: list[str] = []
+        monkeypatch.setattr(provider, "_fallback", lambda scene_id, *_args: fallbacks.append(scene_id))
+
+        provider.generate_scene("ep", {"id": "s1"}, str(tmp_path), render_cfg)
+        assert fallbacks == ["s1"]
+
+    def test_interrupted_download_resumes_with_range(self, tmp_path: Path, render_cfg: RenderConfig):
+        videos = _FakeVideos(polls_needed=1)
+        provider = SoraProvider(api_key="test", journal=JobJournal(tmp_path / "journal.jsonl"))
+        provider._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+        (tmp_path / "s0").mkdir()
+        (tmp_path / "s0" / "s0.mp4.video_0.part").write_bytes(b"prom")
+        (tmp_path / "s0" / "s0.mp4.video_old.part").write_bytes(b"stale bytes")
+
+        paths = provider.generate_scenes(_jobs(tmp_path, 1), render_cfg)
+
+        assert videos.download_headers == [{"Range": "bytes=4-"}]
+        # The fake ignores Range (200), so the partial file is rewritten from scratch
+        assert Path(paths[0]).read_text() == "prompt 0"
+        # Partial downloads of another video are never resumed into this one
+        assert list((tmp_path / "s0").iterdir()) == [Path(paths[0])]
+
+    def test_rerun_reattaches_to_journaled_job(
+        self, tmp_path: Path, render_cfg: RenderConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        videos = _FakeVideos(polls_needed=1)
+        crashed = SoraProvider(api_key="test", journal=JobJournal(tmp_path / "journal.jsonl"))
+        crashed._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+
+        async def lost_download(*_args: Any) -> None:
+            raise ConnectionError("process killed")
+
+        monkeypatch.setattr(crashed, "_download", lost_download)
+        monkeypatch.setattr(crashed, "_fallback", lambda *_args: None)
+        crashed.generate_scenes(_jobs(tmp_path, 2), render_cfg)
+        assert len(videos.prompts) == 2
+
+        # A fresh process replays the journal and downloads the finished jobs
+        resumed = SoraProvider(api_key="test", journal=JobJournal(tmp_path / "journal.jsonl"))
+        resumed._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+        paths = resumed.generate_scenes(_jobs(tmp_path, 2), render_cfg)
+
+        assert len(videos.prompts) == 2  # Nothing re-submitted
+        assert [Path(p).read_text() for p in paths] == ["prompt 0", "prompt 1"]
+
+    def test_failed_journaled_job_is_resubmitted(self, tmp_path: Path, render_cfg: RenderConfig):
+        videos = _FakeVideos(polls_needed=1, failing_prompts=("prompt 0",))
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        provider = SoraProvider(api_key="test", journal=journal)
+        provider._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+        provider._fallback = lambda *_args: None  # type: ignore[method-assign]
+        provider.generate_scenes(_jobs(tmp_path, 1), render_cfg)
+
+        videos.failing_prompts = ()
+        paths = provider.generate_scenes(_jobs(tmp_path, 1), render_cfg)
+
+        assert len(videos.prompts) == 2
+        assert Path(paths[0]).read_text() == "prompt 0"
+
+    def test_superseded_job_is_not_resumed(self, tmp_path: Path, render_cfg: RenderConfig):
+        videos = _FakeVideos(polls_needed=1)
+        provider = SoraProvider(api_key="test", journal=JobJournal(tmp_path / "journal.jsonl"))
+        provider._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+        jobs = _jobs(tmp_path, 1)
+        Path(provider.generate_scenes(jobs, render_cfg)[0]).unlink()
+
+        # Without supersede, the missing clip would be re-downloaded from the same job
+        provider.supersede(jobs)
+        provider.generate_scenes(jobs, render_cfg)
+
+        assert len(videos.prompts) == 2
+
+    def test_webhook_wakes_waiting_jobs_without_polling(self, tmp_path: Path, render_cfg: RenderConfig):
+        provider = SoraProvider(api_key="test", webhook_port=0, journal=JobJournal(tmp_path / "journal.jsonl"))
+        videos = _WebhookVideos(provider)
+        provider._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+
+        started = time.monotonic()
+        paths = provider.generate_scenes(_jobs(tmp_path, 3), render_cfg)
+
+        # Slow safety-net polling is 60s: finishing quickly means the callbacks woke the jobs
+        assert time.monotonic() - started < 10
+        assert [Path(p).read_text() for p in paths] == [f"prompt {i}" for i in range(3)]
+        assert all(polls == 1 for polls in videos.polls.values())
+        assert provider.webhook_url is None
+
+    def test_taken_webhook_port_falls_back_to_polling(self, tmp_path: Path, render_cfg: RenderConfig):
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            port = taken.getsockname()[1]
+            videos = _FakeVideos(polls_needed=1)
+            client = _FakeClient(videos)
+            provider = SoraProvider(api_key="test", webhook_port=port, journal=JobJournal(tmp_path / "journal.jsonl"))
+            provider._async_client = lambda: client  # type: ignore[method-assign]
+
+            paths = provider.generate_scenes(_jobs(tmp_path, 2), render_cfg)
+            provider.close()
+
+        assert [Path(p).read_text() for p in paths] == ["prompt 0", "prompt 1"]
+        assert not any(provider.is_fallback(p) for p in paths)
+        assert client.closed
+        assert provider.webhook_url is None
+
+
+class TestStatusPoller:
+    """Tests for the shared polling loop"""
+
+    def test_notifications_for_other_jobs_do_not_starve_deadlines(self):
+        class _NeverDone:
+            async def retrieve(self, video_id: str) -> Any:
+                return SimpleNamespace(id=video_id, status="in_progress", progress=0)
+
+        async def scenario() -> None:
+            poller = sora._StatusPoller(
+                SimpleNamespace(videos=_NeverDone()),
+                interval=30,
+                timeout=0.05,
+                limiter=RateLimiter(requests_per_minute=1e6, max_concurrent=100),
+            )
+            quiet = poller.wait("quiet")
+            chatty = poller.wait("chatty")
+
+            async def chatter() -> None:
+                while not chatty.done():
+                    poller.notify("chatty")
+                    await asyncio.sleep(0.01)
+
+            chatter_task = asyncio.create_task(chatter())
+            # The job's own timeout, not wait_for's (which would mean the 30s round was awaited)
+            with pytest.raises(TimeoutError, match="timed out after"):
+                await asyncio.wait_for(quiet, timeout=5)
+            with pytest.raises(TimeoutError, match="timed out after"):
+                await asyncio.wait_for(chatty, timeout=5)
+            await chatter_task
+
+        asyncio.run(scenario())
+
+
+class _WebhookVideos(_FakeVideos):
+    """Stand-in API whose jobs finish shortly after creation and announce it via webhook."""
+
+    def __init__(self, provider: SoraProvider) -> None:
+        super().__init__()
+        self.provider = provider
+        self.done: set[str] = set()
+
+    async def create(self, model: str, prompt: str) -> Any:
+        video = await super().create(model, prompt)
+        url = self.provider.webhook_url
+        assert url is not None
+        threading.Timer(0.05, self._emit, (url, video.id)).start()
+        return video
+
+    def _emit(self, url: str, video_id: str) -> None:
+        self.done.add(video_id)
+        body = json.dumps({"type": "video.completed", "data": {"id": video_id}}).encode()
+        urllib.request.urlopen(urllib.request.Request(url, data=body), timeout=5).close()
+
+    async def retrieve(self, video_id: str) -> Any:
+        self.polls[video_id] += 1
+        status = "completed" if video_id in self.done else "in_progress"
+        return SimpleNamespace(id=video_id, status=status, progress=50)
+
+
+@pytest.mark.usefixtures("fast_polling")
+class TestSoraRateLimits:
+    """Tests that Sora API calls go through the shared rate limiter"""
+
+    def test_throttled_create_is_retried_not_replaced_by_placeholder(self, tmp_path: Path, render_cfg: RenderConfig):
+        videos = _ThrottledVideos(throttles=2)
+        limiter = RateLimiter(requests_per_minute=1e6)
+        provider = SoraProvider(api_key="test", limiter=limiter, journal=JobJournal(tmp_path / "journal.jsonl"))
+        provider._async_client = lambda: _FakeClient(videos)  # type: ignore[method-assign]
+
+        paths = provider.generate_scenes(_jobs(tmp_path, 2), render_cfg)
+
+        assert [Path(p).read_text() for p in paths] == ["prompt 0", "prompt 1"]
+        assert not any(provider.is_fallback(p) for p in paths)
+        assert limiter.throttled == 2
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+    response = SimpleNamespace(status_code=429, headers={"retry-after-ms": "5"})
+
+
+class _ThrottledVideos(_FakeVideos):
+    """Rejects the first ``throttles`` create calls with HTTP 429."""
+
+    def __init__(self, throttles: int) -> None:
+        super().__init__(polls_needed=1)
+        self.throttles = throttles
+
+    async def create(self, model: str, prompt: str) -> Any:
+        if self.throttles:
+            self.throttles -= 1
+            raise _RateLimitError("Rate limit reached")
+        return await super().create(model, prompt)
@@ -0,0 +1,85 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+
+import pytest
+
+from scripts.providers.webhooks import WebhookReceiver, verify_signature
+
+SECRET = "whsec_" + base64.b64encode(b"test-secret").decode()
+
+
+def _signed_headers(body: bytes, secret: str = SECRET, timestamp: int | None = None) -> dict[str, str]:
+    ts = str(int(time.time()) if timestamp is None else timestamp)
+    key = base64.b64decode(secret.removeprefix("whsec_"))
+    digest = hmac.new(key, f"msg_1.{ts}.".encode() + body, hashlib.sha256).digest()
+    return {
+        "webhook-id": "msg_1",
+        "webhook-timestamp": ts,
+        "webhook-signature": f"v1,{base64.b64encode(digest).decode()}",
+    }
+
+
+def _post(url: str, event: dict[str, object], headers: dict[str, str] | None = None) -> int:
+    body = json.dumps(event).encode()
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json", **(headers or {})})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return int(resp.status)
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+@pytest.fixture
+def events() -> list[tuple[str, str]]:
+    return []
+
+
+@pytest.fixture
+def receiver(events: list[tuple[str, str]]) -> Iterator[WebhookReceiver]:
+    with WebhookReceiver(lambda video_id, status: events.append((video_id, status)), secret=SECRET) as r:
+        yield r
+
+
+class TestVerifySignature:
+    """Tests for Standard Webhooks signature checking"""
+
+    def test_valid_signature(self):
+        body = b'{"type": "video.completed"}'
+        assert verify_signature(body, _signed_headers(body), SECRET)
+
+    def test_tampered_body_rejected(self):
+        body = b'{"type": "video.completed"}'
+        assert not verify_signature(b'{"type": "video.failed"}', _signed_headers(body), SECRET)
+
+    def test_stale_timestamp_rejected(self):
+        body = b"{}"
+        assert not verify_signature(body, _signed_headers(body, timestamp=int(time.time()) - 3600), SECRET)
+
+    def test_missing_headers_rejected(self):
+        assert not verify_signature(b"{}", {}, SECRET)
+
+
+class TestWebhookReceiver:
+    """Tests for the local completion webhook receiver"""
+
+    def test_signed_video_event_dispatched(self, receiver: WebhookReceiver, events: list[tuple[str, str]]):
+        event = {"type": "video.completed", "data": {"id": "video_1"}}
+        body = json.dumps(event).encode()
+        assert _post(receiver.url, event, _signed_headers(body)) == 200
+        assert events == [("video_1", "completed")]
+
+    def test_unsigned_event_rejected(self, receiver: WebhookReceiver, events: list[tuple[str, str]]):
+        assert _post(receiver.url, {"type": "video.completed", "data": {"id": "video_1"}}) == 401
+        assert events == []
+
+    def test_other_events_and_paths_ignored(self, receiver: WebhookReceiver, events: list[tuple[str, str]]):
+        event = {"type": "response.completed", "data": {"id": "resp_1"}}
+        assert _post(receiver.url, event, _signed_headers(json.dumps(event).encode())) == 200
+        assert _post(receiver.url.replace("/sora/webhook", "/other"), event) == 404
+        assert events == []
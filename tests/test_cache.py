@@ -0,0 +1,127 @@
+"""Tests for the persistent content-addressed candidate cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts.providers.base import RenderConfig
+from scripts.utils.cache import CandidateCache, fingerprint, link_or_copy
+
+
+@pytest.fixture
+def render_cfg() -> RenderConfig:
+    return RenderConfig.from_strings(resolution="1080x1920", fps=24, aspect="9:16")
+
+
+class _CountingProvider:
+    """Fake provider that records how often it actually renders."""
+
+    max_concurrency = 2
+
+    def __init__(self) -> None:
+        self.rendered: list[str] = []
+
+    def name(self) -> str:
+        return "counting"
+
+    def generate_scene(self, _episode_id, scene, output_dir, _render_cfg, seed=None) -> str:
+        self.rendered.append(f"{scene['id']}:{seed}")
+        out = Path(output_dir) / f"{scene['id']}.mp4"
+        out.write_bytes(f"{scene['id']}-{scene.get('sora_prompt')}-{seed}".encode())
+        return str(out)
+
+
+class TestFingerprint:
+    def test_key_order_independent(self):
+        assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+
+    def test_candidate_key_sensitivity(self, tmp_path: Path, render_cfg: RenderConfig):
+        cache = CandidateCache(root=tmp_path)
+        scene = {"id": "s1", "duration_sec": 5, "sora_prompt": "snow"}
+        base = cache.key("dummy", "ep", scene, 1, render_cfg)
+
+        assert base == cache.key("dummy", "ep", dict(scene), 1, render_cfg)
+        assert base != cache.key("dummy", "ep", scene, 2, render_cfg)
+        assert base != cache.key("sora", "ep", scene, 1, render_cfg)
+        assert base != cache.key("dummy", "ep", {**scene, "sora_prompt": "rain"}, 1, render_cfg)
+        other_cfg = RenderConfig.from_strings(resolution="720x1280", fps=24, aspect="9:16")
+        assert base != cache.key("dummy", "ep", scene, 1, other_cfg)
+        assert base != cache.key("dummy", "ep", scene, 1, render_cfg, extra={"model": "x"})
+
+
+class TestCandidateCache:
+    def test_store_and_fetch_links(self, tmp_path: Path):
+        cache = CandidateCache(root=tmp_path / "cache")
+        clip = tmp_path / "clip.mp4"
+        clip.write_bytes(b"video")
+        cache.store("ab" * 32, clip)
+
+        dst = tmp_path / "out" / "clip.mp4"
+        assert cache.fetch("ab" * 32, dst)
+        assert dst.read_bytes() == b"video"
+        assert dst.stat().st_ino == cache.path_for("ab" * 32).stat().st_ino
+        assert not cache.fetch("cd" * 32, tmp_path / "other.mp4")
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_link_or_copy_replaces_destination(self, tmp_path: Path):
+        src = tmp_path / "src.mp4"
+        src.write_bytes(b"new")
+        dst = tmp_path / "dst.mp4"
+        dst.write_bytes(b"old")
+        link_or_copy(src, dst)
+        assert dst.read_bytes() == b"new"
+
+    def test_link_or_copy_reflink_falls_back(self, tmp_path: Path):
+        src = tmp_path / "src.mp4"
+        src.write_bytes(b"footage")
+        dst = tmp_path / "dst.mp4"
+        method = link_or_copy(src, dst, reflink=True, verify=True)
+        assert method in ("reflink", "hardlink")
+        assert dst.read_bytes() == b"footage"
+        if method == "reflink":
+            assert dst.stat().st_ino != src.stat().st_ino
+
+    def test_link_or_copy_verify_detects_source_change(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        import os
+
+        src = tmp_path / "src.mp4"
+        src.write_bytes(b"partial")
+        real_link = os.link
+
+        def link_while_writing(a, b):
+            real_link(a, b)
+            with open(src, "ab") as f:
+                f.write(b" more")
+
+        monkeypatch.setattr(os, "link", link_while_writing)
+        dst = tmp_path / "dst.mp4"
+        with pytest.raises(RuntimeError, match="Source changed"):
+            link_or_copy(src, dst, verify=True)
+        assert not dst.exists()
+
+    def test_rerun_only_renders_changed_scene(
+        self, tmp_path: Path, render_cfg: RenderConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        from scripts import compile_cut
+
+        monkeypatch.setattr(compile_cut, "PROJECT_ROOT", tmp_path)
+        cache = CandidateCache(root=tmp_path / "cache")
+        provider = _CountingProvider()
+        scenes = [{"id": "s1", "sora_prompt": "a"}, {"id": "s2", "sora_prompt": "b"}]
+
+        def run() -> list[list[dict]]:
+            return compile_cut.generate_candidates(
+                provider, "ep", scenes, tmp_path / "tmp", render_cfg, num_candidates=2, max_workers=2, cache=cache
+            )
+
+        run()
+        assert len(provider.rendered) == 4
+
+        scenes[1] = {"id": "s2", "sora_prompt": "changed"}
+        result = run()
+        assert sorted(provider.rendered[4:]) == ["s2:1", "s2:2"]
+        assert cache.hits == 2
+        assert (tmp_path / result[0][0]["path"]).read_bytes() == b"s1-a-1"
+        assert (tmp_path / result[1][1]["path"]).read_bytes() == b"s2-changed-2"
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import cli
+
+HEAVY_MODULES = ("openai", "jsonschema", "pysubs2", "requests", "dotenv")
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+calls: list[list[str]] = []
+
+
+def main(argv: list[str]) -> int:
+    """Stand-in command module for in-process dispatch."""
+    calls.append(argv)
+    return 4
+
+
+@pytest.fixture(autouse=True)
+def no_daemon(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("CH_NO_DAEMON", "1")
+    monkeypatch.chdir(tmp_path)  # run_module changes directory; restored after each test
+    calls.clear()
+
+
+class TestDispatch:
+    """Tests for running ch commands in-process"""
+
+    def test_runs_module_main_in_process(self):
+        assert cli.run_module("tests.test_cli", ["--flag"]) == 4
+        assert calls == [["--flag"]]
+        assert Path.cwd() == PROJECT_ROOT
+
+    def test_missing_dependency_falls_back_to_uv(self, monkeypatch: pytest.MonkeyPatch):
+        def missing(_name: str) -> None:
+            raise ModuleNotFoundError("No module named 'jsonschema'", name="jsonschema")
+
+        spawned: list[tuple[str, list[str]]] = []
+        monkeypatch.setattr(cli.importlib, "import_module", missing)
+        monkeypatch.setattr(cli, "_run_with_uv", lambda module, args: spawned.append((module, args)) or 7)
+
+        assert cli.run_module("scripts.compile_cut", ["--recipe", "r.yaml"]) == 7
+        assert spawned == [("scripts.compile_cut", ["--recipe", "r.yaml"])]
+
+    def test_missing_project_module_is_an_error(self):
+        with pytest.raises(ModuleNotFoundError):
+            cli.run_module("scripts.no_such_command", [])
+
+    def test_subcommand_builds_argv(self, monkeypatch: pytest.MonkeyPatch):
+        seen: list[tuple[str, list[str]]] = []
+        monkeypatch.setattr(cli, "run_module", lambda module, args: seen.append((module, args)) or 0)
+
+        assert cli.main(["bundle", "--cut-manifest", "m.json", "--include", "episodes", "captions"]) == 0
+        assert seen == [("scripts.pack_release", ["--cut-manifest", "m.json", "--include", "episodes", "captions"])]
+
+    def test_no_command_prints_help(self, capsys: pytest.CaptureFixture[str]):
+        assert cli.main([]) == 1
+        assert "usage: ch" in capsys.readouterr().out
+
+
+class TestLazyImports:
+    """Startup cost: heavy dependencies are only imported by the commands that use them"""
+
+    @pytest.mark.parametrize(
+        "module",
+        ["scripts.cli", "scripts.compile_cut", "scripts.generate_video", "scripts.generate_cover_art"],
+    )
+    def test_import_skips_heavy_dependencies(self, module: str):
+        code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == ""
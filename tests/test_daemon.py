@@ -0,0 +1,112 @@
+import os
+import socket
+import sys
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from scripts import daemon
+
+
+def main(argv: list[str]) -> int:
+    """Stand-in command served by the daemon under the name "probe"."""
+    if argv == ["--fail"]:
+        raise RuntimeError("boom")
+    if argv == ["--usage"]:
+        raise SystemExit(2)
+    os.environ["CH_PROBE_LEAK"] = "1"
+    print(f"argv={argv} cwd={Path.cwd().name} var={os.environ.get('CH_PROBE_VAR')}")
+    print("to stderr", file=sys.stderr)
+    return 3
+
+
+@pytest.fixture
+def sock() -> Iterator[Path]:
+    # AF_UNIX paths are limited to ~100 bytes: keep it short
+    with tempfile.TemporaryDirectory(prefix="ch") as d:
+        yield Path(d) / "d.sock"
+
+
+@pytest.fixture
+def server(sock: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.setitem(daemon.DAEMON_MODULES, "probe", "tests.test_daemon")
+    thread = threading.Thread(target=daemon.serve, args=(sock,), kwargs={"warm": False}, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.ping(sock) is not None:
+            break
+        threading.Event().wait(0.01)
+    yield sock
+    daemon.shutdown(sock)
+    thread.join(timeout=5)
+
+
+def _run(sock: Path, argv: list[str], cwd: Path, env: dict[str, str]) -> list[dict[str, Any]]:
+    req = {"op": "run", "module": "probe", "argv": argv, "cwd": str(cwd), "env": env}
+    return list(daemon._exchange(req, sock))
+
+
+class TestDaemon:
+    """Tests for the warm ch daemon over a Unix socket"""
+
+    def test_no_daemon_means_fallback(self, sock: Path):
+        assert daemon.ping(sock) is None
+        assert daemon.request("compile_cut", ["--recipe", "x.yaml"], sock) is None
+        assert daemon.request("not_served", [], sock) is None
+
+    def test_runs_with_client_context_and_restores_it(self, server: Path, tmp_path: Path):
+        before_env, before_cwd = dict(os.environ), os.getcwd()
+        messages = _run(server, ["-x"], tmp_path, {"CH_PROBE_VAR": "hello"})
+
+        stdout = "".join(m["data"] for m in messages if m.get("stream") == "stdout")
+        stderr = "".join(m["data"] for m in messages if m.get("stream") == "stderr")
+        assert stdout == f"argv=['-x'] cwd={tmp_path.name} var=hello\n"
+        assert stderr == "to stderr\n"
+        assert messages[-1] == {"exit": 3}
+        assert dict(os.environ) == before_env
+        assert os.getcwd() == before_cwd
+
+        status = daemon.ping(server)
+        assert status is not None
+        assert status["served"] == 1
+
+    def test_errors_become_exit_codes(self, server: Path, tmp_path: Path):
+        failed = _run(server, ["--fail"], tmp_path, {})
+        assert failed[-1] == {"exit": 1}
+        assert "RuntimeError: boom" in "".join(m.get("data", "") for m in failed)
+        assert _run(server, ["--usage"], tmp_path, {})[-1] == {"exit": 2}
+        # Still serving afterwards
+        assert daemon.ping(server) is not None
+
+    def test_lost_daemon_mid_request_fails_instead_of_rerunning(self, sock: Path, capsys: pytest.CaptureFixture[str]):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(sock))
+            listener.listen()
+
+            def crash_after_output() -> None:
+                conn, _ = listener.accept()
+                with conn:
+                    conn.recv(65536)
+                    conn.sendall(b'{"stream": "stdout", "data": "partial\\n"}\n')
+
+            thread = threading.Thread(target=crash_after_output, daemon=True)
+            thread.start()
+            assert daemon.request("compile_cut", [], sock) == 1
+            thread.join(timeout=5)
+
+        captured = capsys.readouterr()
+        assert captured.out == "partial\n"
+        assert "without an exit code" in captured.err
+
+    def test_stale_sources_stop_the_daemon(self, server: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(daemon, "_source_stamp", lambda: -1)
+        assert _run(server, [], tmp_path, {}) == [{"stale": True}]
+        for _ in range(200):
+            if not server.exists():
+                break
+            threading.Event().wait(0.01)
+        assert daemon.ping(server) is None
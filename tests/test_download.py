@@ -0,0 +1,188 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.utils import download
+from scripts.utils.download import DownloadError, download_to_file, part_path, stream_response_to_file
+
+BODY = bytes(range(256)) * 400  # 100 KiB
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves BODY with byte-range support; optionally drops the first full GET midway."""
+
+    server: "_Server"
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+    def _span(self) -> tuple[int, int] | None:
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        start, _, end = header.removeprefix("bytes=").partition("-")
+        return int(start), int(end) if end else len(BODY) - 1
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        span = self._span()
+        self.server.ranges.append(span)
+        start, end = span or (0, len(BODY) - 1)
+        payload = BODY[start : end + 1]
+        self.send_response(206 if span else 200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.server.drop_after and span is None:
+            self.server.drop_after, cut = 0, self.server.drop_after
+            self.wfile.write(payload[:cut])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(payload)
+
+
+class _Server(ThreadingHTTPServer):
+    drop_after = 0
+    ranges: list[tuple[int, int] | None]
+
+
+@pytest.fixture
+def server() -> Iterator[_Server]:
+    srv = _Server(("127.0.0.1", 0), _RangeHandler)
+    srv.ranges = []
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _url(srv: _Server) -> str:
+    return f"http://127.0.0.1:{srv.server_address[1]}/video.mp4"
+
+
+class TestDownloadToFile:
+    """Tests for streaming, resumable downloads against a local HTTP server"""
+
+    def test_streams_to_part_then_renames(self, tmp_path: Path, server: _Server):
+        dest = tmp_path / "out" / "clip.mp4"
+        download_to_file(_url(server), dest, chunk_size=4096)
+
+        assert dest.read_bytes() == BODY
+        assert not part_path(dest).exists()
+        assert server.ranges == [None]
+
+    def test_resumes_existing_part_with_range(self, tmp_path: Path, server: _Server):
+        dest = tmp_path / "clip.mp4"
+        part_path(dest).write_bytes(BODY[:1000])
+
+        download_to_file(_url(server), dest)
+
+        assert dest.read_bytes() == BODY
+        assert server.ranges == [(1000, len(BODY) - 1)]
+
+    def test_part_of_another_source_is_not_resumed(self, tmp_path: Path, server: _Server):
+        dest = tmp_path / "clip.mp4"
+        part_path(dest, "video_old").write_bytes(b"x" * 1000)
+        part_path(dest).write_bytes(b"x" * 1000)
+
+        download_to_file(_url(server), dest, source_id="video_new")
+
+        assert dest.read_bytes() == BODY
+        assert server.ranges == [None]
+        assert list(tmp_path.iterdir()) == [dest]
+
+    def test_dropped_connection_resumes_instead_of_restarting(self, tmp_path: Path, server: _Server):
+        server.drop_after = 30_000
+        dest = tmp_path / "clip.mp4"
+
+        download_to_file(_url(server), dest, chunk_size=1024)
+
+        assert dest.read_bytes() == BODY
+        assert server.ranges[0] is None
+        assert server.ranges[1] is not None and server.ranges[1][0] > 0
+
+    def test_parallel_ranged_fetch(self, tmp_path: Path, server: _Server, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(download, "PARALLEL_MIN_BYTES", 1)
+        dest = tmp_path / "clip.mp4"
+
+        download_to_file(_url(server), dest, parallel=4)
+
+        assert dest.read_bytes() == BODY
+        assert sorted(r for r in server.ranges if r) == [
+            (i * len(BODY) // 4, (i + 1) * len(BODY) // 4 - 1) for i in range(4)
+        ]
+        assert list(tmp_path.iterdir()) == [dest]
+
+    def test_size_mismatch_keeps_dest_untouched(self, tmp_path: Path, server: _Server):
+        dest = tmp_path / "clip.mp4"
+        with pytest.raises(DownloadError, match="expected"):
+            download_to_file(_url(server), dest, expected_size=len(BODY) + 1)
+        assert not dest.exists()
+
+    def test_failed_verification_discards_part(self, tmp_path: Path, server: _Server):
+        dest = tmp_path / "clip.mp4"
+
+        def reject(_path: Path) -> None:
+            raise ValueError("not a video")
+
+        with pytest.raises(DownloadError, match="not a video"):
+            download_to_file(_url(server), dest, verify=reject)
+        assert not dest.exists()
+        assert not part_path(dest).exists()
+
+
+def _stream(body: bytes, status: int = 200, **headers: str):
+    """``open_stream`` for stream_response_to_file serving ``body`` with ``headers``."""
+
+    @asynccontextmanager
+    async def open_stream(_request_headers: dict[str, str]) -> AsyncIterator[object]:
+        async def iter_bytes(chunk_size: int) -> AsyncIterator[bytes]:
+            for i in range(0, len(body), chunk_size):
+                yield body[i : i + chunk_size]
+
+        yield SimpleNamespace(status_code=status, headers=headers, iter_bytes=iter_bytes)
+
+    return open_stream
+
+
+class TestStreamResponseToFile:
+    """Tests for the SDK streaming download path"""
+
+    def test_resumes_and_checks_content_range_total(self, tmp_path: Path):
+        dest = tmp_path / "clip.mp4"
+        part_path(dest, "video_1").write_bytes(BODY[:1000])
+        rest = _stream(BODY[1000:], 206, **{"Content-Range": f"bytes 1000-{len(BODY) - 1}/{len(BODY)}"})
+
+        asyncio.run(stream_response_to_file(rest, dest, source_id="video_1"))
+
+        assert dest.read_bytes() == BODY
+
+    def test_truncated_stream_is_rejected(self, tmp_path: Path):
+        dest = tmp_path / "clip.mp4"
+        short = _stream(BODY[:5000], **{"Content-Length": str(len(BODY))})
+
+        with pytest.raises(DownloadError, match="expected"):
+            asyncio.run(stream_response_to_file(short, dest, source_id="video_1"))
+        assert not dest.exists()
+
+    def test_misplaced_resume_starts_over(self, tmp_path: Path):
+        dest = tmp_path / "clip.mp4"
+        part = part_path(dest, "video_1")
+        part.write_bytes(BODY[:1000])
+        wrong = _stream(BODY[10:], 206, **{"Content-Range": f"bytes 10-{len(BODY) - 1}/{len(BODY)}"})
+
+        with pytest.raises(DownloadError, match="resumed at byte 10"):
+            asyncio.run(stream_response_to_file(wrong, dest, source_id="video_1"))
+        assert not part.exists()
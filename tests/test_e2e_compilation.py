@@ -9,6 +9,7 @@ from __future__ import annotations
 import shutil
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
@@ -612,3 +613,219 @@ class TestRecipeValidationE2E:
 
         # Should not raise
         validate_recipe(recipe)
+
+
+class TestParallelCompilation:
+    """Tests for the --jobs process pool in compile_cut."""
+
+    def test_resolve_jobs(self):
+        """--jobs 0 means one worker per core; negative values are rejected."""
+        import os
+
+        from scripts.compile_cut import resolve_jobs
+
+        assert resolve_jobs(None) == 1
+        assert resolve_jobs(1) == 1
+        assert resolve_jobs(4) == 4
+        assert resolve_jobs(0) == (os.cpu_count() or 1)
+        with pytest.raises(ValueError):
+            resolve_jobs(-1)
+
+    def test_negative_jobs_rejected_at_parse_time(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+        from scripts.compile_cut import main
+
+        with pytest.raises(SystemExit) as exc:
+            main(["--recipe", str(tmp_path / "recipe.yaml"), "--jobs", "-2"])
+        assert exc.value.code == 2
+        assert "--jobs must be >= 0 (got -2)" in capsys.readouterr().err
+
+    def test_parallel_failures_are_collected(self, minimal_recipe: dict[str, Any]):
+        """Every failing worker is reported and the cut fails as a whole."""
+        from scripts.compile_cut import EpisodeCompileError, compile_episodes
+        from scripts.providers.base import RenderConfig
+
+        render_cfg = RenderConfig.from_strings(resolution="1080x1920", fps=24, aspect="9:16")
+        missing = ["missing_ep_a", "missing_ep_b", "missing_ep_c"]
+
+        with pytest.raises(EpisodeCompileError) as exc_info:
+            compile_episodes(
+                missing,
+                recipe=minimal_recipe,
+                render_cfg=render_cfg,
+                cut_id="parallel_test",
+                series_cfg={},
+                jobs=2,
+            )
+
+        assert list(exc_info.value.failures) == missing
+        assert all("FileNotFoundError" in err for err in exc_info.value.failures.values())
+
+
+class TestCandidateGeneration:
+    """Tests for concurrent candidate generation inside compile_episode."""
+
+    class _SlowProvider:
+        """Fake provider that finishes later candidates first."""
+
+        max_concurrency = 8
+
+        def __init__(self) -> None:
+            self.calls: list[tuple[str, int | None]] = []
+
+        def name(self) -> str:
+            return "slow"
+
+        def generate_scene(self, _episode_id, scene, output_dir, _render_cfg, seed=None) -> str:
+            import time
+
+            self.calls.append((scene["id"], seed))
+            time.sleep(0.02 * (4 - (seed or 0)))
+            out = Path(output_dir) / f"{scene['id']}.mp4"
+            out.write_bytes(b"")
+            return str(out)
+
+    def test_candidates_are_ordered_by_index(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        from scripts import compile_cut
+        from scripts.providers.base import RenderConfig
+
+        monkeypatch.setattr(compile_cut, "PROJECT_ROOT", tmp_path)
+        provider = self._SlowProvider()
+        scenes = [{"id": "s1", "duration_sec": 3}, {"id": "s2", "duration_sec": 4}]
+        render_cfg = RenderConfig.from_strings(resolution="1080x1920", fps=24, aspect="9:16")
+
+        result = compile_cut.generate_candidates(
+            provider,
+            "ep",
+            scenes,
+            tmp_path / "tmp",
+            render_cfg,
+            num_candidates=3,
+            max_workers=6,
+        )
+
+        assert len(provider.calls) == 6
+        assert [[c["index"] for c in cands] for cands in result] == [[1, 2, 3], [1, 2, 3]]
+        assert result[1][2]["path"] == "tmp/s2/cand3/s2.mp4"
+        assert result[1][0]["duration_sec"] == 4
+
+    def test_candidate_workers_respects_provider_and_recipe(self):
+        from scripts.compile_cut import candidate_workers
+
+        provider = self._SlowProvider()
+        assert candidate_workers(provider, {}) == 8
+        assert candidate_workers(provider, {"max_concurrency": 2}) == 2
+        assert candidate_workers(object(), {}) == 1
+
+    def test_candidate_workers_split_across_episode_workers(self):
+        from scripts.compile_cut import candidate_workers
+
+        provider = self._SlowProvider()
+        assert candidate_workers(provider, {}, worker_share=3) == 2
+        assert candidate_workers(provider, {"max_concurrency": 2}, worker_share=3) == 1
+        assert candidate_workers(provider, {}, worker_share=1) == 8
+
+
+class TestFusedRender:
+    """Tests for the single-pass fused episode filtergraph."""
+
+    def test_filtergraph_with_audio_and_overlays(self):
+        from scripts.compile_cut import build_fused_filtergraph
+
+        overlays = [
+            [{"type": "text", "text": "Day 1", "start_sec": 0.5, "duration_sec": 1.5}],
+            [],
+        ]
+        graph = build_fused_filtergraph(overlays, [0, 2], 1080, 1920, 24)
+        chains = graph.split(";")
+
+        assert chains[0].startswith("[0:v]fps=24,scale=1080:1920,setsar=1,format=yuv420p,drawtext=")
+        assert "text='Day 1'" in chains[0]
+        assert chains[0].endswith("[v0]")
+        assert chains[1].startswith("[0:a]aresample=48000")
+        assert chains[2] == "[1:v]fps=24,scale=1080:1920,setsar=1,format=yuv420p[v1]"
+        assert chains[3].startswith("[2:a]")
+        assert chains[-1] == "[v0][a0][v1][a1]concat=n=2:v=1:a=1[vout][aout]"
+
+    def test_filtergraph_silent(self):
+        from scripts.compile_cut import build_fused_filtergraph
+
+        graph = build_fused_filtergraph([[], [], []], None, 720, 1280, 30)
+        assert ":a]" not in graph
+        assert graph.endswith("[v0][v1][v2]concat=n=3:v=1:a=0[vout]")
+
+    def test_silent_scenes_are_padded_to_their_probed_length(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        from scripts import compile_cut
+        from scripts.utils.probe import MediaInfo
+
+        infos = {
+            "a.mp4": MediaInfo(4.0, "h264", 1080, 1920, "24/1", "yuv420p", has_audio=True),
+            "b.mp4": MediaInfo(7.25, "h264", 1080, 1920, "24/1", "yuv420p", has_audio=False),
+            "c.mp4": MediaInfo(None, "h264", 1080, 1920, "24/1", "yuv420p", has_audio=False),
+        }
+        commands: list[list[str]] = []
+        monkeypatch.setattr(compile_cut, "preflight_check", lambda **_kwargs: None)
+        monkeypatch.setattr(compile_cut, "probe_many", lambda clips: [infos[c.name] for c in clips])
+        monkeypatch.setattr(
+            compile_cut.subprocess,
+            "run",
+            lambda cmd, **_kwargs: commands.append(cmd) or SimpleNamespace(stderr=""),
+        )
+
+        clips = [tmp_path / name for name in infos]
+        compile_cut.ffmpeg_render_fused(clips, [[], [], []], tmp_path / "ep.mp4", fps=24, width=1080, height=1920)
+
+        cmd = commands[0]
+        pads = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-t"]
+        assert pads == ["7.25", str(compile_cut.DEFAULT_SCENE_DURATION_SEC)]
+
+
+class TestBatchCandidateGeneration:
+    """Batch-capable providers receive every cache miss in one generate_scenes() call."""
+
+    class _BatchProvider:
+        max_concurrency = 2
+
+        def __init__(self) -> None:
+            self.batches: list[list[tuple[str, int | None]]] = []
+
+        def name(self) -> str:
+            return "batch"
+
+        def generate_scene(self, *_args, **_kwargs) -> str:
+            raise AssertionError("batch providers are driven through generate_scenes()")
+
+        def generate_scenes(self, jobs, _render_cfg, max_in_flight=None) -> list[str]:
+            self.batches.append([(job.scene["id"], job.seed) for job in jobs])
+            self.max_in_flight = max_in_flight
+            paths = []
+            for job in jobs:
+                out = Path(job.output_dir) / f"{job.scene['id']}.mp4"
+                out.write_bytes(f"{job.scene['id']}-{job.seed}".encode())
+                paths.append(str(out))
+            return paths
+
+    def test_single_batch_with_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        from scripts import compile_cut
+        from scripts.providers.base import RenderConfig
+        from scripts.utils.cache import CandidateCache
+
+        monkeypatch.setattr(compile_cut, "PROJECT_ROOT", tmp_path)
+        provider = self._BatchProvider()
+        cache = CandidateCache(root=tmp_path / "cache")
+        render_cfg = RenderConfig.from_strings(resolution="1080x1920", fps=24, aspect="9:16")
+        scenes = [{"id": "s1"}, {"id": "s2"}]
+
+        def run() -> list[list[dict]]:
+            return compile_cut.generate_candidates(
+                provider, "ep", scenes, tmp_path / "tmp", render_cfg, num_candidates=2, max_workers=3, cache=cache
+            )
+
+        first = run()
+        assert provider.batches == [[("s1", 1), ("s1", 2), ("s2", 1), ("s2", 2)]]
+        assert provider.max_in_flight == 3
+
+        scenes[1] = {"id": "s2", "duration_sec": 9}
+        second = run()
+        assert provider.batches[1] == [("s2", 1), ("s2", 2)]
+        assert [[c["path"] for c in cands] for cands in second] == [[c["path"] for c in cands] for cands in first]
+        assert (tmp_path / second[0][1]["path"]).read_bytes() == b"s1-2"
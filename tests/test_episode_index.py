@@ -0,0 +1,151 @@
+"""Tests for the incrementally rebuilt episode/scene index."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts import episode_index
+from scripts.episode_index import EpisodeIndex, load_episode_index, prompt_hash
+from scripts.generate_video import scene_inputs
+from scripts.providers.base import RenderConfig
+
+
+def _write_episode(episodes_dir: Path, episode_id: str, text: str, age_seconds: int = 60) -> Path:
+    """Write a manifest and backdate it out of the racy window (so the index keeps it)."""
+    path = episodes_dir / episode_id / "episode.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    mtime = path.stat().st_mtime_ns - age_seconds * 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+EPISODE = """\
+episode_id: ep1
+title: First
+scenes:
+  - id: s1
+    title: Opening
+    duration_sec: 4
+    sora_prompt: "  a snowy street  "
+    overlays:
+      - spec: lower-third
+  - id: s2
+    duration_sec: 6.5
+  - id: s3
+    duration_sec: 2
+    sora_prompt: a cabin
+"""
+
+
+@pytest.fixture
+def indexed(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Episode directories whose manifests the index actually parsed."""
+    seen: list[str] = []
+    real = episode_index.index_episode
+
+    def index_episode(manifest, episode_dir_name):
+        seen.append(episode_dir_name)
+        return real(manifest, episode_dir_name)
+
+    monkeypatch.setattr(episode_index, "index_episode", index_episode)
+    return seen
+
+
+class TestEpisodeIndex:
+    def test_scene_offsets_and_prompts(self, tmp_path: Path):
+        _write_episode(tmp_path, "ep1", EPISODE)
+
+        entry = load_episode_index(tmp_path).episode("ep1")
+
+        assert entry["title"] == "First"
+        assert entry["duration_sec"] == 12.5
+        assert [s["offset_sec"] for s in entry["scenes"]] == [0.0, 4.0, 10.5]
+        assert entry["scenes"][0]["sora_prompt"] == "a snowy street"
+        assert entry["scenes"][0]["overlays"] == ["lower-third"]
+        assert entry["scenes"][1]["sora_prompt"] == ""
+
+    def test_missing_duration_counts_as_default(self, tmp_path: Path):
+        _write_episode(tmp_path, "ep1", "scenes:\n  - id: s1\n  - id: s2\n    duration_sec: 3\n")
+        entry = load_episode_index(tmp_path).episode("ep1")
+
+        assert [s["offset_sec"] for s in entry["scenes"]] == [0.0, 5.0]
+        assert entry["duration_sec"] == 8.0
+
+    def test_listing_defaults_to_episode_directories(self, tmp_path: Path):
+        _write_episode(tmp_path, "ep1", EPISODE)
+        _write_episode(tmp_path, "scratch", "title: Notes\n")
+        index = load_episode_index(tmp_path)
+
+        assert index.episode_ids(episode_index.EPISODE_PATTERN) == ["ep1"]
+        assert index.episode("scratch")["title"] == "Notes"
+
+    def test_prompt_hash_matches_generate_video(self, tmp_path: Path):
+        _write_episode(tmp_path, "ep1", EPISODE)
+        scene = load_episode_index(tmp_path).scenes("ep1")[0]
+
+        cfg = RenderConfig.from_strings("1080x1920", 30, "9:16")
+        raw = {"id": "s1", "duration_sec": 4, "sora_prompt": "  a snowy street  "}
+        assert scene["sora_prompt_hash"] == prompt_hash(raw["sora_prompt"])
+        assert scene_inputs(scene, "sora-2", cfg, 7) == scene_inputs(raw, "sora-2", cfg, 7)
+
+    def test_only_changed_manifests_are_reparsed(self, tmp_path: Path, indexed: list[str]):
+        _write_episode(tmp_path, "ep1", EPISODE)
+        _write_episode(tmp_path, "ep2", "title: Second\nscenes: []\n")
+        load_episode_index(tmp_path)
+        assert indexed == ["ep1", "ep2"]
+
+        indexed.clear()
+        _write_episode(tmp_path, "ep2", "title: Renamed\nscenes: []\n", age_seconds=30)
+        _write_episode(tmp_path, "ep3", "title: Third\n")
+        index = load_episode_index(tmp_path)
+
+        assert indexed == ["ep2", "ep3"]
+        assert index.episode("ep2")["title"] == "Renamed"
+        assert index.episode_ids() == ["ep1", "ep2", "ep3"]
+
+    def test_removed_episode_drops_out(self, tmp_path: Path):
+        path = _write_episode(tmp_path, "ep1", EPISODE)
+        _write_episode(tmp_path, "ep2", "title: Second\n")
+        load_episode_index(tmp_path)
+
+        path.unlink()
+        assert load_episode_index(tmp_path).episode_ids() == ["ep2"]
+
+    def test_recently_modified_manifest_is_reindexed(self, tmp_path: Path, indexed: list[str]):
+        path = tmp_path / "ep1" / "episode.yaml"
+        path.parent.mkdir()
+        path.write_text("title: Fresh\n", encoding="utf-8")
+
+        load_episode_index(tmp_path)
+        load_episode_index(tmp_path)
+
+        assert indexed == ["ep1", "ep1"]
+
+    def test_index_file_location(self, tmp_path: Path):
+        _write_episode(tmp_path, "ep1", EPISODE)
+        index = load_episode_index(tmp_path)
+
+        assert index.path.parent == Path(os.environ["CH_CACHE_DIR"]) / "episodes"
+        assert set(json.loads(index.path.read_text())["episodes"]) == {"ep1"}
+
+    def test_missing_and_invalid_episodes(self, tmp_path: Path):
+        _write_episode(tmp_path, "bad", "scenes: [unclosed\n")
+        index = load_episode_index(tmp_path)
+
+        with pytest.raises(FileNotFoundError, match="Episode manifest not found"):
+            index.episode("nope")
+        with pytest.raises(ValueError, match="Invalid episode manifest"):
+            index.scenes("bad")
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path: Path):
+        _write_episode(tmp_path, "ep1", EPISODE)
+        path = EpisodeIndex(tmp_path).path
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json", encoding="utf-8")
+
+        assert load_episode_index(tmp_path).episode_ids() == ["ep1"]
@@ -0,0 +1,95 @@
+"""Tests for the cached ffmpeg capability registry."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts.utils import ffmpeg
+from scripts.utils.ffmpeg import FFmpegUnavailableError, parse_listing
+
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC (codec h264)
+ V....D libsvtav1            SVT-AV1(Scalable Video Technology for AV1) encoder (codec av1)
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+FILTERS_OUTPUT = """Filters:
+  T.. = Timeline support
+  | = Source or sink filter
+ TSC drawtext          V->V       Draw text on top of video frames using libfreetype library.
+ ... concat            N->N       Concatenate audio and video streams.
+ ... anullsrc          |->A       Null audio source, return empty audio frames.
+"""
+
+MUXERS_OUTPUT = """Formats:
+ D.. = Demuxing supported
+ .E. = Muxing supported
+ ---
+  E  mp4             MP4 (MPEG-4 Part 14)
+  E  matroska        Matroska
+"""
+
+
+class TestParseListing:
+    def test_encoders_filters_muxers(self):
+        assert parse_listing(ENCODERS_OUTPUT) == {"libx264", "libsvtav1", "aac"}
+        assert parse_listing(FILTERS_OUTPUT) == {"drawtext", "concat", "anullsrc"}
+        assert parse_listing(MUXERS_OUTPUT) == {"mp4", "matroska"}
+
+
+class TestCapabilityRegistry:
+    @pytest.fixture
+    def fake_ffmpeg(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, ...]]:
+        binary = tmp_path / "bin" / "ffmpeg"
+        binary.parent.mkdir()
+        binary.write_text("#!/bin/sh\n")
+        calls: list[tuple[str, ...]] = []
+        outputs = {
+            "-version": "ffmpeg version 7.0\n",
+            "-encoders": ENCODERS_OUTPUT,
+            "-filters": FILTERS_OUTPUT.replace(" TSC drawtext", " ... xfade"),
+            "-muxers": MUXERS_OUTPUT,
+        }
+
+        def fake_output(_path: str, *args: str) -> str:
+            calls.append(args)
+            return outputs[args[0]]
+
+        monkeypatch.setattr(ffmpeg, "_ffmpeg_output", fake_output)
+        monkeypatch.setattr(ffmpeg, "_memo", {})
+        monkeypatch.setattr(ffmpeg.shutil, "which", lambda _name: str(binary))
+        monkeypatch.setenv("CH_CACHE_DIR", str(tmp_path / "cache"))
+        return calls
+
+    def test_detects_once_and_persists(self, fake_ffmpeg: list[tuple[str, ...]], monkeypatch: pytest.MonkeyPatch):
+        caps = ffmpeg.ffmpeg_capabilities()
+        assert caps.version == "ffmpeg version 7.0"
+        assert caps.has_filter("xfade") and caps.has_muxer("mp4")
+        assert len(fake_ffmpeg) == 4
+
+        ffmpeg.preflight_check()
+        assert len(fake_ffmpeg) == 4
+
+        # New process: served from the disk cache
+        monkeypatch.setattr(ffmpeg, "_memo", {})
+        assert ffmpeg.ffmpeg_capabilities() == caps
+        assert len(fake_ffmpeg) == 4
+
+    def test_missing_filter_reported_up_front(self, fake_ffmpeg: list[tuple[str, ...]]):
+        with pytest.raises(FFmpegUnavailableError, match="filters: drawtext"):
+            ffmpeg.preflight_check(filters=["drawtext", "concat"])
+        assert fake_ffmpeg
+
+
+class TestRequiredFilters:
+    def test_recipe_filters(self):
+        from scripts.compile_cut import required_ffmpeg_filters
+
+        assert required_ffmpeg_filters({}) == []
+        assert required_ffmpeg_filters({"overlays": {"enabled": True}}) == ["drawtext"]
+        assert required_ffmpeg_filters({"render": {"mode": "fused"}}) == ["concat", "anullsrc"]
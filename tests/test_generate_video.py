@@ -0,0 +1,185 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from scripts import generate_video
+from scripts.generate_video import generate_episode, read_work_list, sidecar_path
+from scripts.providers.base import RenderConfig, SceneJob
+
+
+class _FakeSora:
+    """Writes the prompt as the clip; prompts listed in ``failing`` become placeholder fallbacks."""
+
+    model = "sora-2"
+
+    def __init__(self, failing: tuple[str, ...] = ()) -> None:
+        self.failing = failing
+        self.generated: list[str] = []
+        self.superseded: list[str] = []
+        self._fallbacks: set[Path] = set()
+
+    def supersede(self, jobs: list[SceneJob]) -> None:
+        self.superseded.extend(job.scene["id"] for job in jobs)
+
+    def is_fallback(self, path: str | Path) -> bool:
+        return Path(path).resolve() in self._fallbacks
+
+    def generate_scenes(self, jobs: list[SceneJob], _render_cfg: RenderConfig, on_done: Any = None) -> list[str]:
+        paths = []
+        for job in jobs:
+            out = Path(job.output_dir) / f"{job.scene['id']}.mp4"
+            out.write_text(job.scene["sora_prompt"])
+            if job.scene["sora_prompt"] in self.failing:
+                self._fallbacks.add(out.resolve())
+            else:
+                self.generated.append(job.scene["id"])
+            if on_done is not None:
+                on_done(job, str(out))
+            paths.append(str(out))
+        return paths
+
+
+@pytest.fixture
+def episodes_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "episodes"
+    (root / "ep01").mkdir(parents=True)
+    manifest = {"scenes": [{"id": f"s{i}", "duration_sec": 4, "sora_prompt": f"prompt {i}"} for i in range(1, 4)]}
+    (root / "ep01" / "episode.yaml").write_text(yaml.safe_dump(manifest))
+    monkeypatch.setattr(generate_video, "EPISODES_DIR", root)
+    return root
+
+
+@pytest.fixture
+def render_cfg() -> RenderConfig:
+    return RenderConfig.from_strings("1080x1920", 24, "9:16")
+
+
+def _statuses(results: list[dict[str, Any]]) -> dict[str, str]:
+    return {r["scene_id"]: r["status"] for r in results}
+
+
+@pytest.mark.usefixtures("episodes_dir")
+class TestIdempotentBatch:
+    """Tests for skip-existing batch generation in generate_video"""
+
+    def test_rerun_skips_up_to_date_scenes(self, tmp_path: Path, render_cfg: RenderConfig):
+        out = tmp_path / "renders"
+        provider = _FakeSora()
+        first = generate_episode("ep01", provider, render_cfg, out)  # type: ignore[arg-type]
+        assert _statuses(first) == {"s1": "success", "s2": "success", "s3": "success"}
+        sidecar = json.loads(sidecar_path(out / "ep01" / "s1.mp4").read_text())
+        assert sidecar["scene_id"] == "s1"
+
+        second = generate_episode("ep01", provider, render_cfg, out)  # type: ignore[arg-type]
+        assert _statuses(second) == {"s1": "skipped", "s2": "skipped", "s3": "skipped"}
+        assert provider.generated == ["s1", "s2", "s3"]
+
+    def test_changed_prompt_or_force_regenerates(self, tmp_path: Path, render_cfg: RenderConfig, episodes_dir: Path):
+        out = tmp_path / "renders"
+        provider = _FakeSora()
+        generate_episode("ep01", provider, render_cfg, out)  # type: ignore[arg-type]
+
+        manifest_path = episodes_dir / "ep01" / "episode.yaml"
+        manifest = yaml.safe_load(manifest_path.read_text())
+        manifest["scenes"][1]["sora_prompt"] = "prompt 2, revised"
+        manifest_path.write_text(yaml.safe_dump(manifest))
+
+        results = generate_episode("ep01", provider, render_cfg, out)  # type: ignore[arg-type]
+        assert _statuses(results) == {"s1": "skipped", "s2": "success", "s3": "skipped"}
+
+        forced = generate_episode("ep01", provider, render_cfg, out, scene_ids=["s3"], force=True)  # type: ignore[arg-type]
+        assert _statuses(forced) == {"s3": "success"}
+        # A forced take must not resume the journaled job of the previous one
+        assert provider.superseded == ["s3"]
+
+    def test_rerun_only_retries_failures(self, tmp_path: Path, render_cfg: RenderConfig):
+        out = tmp_path / "renders"
+        failing = _FakeSora(failing=("prompt 2",))
+        first = generate_episode("ep01", failing, render_cfg, out)  # type: ignore[arg-type]
+        assert _statuses(first) == {"s1": "success", "s2": "error", "s3": "success"}
+        assert not sidecar_path(out / "ep01" / "s2.mp4").exists()
+
+        retry = _FakeSora()
+        second = generate_episode("ep01", retry, render_cfg, out)  # type: ignore[arg-type]
+        assert _statuses(second) == {"s1": "skipped", "s2": "success", "s3": "skipped"}
+        assert retry.generated == ["s2"]
+
+    def test_into_drafts_never_keeps_placeholders(self, tmp_path: Path, render_cfg: RenderConfig, episodes_dir: Path):
+        streamed: list[dict[str, Any]] = []
+        provider = _FakeSora(failing=("prompt 1",))
+        generate_episode(
+            "ep01",
+            provider,  # type: ignore[arg-type]
+            render_cfg,
+            tmp_path / "unused",
+            into_drafts=True,
+            on_result=streamed.append,
+        )
+
+        drafts = episodes_dir / "ep01" / "renders" / "drafts"
+        assert sorted(p.name for p in drafts.glob("*.mp4")) == ["s2.mp4", "s3.mp4"]
+        assert [r["scene_id"] for r in streamed] == ["s1", "s2", "s3"]
+        assert not (tmp_path / "unused").exists()
+
+    def test_failed_regeneration_keeps_existing_draft(
+        self, tmp_path: Path, render_cfg: RenderConfig, episodes_dir: Path
+    ):
+        generate_episode("ep01", _FakeSora(), render_cfg, tmp_path, into_drafts=True)  # type: ignore[arg-type]
+        draft = episodes_dir / "ep01" / "renders" / "drafts" / "s1.mp4"
+
+        failing = _FakeSora(failing=("prompt 1",))
+        results = generate_episode(
+            "ep01",
+            failing,  # type: ignore[arg-type]
+            render_cfg,
+            tmp_path,
+            scene_ids=["s1"],
+            into_drafts=True,
+            force=True,
+        )
+
+        assert _statuses(results) == {"s1": "error"}
+        assert draft.read_text() == "prompt 1"
+        assert sidecar_path(draft).exists()
+        assert not (draft.parent / generate_video.STAGING_DIR_NAME).exists()
+
+    def test_failed_regeneration_keeps_existing_clip(self, tmp_path: Path, render_cfg: RenderConfig):
+        out = tmp_path / "renders"
+        generate_episode("ep01", _FakeSora(), render_cfg, out)  # type: ignore[arg-type]
+
+        results = generate_episode("ep01", _FakeSora(failing=("prompt 2",)), render_cfg, out, force=True)  # type: ignore[arg-type]
+
+        assert _statuses(results) == {"s1": "success", "s2": "error", "s3": "success"}
+        assert "placeholder_path" not in results[1]
+        assert (out / "ep01" / "s2.mp4").read_text() == "prompt 2"
+
+    def test_scene_missing_from_manifest_is_reported(
+        self, tmp_path: Path, render_cfg: RenderConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        # The manifest loses s2 between the index snapshot and the full load
+        edited = {"scenes": [{"id": "s1", "sora_prompt": "prompt 1"}, {"id": "s3", "sora_prompt": "prompt 3"}]}
+        monkeypatch.setattr(generate_video, "load_yaml", lambda _path: edited)
+
+        results = generate_episode("ep01", _FakeSora(), render_cfg, tmp_path)  # type: ignore[arg-type]
+
+        assert _statuses(results) == {"s1": "success", "s2": "error", "s3": "success"}
+
+
+class TestWorkList:
+    """Tests for work list parsing"""
+
+    def test_formats(self, tmp_path: Path):
+        work_list = tmp_path / "work.txt"
+        work_list.write_text(
+            "# retry list\n"
+            "ep01 s1\n"
+            "ep01/s2\n"
+            "\n"
+            "ep02\n"
+            '{"episode_id": "ep03", "scene_id": "s7", "status": "error"}\n'
+            "ep02 s4\n"
+        )
+        assert read_work_list(work_list) == {"ep01": ["s1", "s2"], "ep02": None, "ep03": ["s7"]}
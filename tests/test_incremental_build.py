@@ -0,0 +1,193 @@
+"""Tests for build stamps and incremental cut compilation."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from scripts.providers.base import RenderConfig
+from scripts.utils.stamps import content_digest, file_signature, read_fresh_stamp, write_stamp
+
+
+class TestStamps:
+    def test_fresh_until_inputs_change(self, tmp_path: Path):
+        out = tmp_path / "out.mp4"
+        out.write_bytes(b"clip")
+        stamp = tmp_path / "stage.json"
+        inputs = {"scene": {"id": "s1"}, "render": [1080, 1920]}
+
+        assert read_fresh_stamp(stamp, inputs) is None
+        write_stamp(stamp, inputs, [out], meta={"k": "v"})
+
+        fresh = read_fresh_stamp(stamp, dict(inputs))
+        assert fresh is not None
+        assert fresh["meta"] == {"k": "v"}
+        assert read_fresh_stamp(stamp, {**inputs, "scene": {"id": "s2"}}) is None
+
+    def test_stale_when_output_modified_or_missing(self, tmp_path: Path):
+        out = tmp_path / "out.mp4"
+        out.write_bytes(b"clip")
+        stamp = tmp_path / "stage.json"
+        write_stamp(stamp, {"a": 1}, [out])
+
+        out.write_bytes(b"edited clip")
+        assert read_fresh_stamp(stamp, {"a": 1}) is None
+
+        write_stamp(stamp, {"a": 1}, [out])
+        out.unlink()
+        assert read_fresh_stamp(stamp, {"a": 1}) is None
+
+    def test_signatures(self, tmp_path: Path):
+        f = tmp_path / "font.ttf"
+        assert file_signature(f) is None
+        assert content_digest(None) is None
+        f.write_bytes(b"font")
+        assert file_signature(f)["size"] == 4
+        assert content_digest(f) == content_digest(str(f))
+
+
+class _CountingProvider:
+    max_concurrency = 1
+
+    def __init__(self) -> None:
+        self.rendered: list[str] = []
+
+    def name(self) -> str:
+        return "counting"
+
+    def generate_scene(self, _episode_id, scene, output_dir, _render_cfg, seed=None) -> str:
+        self.rendered.append(f"{scene['id']}:{seed}")
+        out = Path(output_dir) / f"{scene['id']}.mp4"
+        out.write_bytes(f"{scene['id']}-{seed}".encode())
+        return str(out)
+
+
+class TestIncrementalCandidates:
+    @pytest.fixture
+    def project(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+        from scripts import compile_cut
+
+        provider = _CountingProvider()
+        episode = {
+            "episode_id": "ep_inc",
+            "scenes": [{"id": "s1", "duration_sec": 2}, {"id": "s2", "duration_sec": 3}],
+        }
+        manifest = tmp_path / "episodes" / "ep_inc" / "episode.yaml"
+        manifest.parent.mkdir(parents=True)
+        manifest.write_text(yaml.safe_dump(episode), encoding="utf-8")
+
+        monkeypatch.setattr(compile_cut, "PROJECT_ROOT", tmp_path)
+        monkeypatch.setenv("CH_CANDIDATES_ONLY", "1")
+        return {"provider": provider, "manifest": manifest, "episode": episode}
+
+    def _compile(self, provider: _CountingProvider, force: bool = False) -> None:
+        from scripts.compile_cut import compile_episode
+
+        recipe = {"provider": {"name": "counting", "options": {"num_candidates": 2, "cache": False}}}
+        render_cfg = RenderConfig.from_strings(resolution="1080x1920", fps=24, aspect="9:16")
+        compile_episode("ep_inc", recipe, render_cfg, cut_id="inc", series_cfg={}, force=force, provider=provider)
+
+    def test_only_changed_scene_is_regenerated(self, project: dict[str, Any]):
+        provider = project["provider"]
+
+        self._compile(provider)
+        assert len(provider.rendered) == 4
+
+        self._compile(provider)
+        assert len(provider.rendered) == 4, "unchanged scenes must be skipped"
+
+        project["episode"]["scenes"][1]["duration_sec"] = 5
+        project["manifest"].write_text(yaml.safe_dump(project["episode"]), encoding="utf-8")
+        self._compile(provider)
+        assert provider.rendered[4:] == ["s2:1", "s2:2"]
+
+        self._compile(provider, force=True)
+        assert len(provider.rendered) == 10
+
+    def test_proxies_are_their_own_stage(self, project: dict[str, Any], monkeypatch: pytest.MonkeyPatch):
+        from scripts import compile_cut
+
+        provider = project["provider"]
+        encoded: list[str] = []
+
+        def make_proxy(src: Path, dst: Path, _width: int, _height: int) -> Path:
+            encoded.append(src.parent.name)
+            dst.write_bytes(b"proxy")
+            return dst
+
+        monkeypatch.setattr(compile_cut, "make_proxy", make_proxy)
+        manifest = compile_cut.PROJECT_ROOT / "output" / "tmp" / "inc" / "ep_inc" / "s1" / "candidates.json"
+
+        self._compile(provider)
+        monkeypatch.setenv("CH_PROXIES", "1")
+        self._compile(provider)
+        self._compile(provider)
+        assert len(provider.rendered) == 4, "--proxies must not invalidate the candidates"
+        assert len(encoded) == 4
+        listed = json.loads(manifest.read_text(encoding="utf-8"))["candidates"]
+        assert [c["proxy_path"] for c in listed] == [
+            "output/tmp/inc/ep_inc/s1/cand1/s1.proxy.mp4",
+            "output/tmp/inc/ep_inc/s1/cand2/s1.proxy.mp4",
+        ]
+
+        monkeypatch.delenv("CH_PROXIES")
+        self._compile(provider)
+        assert len(provider.rendered) == 4 and len(encoded) == 4
+        assert all("proxy_path" in c for c in json.loads(manifest.read_text(encoding="utf-8"))["candidates"])
+
+    def test_profile_pass_does_not_overwrite_the_recipe_episode(
+        self, project: dict[str, Any], monkeypatch: pytest.MonkeyPatch
+    ):
+        from scripts import compile_cut
+
+        monkeypatch.delenv("CH_CANDIDATES_ONLY")
+        concats: list[Path] = []
+
+        def ffmpeg_concat(_clips: list[Path], out_path: Path, width: int, **_kwargs: Any) -> None:
+            concats.append(out_path)
+            out_path.write_bytes(f"episode {width}".encode())
+
+        monkeypatch.setattr(compile_cut, "ffmpeg_concat", ffmpeg_concat)
+        recipe = {"provider": {"name": "counting", "options": {"cache": False}}}
+        standard = RenderConfig.from_strings("1080x1920", 24, "9:16")
+        draft = RenderConfig.from_strings("1080x1920", 24, "9:16", profile="draft")
+
+        common: dict[str, Any] = {"cut_id": "inc", "series_cfg": {}, "provider": project["provider"]}
+
+        final_out, _ = compile_cut.compile_episode("ep_inc", recipe, standard, **common)
+        draft_out, _ = compile_cut.compile_episode("ep_inc", recipe, draft, variant="draft", **common)
+
+        assert concats == [final_out, draft_out]
+        assert final_out.name == "ep_inc__inc.mp4"
+        assert draft_out.name == "ep_inc__inc.draft.mp4"
+        assert final_out.read_bytes() == b"episode 1080"
+        assert draft_out.read_bytes() == b"episode 540"
+
+    @pytest.mark.usefixtures("project")
+    def test_draft_review_candidates_feed_the_standard_compile(self, monkeypatch: pytest.MonkeyPatch):
+        from scripts import compile_cut
+
+        class _RemoteProvider(_CountingProvider):
+            render_independent = True
+
+            def generate_scene(self, _episode_id, scene, output_dir, render_cfg, seed=None) -> str:
+                self.rendered.append(f"{scene['id']}:{seed}:{render_cfg.width}")
+                out = Path(output_dir) / f"{scene['id']}.mp4"
+                out.write_bytes(f"{scene['id']}-{seed}".encode())
+                return str(out)
+
+        monkeypatch.setattr(compile_cut, "ffmpeg_concat", lambda _clips, out_path, **_kwargs: out_path.write_bytes(b""))
+        provider = _RemoteProvider()
+        recipe = {"provider": {"name": "remote", "options": {"num_candidates": 2, "cache": False}}}
+        common: dict[str, Any] = {"cut_id": "inc", "series_cfg": {}, "provider": provider}
+        draft = RenderConfig.from_strings("1080x1920", 24, "9:16", profile="draft")
+
+        compile_cut.compile_episode("ep_inc", recipe, draft, variant="draft", **common)
+        monkeypatch.delenv("CH_CANDIDATES_ONLY")
+        compile_cut.compile_episode("ep_inc", recipe, RenderConfig.from_strings("1080x1920", 24, "9:16"), **common)
+
+        assert provider.rendered == ["s1:1:540", "s1:2:540", "s2:1:540", "s2:2:540"]
@@ -0,0 +1,89 @@
+"""Tests for the shared YAML manifest loader and its parse caches."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from scripts.utils import manifests
+from scripts.utils.manifests import load_yaml
+
+
+def _write(path: Path, text: str, age_seconds: int = 60) -> None:
+    """Write ``text`` and backdate it out of the racy window (so it may be cached)."""
+    path.write_text(text, encoding="utf-8")
+    mtime = path.stat().st_mtime_ns - age_seconds * 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def parses(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Texts actually handed to the YAML parser (memo starts empty)."""
+    seen: list[str] = []
+    real = manifests.parse_yaml
+    monkeypatch.setattr(manifests, "_memo", {})
+    monkeypatch.setattr(manifests, "parse_yaml", lambda text: seen.append(text) or real(text))
+    return seen
+
+
+class TestLoadYaml:
+    def test_memoized_and_returns_independent_copies(self, tmp_path: Path, parses: list[str]):
+        path = tmp_path / "episode.yaml"
+        _write(path, "scenes:\n  - id: s1\n    duration_sec: 2\n")
+
+        first = load_yaml(path)
+        first["scenes"][0]["id"] = "mutated"
+        second = load_yaml(path)
+
+        assert second == {"scenes": [{"id": "s1", "duration_sec": 2}]}
+        assert len(parses) == 1
+
+    def test_disk_cache_survives_a_new_process(self, tmp_path: Path, parses: list[str]):
+        path = tmp_path / "episode.yaml"
+        _write(path, "episode_id: ep1\n")
+        assert load_yaml(path) == {"episode_id": "ep1"}
+
+        manifests._memo.clear()  # As in a fresh process
+        assert load_yaml(path) == {"episode_id": "ep1"}
+        assert len(parses) == 1
+
+    def test_edit_invalidates_memo_and_disk_cache(self, tmp_path: Path, parses: list[str]):
+        path = tmp_path / "episode.yaml"
+        _write(path, "duration_sec: 3\n", age_seconds=120)
+        load_yaml(path)
+
+        _write(path, "duration_sec: 5\n", age_seconds=60)  # Same size, new mtime
+        assert load_yaml(path) == {"duration_sec": 5}
+        manifests._memo.clear()
+        assert load_yaml(path) == {"duration_sec": 5}
+        assert len(parses) == 2
+
+    def test_recently_modified_file_is_not_cached(self, tmp_path: Path, parses: list[str]):
+        path = tmp_path / "episode.yaml"
+        path.write_text("a: 1\n", encoding="utf-8")
+
+        load_yaml(path)
+        load_yaml(path)
+
+        assert len(parses) == 2
+        assert not list((Path(os.environ["CH_CACHE_DIR"]) / "yaml").glob("*"))
+
+    def test_timestamps_are_memoized_without_disk_cache(self, tmp_path: Path, parses: list[str]):
+        path = tmp_path / "recipe.yaml"
+        _write(path, "created: 2025-01-01\n")
+
+        first = load_yaml(path)
+        assert load_yaml(path) == first
+        assert load_yaml(path) is not first
+        assert len(parses) == 1
+
+    def test_errors_propagate(self, tmp_path: Path):
+        with pytest.raises(FileNotFoundError):
+            load_yaml(tmp_path / "missing.yaml")
+        bad = tmp_path / "bad.yaml"
+        _write(bad, "scenes: [unclosed\n")
+        with pytest.raises(yaml.YAMLError):
+            load_yaml(bad)
@@ -0,0 +1,134 @@
+"""Tests for the overlay template registry."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts import overlay_templates
+from scripts.apply_overlays import build_filters
+from scripts.overlay_templates import (
+    SCHEMA_PATH,
+    OverlayTemplateError,
+    build_overlay_registry,
+    load_overlay_registry,
+)
+
+TOAST = {
+    "name": "toast",
+    "type": "text",
+    "text": "RBAC: approved",
+    "position": "bottom_right",
+    "font_size": 28,
+    "font_color": "white",
+    "bg_color": "0x224422AA",
+    "padding": 10,
+}
+
+
+def _write_template(directory: Path, name: str, spec: dict) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return path
+
+
+class TestOverlayRegistry:
+    def test_shipped_templates_are_valid(self):
+        registry = load_overlay_registry()
+        assert "rate_limit_ping" in registry.names()
+
+    def test_templates_are_normalized_and_read_only(self, tmp_path: Path):
+        _write_template(tmp_path, "toast", TOAST)
+        template = build_overlay_registry(tmp_path).get("toast")
+
+        assert template.fields["bg_color"] == "#224422@0.67"
+        assert template.anchors["top_left"] == ("10", "10")
+        with pytest.raises(TypeError):
+            template.fields["text"] = "changed"  # type: ignore[index]
+
+    def test_instance_applies_per_use_timing_and_position(self, tmp_path: Path):
+        _write_template(tmp_path, "toast", TOAST)
+        registry = build_overlay_registry(tmp_path)
+
+        first = registry.resolve({"spec": "toast", "start_sec": 1.5, "duration_sec": 3, "position": "top_left"})
+        default = registry.resolve({"spec": "toast"})
+        assert first is not None and default is not None
+        first["text"] = "mutated"
+
+        assert (first["start_sec"], first["duration_sec"], first["position"]) == (1.5, 3.0, "top_left")
+        assert (default["start_sec"], default["duration_sec"], default["position"]) == (0.5, 2.0, "bottom_right")
+        assert registry.get("toast").fields["text"] == "RBAC: approved"
+
+    def test_instances_render_like_raw_specs(self, tmp_path: Path):
+        _write_template(tmp_path, "toast", TOAST)
+        instance = build_overlay_registry(tmp_path).get("toast").instance(2.0, 1.0)
+        raw = {**TOAST, "start_sec": 2.0, "duration_sec": 1.0}
+
+        assert build_filters([instance], 1080, 1920) == build_filters([raw], 1080, 1920)
+
+    def test_unknown_spec_names_episode_and_scene(self, tmp_path: Path):
+        _write_template(tmp_path, "toast", TOAST)
+        registry = build_overlay_registry(tmp_path)
+        scenes = [{"id": "s1", "overlays": [{"spec": "toast"}]}, {"id": "s2", "overlays": [{"spec": "missing"}]}]
+
+        with pytest.raises(OverlayTemplateError, match=r"ep1/s2: Unknown overlay spec 'missing'.*available: toast"):
+            registry.scene_overlays("ep1", scenes)
+
+    def test_bad_position_and_timing_are_rejected(self, tmp_path: Path):
+        _write_template(tmp_path, "toast", TOAST)
+        registry = build_overlay_registry(tmp_path)
+
+        with pytest.raises(OverlayTemplateError, match="unknown position 'middle'"):
+            registry.resolve({"spec": "toast", "position": "middle"})
+        with pytest.raises(OverlayTemplateError, match="invalid timing"):
+            registry.resolve({"spec": "toast", "start_sec": "soon"})
+
+    def test_inline_overlays_pass_through(self, tmp_path: Path):
+        registry = build_overlay_registry(tmp_path)
+        inline = {"type": "text", "text": "hi"}
+
+        assert registry.scene_overlays("ep1", [{"overlays": [inline, {"note": "ignored"}]}, {}]) == [[inline], []]
+
+    def test_invalid_templates_are_all_reported(self, tmp_path: Path):
+        _write_template(tmp_path, "ok", TOAST)
+        _write_template(tmp_path, "no_text", {"name": "no_text", "type": "text"})
+        _write_template(tmp_path, "bad_pos", {**TOAST, "position": "center"})
+        (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+
+        with pytest.raises(OverlayTemplateError) as exc:
+            build_overlay_registry(tmp_path)
+        message = str(exc.value)
+        assert "no_text.json: $: 'text' is a required property" in message
+        assert "bad_pos.json: $.position" in message
+        assert "broken.json: cannot load template" in message
+
+    def test_loaded_once_until_a_template_changes(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        builds: list[Path] = []
+        real = overlay_templates.build_overlay_registry
+        monkeypatch.setattr(overlay_templates, "_registries", {})
+        monkeypatch.setattr(
+            overlay_templates, "build_overlay_registry", lambda d, s=SCHEMA_PATH: builds.append(d) or real(d, s)
+        )
+        _write_template(tmp_path, "toast", TOAST)
+
+        first = load_overlay_registry(tmp_path)
+        assert load_overlay_registry(tmp_path) is first
+        _write_template(tmp_path, "toast", {**TOAST, "text": "a longer replacement text"})
+        assert load_overlay_registry(tmp_path).get("toast").fields["text"] == "a longer replacement text"
+        assert len(builds) == 2
+
+
+class TestCompileChecksOverlays:
+    def test_unknown_spec_fails_before_rendering(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        from scripts import compile_cut
+
+        manifest = tmp_path / "episodes" / "ep1" / "episode.yaml"
+        manifest.parent.mkdir(parents=True)
+        manifest.write_text("scenes:\n  - id: s1\n    overlays:\n      - spec: nope\n", encoding="utf-8")
+        monkeypatch.setattr(compile_cut, "PROJECT_ROOT", tmp_path)
+
+        with pytest.raises(OverlayTemplateError, match="ep1/s1: Unknown overlay spec 'nope'"):
+            compile_cut.check_episode_overlays(["ep1", "ep_without_manifest"])
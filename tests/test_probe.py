@@ -0,0 +1,177 @@
+"""Tests for ffprobe metadata parsing, the probe cache and concat stream-copy decisions."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.utils import probe
+from scripts.utils.probe import MediaInfo, ProbeCache, parse_probe, probe_many, stream_copy_compatible
+
+
+def _probe_doc(audio: bool = True) -> dict:
+    streams = [
+        {
+            "codec_type": "video",
+            "codec_name": "h264",
+            "width": 1080,
+            "height": 1920,
+            "r_frame_rate": "24/1",
+            "pix_fmt": "yuv420p",
+            "profile": "High",
+            "level": 40,
+            "time_base": "1/12288",
+        }
+    ]
+    if audio:
+        streams.append(
+            {
+                "codec_type": "audio",
+                "codec_name": "aac",
+                "sample_rate": "48000",
+                "channels": 2,
+                "channel_layout": "stereo",
+            }
+        )
+    return {"streams": streams, "format": {"duration": "5.000000"}}
+
+
+class TestParseProbe:
+    def test_video_and_audio(self):
+        info = parse_probe(_probe_doc())
+        assert info.duration == 5.0
+        assert (info.video_codec, info.width, info.height, info.pix_fmt) == ("h264", 1080, 1920, "yuv420p")
+        assert info.fps_value == 24
+        assert info.has_audio
+        assert (info.audio_codec, info.sample_rate, info.channels) == ("aac", 48000, 2)
+        assert (info.video_profile, info.video_level, info.time_base) == ("High", 40, "1/12288")
+        assert info.channel_layout == "stereo"
+
+    def test_silent_and_missing_fields(self):
+        info = parse_probe(_probe_doc(audio=False))
+        assert not info.has_audio
+        assert info.audio_codec is None
+
+        empty = parse_probe({})
+        assert empty.duration is None
+        assert empty.fps_value is None
+
+    def test_keyframe_interval_from_video_packets(self):
+        doc = _probe_doc()
+        doc["streams"][0]["index"] = 0
+        doc["packets"] = [
+            {"stream_index": 0, "pts_time": "0.000000", "flags": "K__"},
+            {"stream_index": 0, "pts_time": "0.041667", "flags": "___"},
+            {"stream_index": 1, "pts_time": "0.500000", "flags": "K__"},
+            {"stream_index": 0, "pts_time": "1.000000", "flags": "K__"},
+            {"stream_index": 0, "pts_time": "2.000000", "flags": "K__"},
+        ]
+        assert parse_probe(doc).keyframe_interval == 1.0
+        assert parse_probe(_probe_doc()).keyframe_interval is None
+
+    def test_packets_are_read_only_from_the_start(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        commands: list[list[str]] = []
+
+        def fake_run(cmd: list[str], **_kwargs: object) -> SimpleNamespace:
+            commands.append(cmd)
+            return SimpleNamespace(stdout=json.dumps(_probe_doc()))
+
+        monkeypatch.setattr(probe.subprocess, "run", fake_run)
+
+        assert probe.probe_file(tmp_path / "clip.mp4").duration == 5.0
+        (cmd,) = commands
+        assert cmd[cmd.index("-read_intervals") + 1] == f"%+{probe.KEYFRAME_PROBE_SECONDS}"
+
+
+class TestProbeCache:
+    @pytest.fixture
+    def calls(self, monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+        seen: list[Path] = []
+
+        def fake_ffprobe(path: Path) -> MediaInfo:
+            seen.append(path)
+            return replace(parse_probe(_probe_doc()), duration=float(path.stat().st_size))
+
+        monkeypatch.setattr(probe, "_run_ffprobe", fake_ffprobe)
+        return seen
+
+    def test_probes_each_file_version_once(self, tmp_path: Path, calls: list[Path]):
+        clip = tmp_path / "clip.mp4"
+        clip.write_bytes(b"abc")
+        cache = ProbeCache(root=tmp_path / "cache")
+
+        assert cache.get(clip).duration == 3.0
+        assert cache.get(clip).duration == 3.0
+        assert len(calls) == 1
+
+        # A fresh process-level cache reads the persisted entry
+        assert ProbeCache(root=tmp_path / "cache").get(clip) == cache.get(clip)
+        assert len(calls) == 1
+
+        clip.write_bytes(b"abcdef")
+        assert cache.get(clip).duration == 6.0
+        assert len(calls) == 2
+
+    def test_probe_many_preserves_order(self, tmp_path: Path, calls: list[Path]):
+        clips = []
+        for n in range(1, 6):
+            clip = tmp_path / f"c{n}.mp4"
+            clip.write_bytes(b"x" * n)
+            clips.append(clip)
+
+        infos = probe_many(clips, max_workers=4, cache=ProbeCache(root=tmp_path / "cache"))
+        assert [info.duration for info in infos] == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert sorted(calls) == clips
+
+
+class TestStreamCopyCompatible:
+    def test_matching_clips_stream_copy(self):
+        infos = [parse_probe(_probe_doc()), parse_probe(_probe_doc())]
+        assert stream_copy_compatible(infos, 1080, 1920, 24)
+
+    def test_mismatch_falls_back_to_reencode(self):
+        base = parse_probe(_probe_doc())
+        assert not stream_copy_compatible([], 1080, 1920, 24)
+        assert not stream_copy_compatible([base, replace(base, width=720)], 1080, 1920, 24)
+        assert not stream_copy_compatible([base, parse_probe(_probe_doc(audio=False))], 1080, 1920, 24)
+        assert not stream_copy_compatible([base], 1080, 1920, 30)
+        assert not stream_copy_compatible([base], 720, 1280, 24)
+        assert not stream_copy_compatible([replace(base, pix_fmt="yuv444p")], 1080, 1920, 24)
+        assert not stream_copy_compatible([replace(base, audio_codec="pcm_s16le")], 1080, 1920, 24)
+
+    def test_profile_level_time_base_and_layout_must_match(self):
+        base = parse_probe(_probe_doc())
+        for changed in (
+            replace(base, video_profile="Main"),
+            replace(base, video_level=31),
+            replace(base, time_base="1/90000"),
+            replace(base, channel_layout="5.1"),
+        ):
+            assert not stream_copy_compatible([base, changed], 1080, 1920, 24)
+
+    def test_missing_fields_fall_back_to_reencode(self):
+        base = parse_probe(_probe_doc())
+        for field in ("video_profile", "video_level", "time_base", "channel_layout"):
+            missing = replace(base, **{field: None})
+            assert not stream_copy_compatible([missing, missing], 1080, 1920, 24)
+        silent = replace(parse_probe(_probe_doc(audio=False)), channel_layout=None)
+        assert stream_copy_compatible([silent], 1080, 1920, 24)
+
+    def test_fps_compared_as_rational(self):
+        info = MediaInfo(
+            duration=1.0,
+            video_codec="h264",
+            width=16,
+            height=16,
+            fps="48/2",
+            pix_fmt="yuv420p",
+            has_audio=False,
+            video_profile="High",
+            video_level=40,
+            time_base="1/12288",
+        )
+        assert stream_copy_compatible([info], 16, 16, 24)
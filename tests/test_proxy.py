@@ -0,0 +1,47 @@
+"""Tests for low-res review proxies."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts.utils.proxy import proxy_path_for, proxy_size
+
+
+class TestProxyGeometry:
+    def test_portrait_master(self):
+        assert proxy_size(1080, 1920) == (270, 480)
+
+    def test_landscape_and_small_masters(self):
+        assert proxy_size(1920, 1080) == (480, 270)
+        assert proxy_size(320, 240) == (320, 240)
+
+    def test_proxy_path(self):
+        assert proxy_path_for(Path("tmp/s1/cand2/s1.mp4")) == Path("tmp/s1/cand2/s1.proxy.mp4")
+
+
+class TestContactSheetUsesProxies:
+    def test_thumbnails_come_from_proxy(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        from scripts import select_winners
+
+        monkeypatch.setattr(select_winners, "PROJECT_ROOT", tmp_path)
+        master = tmp_path / "tmp" / "s1" / "cand1" / "s1.mp4"
+        master.parent.mkdir(parents=True)
+        master.write_bytes(b"master")
+        proxy = proxy_path_for(master)
+        proxy.write_bytes(b"proxy")
+        thumbed: list[Path] = []
+        monkeypatch.setattr(select_winners, "extract_thumbnail", lambda path: thumbed.append(path))
+
+        candidates = [
+            {"index": 1, "path": "tmp/s1/cand1/s1.mp4", "proxy_path": "tmp/s1/cand1/s1.proxy.mp4"},
+            {"index": 2, "path": "tmp/s1/cand1/s1.mp4", "proxy_path": "tmp/s1/cand2/missing.proxy.mp4"},
+        ]
+        select_winners.generate_contact_sheet(
+            "cut", [{"episode_id": "ep", "scenes": {"s1": {"winner_index": 1, "candidates": candidates}}}]
+        )
+
+        assert thumbed == [proxy, master]
+        html = (tmp_path / "output" / "cuts" / "cut" / "review.html").read_text(encoding="utf-8")
+        assert "../../../tmp/s1/cand1/s1.proxy.mp4" in html
@@ -0,0 +1,207 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from scripts.utils import ratelimit
+from scripts.utils.ratelimit import SLOT_POLL_SECONDS, RateLimiter, is_transient, retry_after_seconds
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _APIError(Exception):
+    def __init__(self, status_code: int, headers: dict[str, str] | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class _Flaky:
+    """Raises the given errors in order, then returns "ok"."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ratelimit, "BACKOFF_BASE_SECONDS", 0.001)
+
+
+class TestRetryAfter:
+    """Tests for rate-limit error classification and Retry-After parsing"""
+
+    def test_retry_after_ms_preferred(self):
+        assert retry_after_seconds(_APIError(429, {"retry-after-ms": "1500", "retry-after": "9"})) == 1.5
+
+    def test_retry_after_seconds(self):
+        assert retry_after_seconds(_APIError(429, {"retry-after": "7"})) == 7.0
+
+    def test_retry_after_http_date_in_past(self):
+        assert retry_after_seconds(_APIError(429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+
+    def test_rate_limited_without_hint(self):
+        assert retry_after_seconds(_APIError(429)) == 0.0
+
+    def test_other_errors_are_not_rate_limits(self):
+        assert retry_after_seconds(_APIError(500)) is None
+        assert retry_after_seconds(ValueError("boom")) is None
+
+    def test_transient_errors(self):
+        assert is_transient(_APIError(503))
+        assert not is_transient(_APIError(400))
+        assert is_transient(type("APIConnectionError", (Exception,), {})())
+
+
+class TestRateLimiter:
+    """Tests for token-bucket pacing, concurrency caps and shared backoff"""
+
+    def test_token_bucket_paces_after_burst(self):
+        clock = _Clock()
+        limiter = RateLimiter(requests_per_minute=60, max_concurrent=100, clock=clock)
+        for _ in range(int(limiter.capacity)):
+            assert limiter._reserve() == 0.0
+            limiter._release()
+
+        assert limiter._reserve() == pytest.approx(1.0)
+        clock.now += 1.0
+        assert limiter._reserve() == 0.0
+
+    def test_concurrency_cap(self):
+        limiter = RateLimiter(requests_per_minute=6000, max_concurrent=2, clock=_Clock())
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() == SLOT_POLL_SECONDS
+        limiter._release()
+        assert limiter._reserve() == 0.0
+
+    def test_backoff_pauses_every_caller(self):
+        clock = _Clock()
+        limiter = RateLimiter(requests_per_minute=6000, clock=clock)
+        limiter.backoff(0, retry_after=30)
+
+        assert limiter._reserve() == pytest.approx(30)
+        clock.now += 30
+        assert limiter._reserve() == 0.0
+
+    def test_call_retries_rate_limit(self):
+        limiter = RateLimiter(requests_per_minute=60000)
+        fn = _Flaky(_APIError(429, {"retry-after-ms": "10"}))
+
+        assert limiter.call(fn) == "ok"
+        assert fn.calls == 2
+        assert limiter.throttled == 1
+
+    @pytest.mark.usefixtures("fast_backoff")
+    def test_call_retries_transient_errors_up_to_limit(self):
+        limiter = RateLimiter(requests_per_minute=60000, max_retries=2)
+        fn = _Flaky(_APIError(503), _APIError(503), _APIError(503))
+
+        with pytest.raises(_APIError):
+            limiter.call(fn)
+        assert fn.calls == 3
+        assert limiter.throttled == 0
+
+    def test_call_does_not_retry_other_errors(self):
+        limiter = RateLimiter(requests_per_minute=60000)
+        fn = _Flaky(_APIError(400))
+
+        with pytest.raises(_APIError):
+            limiter.call(fn)
+        assert fn.calls == 1
+
+    @pytest.mark.usefixtures("fast_backoff")
+    def test_submit_retries_only_rate_limits(self):
+        limiter = RateLimiter(requests_per_minute=60000)
+        throttled = _Flaky(_APIError(429, {"retry-after-ms": "10"}))
+        timeout_error = type("APITimeoutError", (Exception,), {})
+        timed_out = _Flaky(timeout_error())
+
+        assert limiter.submit(throttled) == "ok"
+        assert throttled.calls == 2
+        with pytest.raises(timeout_error):
+            limiter.submit(timed_out)
+        assert timed_out.calls == 1
+
+    def test_backoff_is_shared_through_the_file(self, tmp_path: Path):
+        path = tmp_path / "openai" / "blocked_until"
+        first = RateLimiter(requests_per_minute=6000, shared_path=path)
+        second = RateLimiter(requests_per_minute=6000, shared_path=path)
+
+        first.backoff(0, retry_after=30)
+
+        assert second._reserve() == pytest.approx(30, abs=1)
+        assert second.throttled == 0
+
+    def test_shared_file_is_read_only_when_replaced(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        path = tmp_path / "blocked_until"
+        limiter = RateLimiter(requests_per_minute=6000, max_concurrent=100, shared_path=path)
+        reads: list[Path] = []
+        read_text = Path.read_text
+        monkeypatch.setattr(Path, "read_text", lambda self, **kw: reads.append(self) or read_text(self, **kw))
+
+        assert [limiter._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        path.write_text(repr(time.time() - 1), encoding="utf-8")
+        assert [limiter._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert len(reads) == 1
+
+        # Another process records a pause: the file is replaced, never rewritten in place
+        tmp = tmp_path / "blocked_until.tmp"
+        tmp.write_text(repr(time.time() + 30), encoding="utf-8")
+        os.replace(tmp, path)
+        assert limiter._reserve() == pytest.approx(30, abs=1)
+        assert limiter._reserve() == pytest.approx(30, abs=1)
+        assert len(reads) == 2
+
+    def test_workers_split_the_openai_budget(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("CH_OPENAI_RPM", "90")
+        monkeypatch.setenv("CH_OPENAI_MAX_CONCURRENT", "8")
+        monkeypatch.setattr(ratelimit, "_default_limiter", None)
+        monkeypatch.setattr(ratelimit, "_budget_share", 1)
+
+        ratelimit.share_openai_budget(3)
+        limiter = ratelimit.openai_limiter()
+
+        assert limiter.rate * 60 == pytest.approx(30)
+        assert limiter.max_concurrent == 2
+        assert limiter.shared_path is not None and limiter.shared_path.name == "blocked_until"
+
+    def test_acall_limits_concurrency_and_retries(self):
+        limiter = RateLimiter(requests_per_minute=60000, max_concurrent=2)
+        state = {"active": 0, "peak": 0, "throttle_once": True}
+
+        async def request(i: int) -> int:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            try:
+                await asyncio.sleep(0.01)
+                if state["throttle_once"]:
+                    state["throttle_once"] = False
+                    raise _APIError(429, {"retry-after-ms": "20"})
+                return i
+            finally:
+                state["active"] -= 1
+
+        async def run() -> list[Any]:
+            return list(await asyncio.gather(*(limiter.acall(request, i) for i in range(6))))
+
+        assert asyncio.run(run()) == list(range(6))
+        assert state["peak"] == 2
+        assert limiter.throttled == 1
@@ -1,15 +1,19 @@
 """Tests for RCFC schema validation"""
 
 import json
+import os
 from pathlib import Path
 
 import pytest
+import yaml
 
 # Try importing jsonschema - these tests will be skipped if not available
 pytest.importorskip("jsonschema")
 
 from jsonschema import ValidationError, validate  # noqa: E402
 
+from scripts.rcfc import validate as rcfc_validate  # noqa: E402
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 
@@ -142,3 +146,57 @@ class TestSchemaValidation:
 
         # Should not raise
         validate(instance=base_recipe, schema=rcfc_schema)
+
+
+class TestCompiledValidator:
+    """Tests for the cached recipe validator and bulk recipe validation"""
+
+    def test_validator_compiled_once_until_schema_changes(self, tmp_path, rcfc_schema, base_recipe):
+        schema_path = tmp_path / "rcfc.schema.json"
+        schema_path.write_text(json.dumps(rcfc_schema))
+
+        first = rcfc_validate.recipe_validator(schema_path)
+        assert rcfc_validate.recipe_validator(schema_path) is first
+        rcfc_validate.validate_recipe(base_recipe, schema_path)
+
+        rcfc_schema["required"].append("extra")
+        schema_path.write_text(json.dumps(rcfc_schema))
+        mtime = schema_path.stat().st_mtime_ns
+        os.utime(schema_path, ns=(mtime, mtime + 1_000_000))  # Same-tick rewrites keep the mtime
+        assert rcfc_validate.recipe_validator(schema_path) is not first
+        with pytest.raises(ValidationError, match="'extra' is a required property"):
+            rcfc_validate.validate_recipe(base_recipe, schema_path)
+
+    def test_recipe_errors_lists_every_violation_with_path(self, base_recipe):
+        base_recipe["audience_profile"] = "production"
+        base_recipe["scope"]["include_episodes"] = []
+
+        assert rcfc_validate.recipe_errors(base_recipe) == [
+            "$.audience_profile: 'production' is not one of ['general']",
+            "$.scope.include_episodes: [] should be non-empty",
+        ]
+
+    def test_main_reports_invalid_files(self, tmp_path, base_recipe, capsys):
+        (tmp_path / "good.yaml").write_text(yaml.safe_dump(base_recipe))
+        base_recipe.pop("ending")
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / "bad.yml").write_text(yaml.safe_dump(base_recipe))
+        (tmp_path / "notes.txt").write_text("not a recipe")
+
+        assert rcfc_validate.main([str(tmp_path)]) == 1
+        captured = capsys.readouterr()
+        assert captured.out == f"{tmp_path / 'nested' / 'bad.yml'}: $: 'ending' is a required property\n"
+        assert "2 recipe(s) checked, 1 invalid" in captured.err
+
+    def test_parallel_batch_matches_serial(self, tmp_path, base_recipe, monkeypatch):
+        monkeypatch.setattr(rcfc_validate, "PARALLEL_MIN_RECIPES", 2)
+        paths = []
+        for i in range(4):
+            recipe = dict(base_recipe, ending="agnostic" if i % 2 else 42)
+            path = tmp_path / f"r{i}.yaml"
+            path.write_text(yaml.safe_dump(recipe))
+            paths.append(path)
+
+        results = rcfc_validate.validate_files(paths, jobs=2)
+        assert results == {path: rcfc_validate.check_recipe_file(path) for path in paths}
+        assert [bool(errors) for errors in results.values()] == [True, False, True, False]